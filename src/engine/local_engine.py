@@ -0,0 +1,603 @@
+#!/usr/bin/env python3
+"""
+In-process NumPy engine for the statistics of the MapReduce jobs.
+
+Reads only the requested columns in large chunks (pandas usecols) and
+reduces every chunk with vectorized NumPy operations, so memory stays
+bounded by the chunk size. Like the line-based jobs, every physical line
+is one row: a quoted Description spanning lines is not joined, and its
+parts are counted as missing/malformed values exactly as in the jobs.
+Chunk partials are merged with the same functions the jobs use
+(moments.py), and the output has the same "key<TAB>json" lines as the
+corresponding job:
+
+  mean      MeanValue            "mean_value"
+  max       MaxValue             "max_value"
+  stddev    StdDevValue          "statistics"
+  minmax    MinMaxNormalization  sample rows + "bounds"
+  skewness  SkewnessSeverity     "skewness_result"
+  summary   ColumnSummary        one line per column
+  percentiles Percentiles        one line per column (KLL sketch)
+  histogram ValueHistogram       "statistics"
+
+HDFS inputs (hdfs://...) are streamed with "hadoop fs -cat", and .gz/.bz2
+inputs are decompressed (compression.py). With --store the values are
+memory-mapped from a local column store (column_store.py) instead of
+parsing the CSV. With --parquet only the column chunks of the requested
+column are read from a Parquet store (parquet_store.py), restricted to
+the --where partitions; max (of integer columns) and minmax bounds are
+taken from the row group footers without reading the values.
+
+Usage:
+  python local_engine.py --stat stddev --column 2 hdfs:///user/.../US_Accidents.csv
+"""
+import argparse
+import io
+import itertools
+import json
+import sys
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).parent.resolve().parent / "mapreduce"))
+from column_store import BOOLEAN_COLUMNS  # noqa: E402
+from compression import open_input  # noqa: E402
+from csv_fields import fields_reader, is_header  # noqa: E402
+from data_quality import MAX_EXAMPLE_LENGTH, SAMPLE_SIZE  # noqa: E402
+from histogram_stats import (  # noqa: E402
+    DEFAULT_MAX_DISTINCT,
+    histogram_moments,
+    histogram_pairs,
+    histogram_stats,
+    merge_histograms,
+)
+from kll import (  # noqa: E402
+    DEFAULT_K,
+    DEFAULT_QUANTILES,
+    DEFAULT_SEED,
+    KLLSketch,
+    rank_error,
+    task_seed,
+)
+from moments import (  # noqa: E402
+    array_moments,
+    describe,
+    interpret_skewness,
+    merge_moments,
+    merge_variance,
+)
+from parquet_store import ParquetStore, parse_where  # noqa: E402
+
+DEFAULT_CHUNK_ROWS = 1_000_000
+STATS = [
+    "mean",
+    "max",
+    "stddev",
+    "minmax",
+    "skewness",
+    "summary",
+    "percentiles",
+    "histogram",
+]
+# Statistics computed for every column of --columns
+MULTI_COLUMN_STATS = {"summary", "percentiles"}
+# MeanValue and MaxValue parse the column with int(), the others with float()
+INTEGER_STATS = {"mean", "max"}
+INTEGER_PATTERN = r"\s*[+-]?\d+\s*"
+# Statistics answered from Parquet footers when possible
+FOOTER_STATS = {"max", "minmax"}
+
+
+class ColumnQuality:
+    """
+    Missing/malformed value counts in the data_quality format of the jobs;
+    the examples are the first bad values (ID and raw field) of the scan
+    """
+
+    def __init__(self):
+        self.missing = 0
+        self.parse_errors = 0
+        self.examples = []
+
+    def add(self, kind, ids, raw):
+        self.examples.extend(
+            {"type": kind, "line": f"{row_id}: {value}"[:MAX_EXAMPLE_LENGTH]}
+            for row_id, value in zip(ids[: SAMPLE_SIZE - len(self.examples)], raw)
+        )
+
+    def result(self):
+        if not self.missing and not self.parse_errors:
+            return None
+        return {
+            "missing": self.missing,
+            "parse_errors": self.parse_errors,
+            "error_types": {"ValueError": self.parse_errors}
+            if self.parse_errors
+            else {},
+            "examples": self.examples,
+        }
+
+
+def _read_block(body, usecols, **kwargs):
+    import pandas as pd
+
+    return pd.read_csv(
+        io.BytesIO(body),
+        header=None,
+        usecols=usecols,
+        dtype=str,
+        keep_default_na=False,
+        **kwargs,
+    )
+
+
+def _line_frame(lines, usecols, read_fields):
+    """
+    DataFrame of the requested fields of physical lines (bytes), split like
+    the jobs' csv_fields, or None if all of them are header rows.
+
+    The lines are parsed by pandas' C reader as one block. Only the few
+    lines it would read differently are found with a vectorized scan and
+    split on their own: a line with an odd number of quotes (part of a
+    record spanning lines, which must not be joined with the next line)
+    and empty lines, which pandas skips but the jobs count.
+    """
+    import pandas as pd
+
+    block = b"".join(lines)
+    data = np.frombuffer(block, np.uint8)
+    lengths = np.fromiter(map(len, lines), np.int64, len(lines))
+    ends = np.cumsum(lengths)
+    starts = ends - lengths
+    quotes = np.flatnonzero(data == ord('"'))
+    odd = np.diff(np.searchsorted(quotes, ends), prepend=0) % 2 == 1
+    first = data[starts]
+    empty = (first == ord("\n")) | (first == ord("\r"))
+    # Records start with their ID ("A-1"); only lines starting like the
+    # header (or a BOM) are checked for it
+    header = np.zeros(len(lines), dtype=bool)
+    for position in np.flatnonzero((first == ord("I")) | (first == 0xEF)):
+        header[position] = is_header(lines[position].decode("utf-8", "replace"))
+
+    keep = ~(odd | empty | header)
+    parsed = np.flatnonzero(keep)
+    split = np.flatnonzero((odd | empty) & ~header).tolist()
+    frames = []
+    if len(parsed):
+        # The few removed lines leave few slices of the block to copy
+        view = memoryview(block)
+        dropped = np.flatnonzero(~keep)
+        bounds = zip(
+            np.append(0, ends[dropped]), np.append(starts[dropped], len(block))
+        )
+        body = b"".join(view[start:end] for start, end in bounds)
+        try:
+            try:
+                frame = _read_block(body, usecols)
+            except UnicodeDecodeError:
+                # Decoding with replacement is slower; only for invalid bytes
+                frame = _read_block(body, usecols, encoding_errors="replace")
+            if len(frame) != len(parsed):
+                raise ValueError("Lines skipped by the CSV reader")
+            frame.index = parsed
+            frames.append(frame)
+        except ValueError:
+            # Rows wider than the first one; split them all like the jobs
+            split = sorted(split + parsed.tolist())
+    if split:
+        rows = [
+            read_fields(lines[position].decode("utf-8", "replace").rstrip("\r\n"))
+            for position in split
+        ]
+        frames.append(pd.DataFrame(rows, columns=usecols, index=split))
+    if not frames:
+        return None
+    frame = pd.concat(frames).sort_index() if len(frames) > 1 else frames[0]
+    return frame.fillna("")
+
+
+def read_chunks(input_path, columns, chunk_rows=DEFAULT_CHUNK_ROWS):
+    """
+    Yield DataFrames with the row ID and the requested columns as raw
+    strings, one row per physical line like the line-based jobs; header
+    rows are dropped by content (csv_fields.is_header)
+    """
+    usecols = sorted(set([0] + list(columns)))
+    read_fields = fields_reader(usecols)
+    f, _ = open_input(input_path)
+    with f:
+        while True:
+            lines = list(itertools.islice(f, chunk_rows))
+            if not lines:
+                break
+            frame = _line_frame(lines, usecols, read_fields)
+            if frame is not None:
+                yield frame
+
+
+def parse_values(chunk, column, integer, quality):
+    """
+    Convert one raw column of a chunk; returns the valid values and the
+    number of missing and malformed entries (counted into quality)
+    """
+    import pandas as pd
+
+    raw = chunk[column]
+    missing = raw.isna() | (raw == "")
+    present = raw[~missing]
+
+    if integer:
+        parsable = present.str.fullmatch(INTEGER_PATTERN)
+        values = pd.to_numeric(present[parsable].str.strip()).to_numpy(np.int64)
+    else:
+        numeric = pd.to_numeric(present, errors="coerce")
+        parsable = numeric.notna()
+        values = numeric[parsable].to_numpy(np.float64)
+
+    ids = chunk[0]
+    invalid = ~parsable
+    quality.missing += int(missing.sum())
+    quality.parse_errors += int(invalid.sum())
+    if len(quality.examples) < SAMPLE_SIZE:
+        quality.add("missing", ids[missing].tolist(), raw[missing].tolist())
+        bad_ids = ids.loc[present.index][invalid]
+        quality.add("ValueError", bad_ids.tolist(), present[invalid].tolist())
+
+    return values, int(missing.sum()), int(invalid.sum())
+
+
+def int_parsable(idx, integer_type):
+    """
+    Whether int() accepts the CSV text of a stored column: only integer
+    columns other than the True/False flags
+    """
+    return integer_type and idx not in BOOLEAN_COLUMNS
+
+
+def integral_values(values, idx, integer, quality):
+    """
+    Cached values as the job would parse them; returns the values and the
+    number of values int() rejects (parse errors)
+    """
+    invalid = 0
+    if integer and not int_parsable(idx, values.dtype.kind in "iu"):
+        # Float columns are written with a decimal point ("61.0") and the
+        # flags as True/False, so none of their values is valid for mean/max
+        invalid = len(values)
+        quality.parse_errors += invalid
+        values = values[:0]
+    return values.astype(np.int64 if integer else np.float64), invalid
+
+
+def column_blocks(
+    input_path, columns, integer, chunk_rows, store_dir, quality, parquet_store=None
+):
+    """
+    Yield {column: (values, missing, invalid)} per chunk, either parsed from
+    the CSV, memory-mapped from a column store or read from a Parquet store
+    """
+    if parquet_store:
+        for idx in columns:
+            if not parquet_store.has_column(idx):
+                raise ValueError(f"Column {idx} is not in the Parquet store")
+            for values, missing in parquet_store.blocks(idx):
+                quality.missing += missing
+                values, invalid = integral_values(values, idx, integer, quality)
+                yield {idx: (values, missing, invalid)}
+        return
+
+    if store_dir:
+        from column_store import ColumnStore
+
+        store = ColumnStore(store_dir)
+        for idx in columns:
+            if not store.has_column(idx):
+                raise ValueError(f"Column {idx} is not in the column store")
+            info = store.column_info(idx)
+            quality.missing += info["null_count"]
+            first = True
+            for values in store.valid_blocks(idx):
+                values, invalid = integral_values(values, idx, integer, quality)
+                # Nulls are only known per column, report them with the first block
+                missing = info["null_count"] if first else 0
+                first = False
+                yield {idx: (values, missing, invalid)}
+        return
+
+    for chunk in read_chunks(input_path, columns, chunk_rows):
+        yield {idx: parse_values(chunk, idx, integer, quality) for idx in columns}
+
+
+def minmax_results(min_value, max_value, sample_values):
+    """MinMaxNormalization output: normalized sample values and the bounds"""
+    results = []
+    range_val = max_value - min_value
+    for i, original in enumerate(sample_values):
+        normalized = (original - min_value) / range_val if range_val > 0 else 0
+        results.append((i, {"original": original, "normalized": normalized}))
+    results.append(("bounds", {"min": min_value, "max": max_value}))
+    return results
+
+
+def footer_results(stat, store, idx, samples):
+    """
+    max/minmax from the row group footers of a Parquet store, or None when
+    the footers cannot answer (max of a float or flag column, whose values
+    are all parse errors, and footers without statistics)
+    """
+    if not store.has_column(idx) or (
+        stat == "max" and not int_parsable(idx, store.is_integer(idx))
+    ):
+        return None
+    stats = store.footer_stats(idx)
+    if stats is None:
+        return None
+
+    min_value, max_value, null_count = stats
+    results = []
+    if max_value is not None and stat == "max":
+        results.append(("max_value", int(max_value)))
+    elif max_value is not None:
+        # Only the first values are read, for the normalized examples
+        sample_values = []
+        for values, _ in store.blocks(idx):
+            needed = samples - len(sample_values)
+            sample_values.extend(values[:needed].astype(np.float64).tolist())
+            if len(sample_values) >= samples:
+                break
+        # Parquet writes a zero minimum as -0.0
+        min_value = float(min_value) + 0.0
+        results += minmax_results(min_value, float(max_value), sample_values)
+
+    quality = ColumnQuality()
+    quality.missing = null_count
+    data_quality = quality.result()
+    if data_quality:
+        results.append(("data_quality", data_quality))
+    return results
+
+
+def compute(
+    stat,
+    input_path,
+    columns,
+    chunk_rows=DEFAULT_CHUNK_ROWS,
+    store_dir=None,
+    samples=10,
+    quantiles=DEFAULT_QUANTILES,
+    k=DEFAULT_K,
+    max_distinct=DEFAULT_MAX_DISTINCT,
+    parquet_dir=None,
+    where=None,
+    seed=DEFAULT_SEED,
+):
+    """
+    Compute one statistic and return the (key, value) pairs the matching
+    MapReduce job would output
+    """
+    integer = stat in INTEGER_STATS
+    if stat not in MULTI_COLUMN_STATS:
+        columns = columns[:1]
+
+    parquet_store = None
+    if parquet_dir:
+        parquet_store = ParquetStore(parquet_dir, where)
+        if stat in FOOTER_STATS:
+            results = footer_results(stat, parquet_store, columns[0], samples)
+            if results is not None:
+                return results
+
+    quality = ColumnQuality()
+    count = 0
+    total = 0
+    sample_values = []
+    partials = {idx: [] for idx in columns}
+    sketches = {idx: KLLSketch(k, task_seed(seed, idx)) for idx in columns}
+    # Becomes None when the column has more than max_distinct values
+    histogram = {}
+    # Per column: [min, max, missing count, malformed count]
+    bounds = {idx: [None, None, 0, 0] for idx in columns}
+
+    blocks = column_blocks(
+        input_path, columns, integer, chunk_rows, store_dir, quality, parquet_store
+    )
+    for block in blocks:
+        for idx, (values, missing, invalid) in block.items():
+            state = bounds[idx]
+            state[2] += missing
+            state[3] += invalid
+            if not len(values):
+                continue
+
+            if stat == "mean":
+                count += len(values)
+                total += int(values.sum())
+            elif stat in ("max", "minmax", "summary", "histogram"):
+                block_min = values.min().item()
+                block_max = values.max().item()
+                if state[0] is None or block_min < state[0]:
+                    state[0] = block_min
+                if state[1] is None or block_max > state[1]:
+                    state[1] = block_max
+                if stat == "minmax" and len(sample_values) < samples:
+                    needed = samples - len(sample_values)
+                    sample_values.extend(values[:needed].tolist())
+            if stat in ("stddev", "skewness", "summary"):
+                partials[idx].append(array_moments(values))
+            elif stat == "percentiles":
+                sketches[idx].update_many(values.tolist())
+            elif stat == "histogram" and histogram is None:
+                partials[idx].append(array_moments(values))
+            elif stat == "histogram":
+                unique, counts = np.unique(values, return_counts=True)
+                merge_histograms([zip(unique.tolist(), counts.tolist())], histogram)
+                if len(histogram) > max_distinct:
+                    partials[idx].append(histogram_moments(histogram))
+                    histogram = None
+
+    results = []
+    idx = columns[0]
+    if stat == "mean" and count:
+        results.append(("mean_value", total / count))
+    elif stat == "max" and bounds[idx][1] is not None:
+        results.append(("max_value", bounds[idx][1]))
+    elif stat == "stddev":
+        count, mean, m2 = merge_variance(p[:3] for p in partials[idx])
+        if count:
+            std_dev = (m2 / count) ** 0.5
+            results.append(
+                ("statistics", {"mean": mean, "std_dev": std_dev, "count": count})
+            )
+    elif stat == "minmax" and bounds[idx][0] is not None:
+        results += minmax_results(bounds[idx][0], bounds[idx][1], sample_values)
+    elif stat == "skewness":
+        partial = merge_moments(partials[idx])
+        if partial[0]:
+            stats = describe(partial)
+            results.append(
+                (
+                    "skewness_result",
+                    {
+                        "skewness": stats["skewness"],
+                        "kurtosis": stats["kurtosis"],
+                        "sample_size": partial[0],
+                        "interpretation": interpret_skewness(stats["skewness"]),
+                    },
+                )
+            )
+    elif stat == "summary":
+        for idx in columns:
+            min_val, max_val, missing, invalid = bounds[idx]
+            partial = merge_moments(partials[idx])
+            summary = {"count": 0, "missing": missing, "invalid": invalid}
+            if partial[0] > 0:
+                summary.update(describe(partial))
+                summary["min"] = min_val
+                summary["max"] = max_val
+            results.append((idx, summary))
+
+    elif stat == "percentiles":
+        fractions = [float(q) for q in quantiles.split(",")]
+        for idx in columns:
+            sketch = sketches[idx]
+            if not sketch.n:
+                continue
+            results.append(
+                (
+                    idx,
+                    {
+                        "count": sketch.n,
+                        "min": sketch.min,
+                        "max": sketch.max,
+                        "quantiles": dict(
+                            zip(map(str, fractions), sketch.quantiles(fractions))
+                        ),
+                        "rank_error": rank_error(sketch.k),
+                    },
+                )
+            )
+
+    elif stat == "histogram" and bounds[idx][0] is not None:
+        if histogram is not None:
+            stats = histogram_stats(histogram)
+            stats["method"] = "histogram"
+            stats["distinct"] = len(histogram)
+            stats["histogram"] = histogram_pairs(histogram)
+        else:
+            stats = describe(merge_moments(partials[idx]))
+            stats.update({"min": bounds[idx][0], "max": bounds[idx][1]})
+            stats["method"] = "moments"
+        results.append(("statistics", stats))
+
+    data_quality = quality.result()
+    if data_quality:
+        results.append(("data_quality", data_quality))
+
+    return results
+
+
+def format_output(results):
+    """Lines in mrjob's JSONProtocol format ("key<TAB>value")"""
+    return "".join(f"{json.dumps(k)}\t{json.dumps(v)}\n" for k, v in results)
+
+
+def parse_arguments():
+    parser = argparse.ArgumentParser(description="Local NumPy statistics engine")
+    parser.add_argument("input", help="Local CSV file or hdfs:// path")
+    parser.add_argument("--stat", choices=STATS, default="mean")
+    parser.add_argument(
+        "--column", type=int, help="Index of the column (default depends on --stat)"
+    )
+    parser.add_argument(
+        "--columns", help="Comma-separated column indexes (summary only)"
+    )
+    parser.add_argument(
+        "--chunk-rows",
+        type=int,
+        default=DEFAULT_CHUNK_ROWS,
+        help="Rows read per chunk (bounds the memory use)",
+    )
+    parser.add_argument(
+        "--samples",
+        type=int,
+        default=10,
+        help="Number of example values reported by minmax",
+    )
+    parser.add_argument(
+        "--quantiles",
+        default=DEFAULT_QUANTILES,
+        help="Comma-separated fractions reported by percentiles",
+    )
+    parser.add_argument(
+        "--seed",
+        type=int,
+        default=DEFAULT_SEED,
+        help="Seed of the percentiles sketch compactions",
+    )
+    parser.add_argument(
+        "--max-distinct",
+        type=int,
+        default=DEFAULT_MAX_DISTINCT,
+        help="histogram falls back to moments above this many distinct values",
+    )
+    parser.add_argument("--store", help="Read from a local column store directory")
+    parser.add_argument(
+        "--parquet", help="Read from a Parquet store (local directory or hdfs://)"
+    )
+    parser.add_argument(
+        "--where",
+        help="Partitions of the Parquet store to read (e.g. State=CA,year=2021)",
+    )
+    return parser.parse_args()
+
+
+def main():
+    args = parse_arguments()
+
+    if args.columns:
+        columns = [int(c) for c in args.columns.split(",")]
+    elif args.column is not None:
+        columns = [args.column]
+    else:
+        # Same defaults as the jobs' --column / --columns options
+        columns = [9] if args.stat == "minmax" else [2]
+
+    results = compute(
+        args.stat,
+        args.input,
+        columns,
+        args.chunk_rows,
+        args.store,
+        args.samples,
+        args.quantiles,
+        max_distinct=args.max_distinct,
+        parquet_dir=args.parquet,
+        where=parse_where(args.where),
+        seed=args.seed,
+    )
+    sys.stdout.write(format_output(results))
+
+
+if __name__ == "__main__":
+    main()
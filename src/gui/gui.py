@@ -1,9 +1,12 @@
 #!/usr/bin/env python3
 import os
 import subprocess
+import signal
 import json
 import sys
 import tempfile
+import threading
+import time
 from PyQt5.QtWidgets import (
     QApplication,
     QMainWindow,
@@ -23,73 +26,220 @@ from PyQt5.QtWidgets import (
     QFileDialog,
     QButtonGroup,
     QComboBox,
+    QCheckBox,
 )
-from PyQt5.QtCore import Qt, QThread, pyqtSignal
+from PyQt5.QtCore import Qt, QThread, QTimer, pyqtSignal, QRegExp
 import matplotlib.pyplot as plt
 from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
 import numpy as np
 import uuid
-from PyQt5.QtGui import QIntValidator
+from PyQt5.QtGui import QRegExpValidator
+
+sys.path.insert(
+    0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "storage")
+)
+sys.path.insert(
+    0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "performance")
+)
+sys.path.insert(
+    0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "mapreduce")
+)
+from compression import (  # noqa: E402
+    compress_file,
+    input_codec,
+    strip_codec,
+    with_codec,
+)
+from hdfs_client import get_client  # noqa: E402
+from result_cache import ResultCache  # noqa: E402
+from hadoop_log import JobLog  # noqa: E402
+from column_summary import derivable  # noqa: E402
+from job_queue import (  # noqa: E402
+    COALESCE_WINDOW_MS,
+    GROUP_SALT,
+    AnalysisRequest,
+    JobQueue,
+    batch_columns,
+    fused,
+    parse_summary,
+    split_output,
+)
+
+SCRIPTS = {
+    "mean": "mean_value.py",
+    "max": "max_value.py",
+    "stddev": "stddev_value.py",
+    "minmax": "minmax_normalization.py",
+    "skewness": "skewness.py",
+    "summary": "column_summary.py",
+    "percentiles": "percentiles.py",
+    "histogram": "value_histogram.py",
+}
 
 
 class MapReduceWorker(QThread):
     finished = pyqtSignal(str, str, int)
+    # (tamamlanma yüzdesi, durum metni)
+    progress = pyqtSignal(int, str)
 
-    def __init__(self, cmd):
+    def __init__(self, cmd, input_path=None, client=None):
         super().__init__()
         self.cmd = cmd
+        # Verilirse boyutu okunur ve ilerlemeden işlenen MB/s tahmin edilir
+        self.input_path = input_path
+        self.client = client
+        self.process = None
+        self.log = JobLog()
+        self.cancelled = False
 
     def run(self):
         try:
-            process = subprocess.Popen(
+            input_bytes = self.input_size()
+            self.process = subprocess.Popen(
                 self.cmd,
                 stdout=subprocess.PIPE,
                 stderr=subprocess.PIPE,
                 universal_newlines=True,
+                # İptalde mrjob ile başlattığı "hadoop jar" birlikte durdurulur
+                start_new_session=True,
+            )
+            # stdout ayrı bir iş parçacığında okunur; stderr'i satır satır
+            # izlerken stdout tamponu dolup süreci kilitlemesin
+            stdout_lines = []
+            reader = threading.Thread(
+                target=lambda: stdout_lines.extend(self.process.stdout)
+            )
+            reader.start()
+
+            start_time = time.time()
+            stderr_lines = []
+            for line in self.process.stderr:
+                stderr_lines.append(line)
+                if self.log.feed(line):
+                    self.progress.emit(
+                        int(self.log.fraction * 100),
+                        self.status_text(time.time() - start_time, input_bytes),
+                    )
+
+            reader.join()
+            self.process.wait()
+            if self.cancelled:
+                self.kill_application()
+            self.finished.emit(
+                "".join(stdout_lines), "".join(stderr_lines), self.process.returncode
             )
-            stdout, stderr = process.communicate()
-            self.finished.emit(stdout, stderr, process.returncode)
         except Exception as e:
             self.finished.emit("", str(e), -1)
 
+    def input_size(self):
+        if not self.input_path or not self.client:
+            return None
+        try:
+            return self.client.status(self.input_path)["length"]
+        except OSError:
+            return None
+
+    def status_text(self, elapsed, input_bytes):
+        log = self.log
+        text = (
+            f"Adım {log.step}/{log.steps} - map %{log.map_percent} "
+            f"reduce %{log.reduce_percent} - {elapsed:.0f} s"
+        )
+        if input_bytes and log.map_percent and elapsed > 0:
+            # İlk adımın map ilerlemesi, okunan girdi miktarıyla orantılıdır
+            done = input_bytes if log.step > 1 else input_bytes * log.map_percent / 100
+            text += f" - {done / elapsed / 1e6:.1f} MB/s"
+        return text
+
+    def cancel(self):
+        """
+        İşi durdur (arayüz iş parçacığından çağrılır, beklemez); YARN
+        uygulaması süreç grubu kapandıktan sonra run() içinde sonlandırılır
+        """
+        self.cancelled = True
+        if self.process and self.process.poll() is None:
+            try:
+                os.killpg(self.process.pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+
+    def kill_application(self):
+        """İptal edilen Hadoop işinin YARN uygulamasını sonlandır"""
+        # Uygulama numarası, süreç kapanmadan önce yazılmışsa loglardadır
+        if self.log.application_id:
+            subprocess.run(
+                ["yarn", "application", "-kill", self.log.application_id],
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL,
+            )
+
 
-class HadoopFileWorker(QThread):
-    finished = pyqtSignal(str, str, int)
+class HdfsWorker(QThread):
+    """Bir HDFS çağrısını arayüzü bekletmeden ayrı bir iş parçacığında yapar"""
 
-    def __init__(self, operation, local_path=None, hdfs_path=None):
+    # (sonuç, hata mesajı; başarılıysa boş)
+    finished = pyqtSignal(object, str)
+
+    def __init__(self, function, *args):
         super().__init__()
-        self.operation = operation  # 'upload' or 'list'
-        self.local_path = local_path
-        self.hdfs_path = hdfs_path
+        self.function = function
+        self.args = args
 
     def run(self):
         try:
-            if self.operation == "upload":
-                cmd = f"hadoop fs -put '{self.local_path}' {self.hdfs_path}"
-                process = subprocess.Popen(
-                    cmd,
-                    shell=True,
-                    stdout=subprocess.PIPE,
-                    stderr=subprocess.PIPE,
-                    universal_newlines=True,
-                )
-                stdout, stderr = process.communicate()
-                self.finished.emit(stdout, stderr, process.returncode)
-
-            elif self.operation == "list":
-                cmd = "hadoop fs -ls /user/student/us-accidents/data | awk '{print $8}'"
-                process = subprocess.Popen(
-                    cmd,
-                    shell=True,
-                    stdout=subprocess.PIPE,
-                    stderr=subprocess.PIPE,
-                    universal_newlines=True,
-                )
-                stdout, stderr = process.communicate()
-                self.finished.emit(stdout, stderr, process.returncode)
-
+            result = self.function(*self.args)
         except Exception as e:
-            self.finished.emit("", str(e), -1)
+            self.finished.emit(None, str(e) or type(e).__name__)
+            return
+        self.finished.emit(result, "")
+
+
+def upload_dataset(client, local_path, hdfs_path, columnar_dir=None, parquet_dir=None):
+    """
+    CSV'yi HDFS'e yükle; HDFS yolunun uzantısı (.gz, .bz2) farklı bir
+    sıkıştırma istiyorsa dosya önce yerelde sıkıştırılır. İstenirse
+    sütunsal önbelleği ve Parquet deposunu da oluştur
+    """
+    if input_codec(local_path) == input_codec(hdfs_path):
+        client.upload(local_path, hdfs_path)
+    else:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            compressed_path = os.path.join(tmp_dir, os.path.basename(hdfs_path))
+            compress_file(local_path, compressed_path)
+            client.upload(compressed_path, hdfs_path)
+    if columnar_dir:
+        build_store(client, "column_store.py", local_path, columnar_dir)
+    if parquet_dir:
+        build_store(client, "parquet_store.py", local_path, parquet_dir)
+
+
+def build_store(client, store_script, local_path, hdfs_dir):
+    """
+    CSV'yi bir kez sütunsal önbelleğe (column_store.py) ya da Parquet
+    deposuna (parquet_store.py) dönüştür ve HDFS'e yükle
+    """
+    script_dir = os.path.dirname(os.path.abspath(__file__))
+    store_script = f"{script_dir}/../mapreduce/{store_script}"
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        store_dir = os.path.join(tmp_dir, os.path.basename(hdfs_dir))
+        process = subprocess.run(
+            [
+                "python",
+                store_script,
+                local_path,
+                store_dir,
+                "--base-uri",
+                f"hdfs://{hdfs_dir}",
+            ],
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            universal_newlines=True,
+        )
+        if process.returncode != 0:
+            raise RuntimeError(process.stderr)
+        client.delete(hdfs_dir, recursive=True)
+        client.upload(store_dir, hdfs_dir)
 
 
 class BigDataAnalysisApp(QMainWindow):
@@ -100,6 +250,21 @@ class BigDataAnalysisApp(QMainWindow):
         self.script_dir = os.path.dirname(os.path.abspath(__file__))
         self.output_dir = f"/user/student/us-accidents/outputs/{self.get_selected_stat()}_{uuid.uuid4().hex[:6]}"
         self.hadoop_data_dir = "/user/student/us-accidents/data"
+        self.hadoop_columnar_dir = "/user/student/us-accidents/columnar"
+        self.hadoop_parquet_dir = "/user/student/us-accidents/parquet"
+        # HDFS'e WebHDFS ile erişilir (HDFS_URL); her çağrı JVM başlatmaz
+        self.hdfs = get_client()
+        # Aynı dosya/istatistik/sütun için sonuçlar yerelde ve HDFS'de saklanır
+        self.result_cache = ResultCache(
+            hdfs_dir="/user/student/us-accidents/cache", client=self.hdfs
+        )
+        self.job_stdout = ""
+        # Analiz istekleri kısa bir süre biriktirilip dosya başına birleştirilir
+        self.job_queue = JobQueue()
+        self.current_batch = None
+        self.queue_timer = QTimer(self)
+        self.queue_timer.setSingleShot(True)
+        self.queue_timer.timeout.connect(self.dispatch_queue)
 
         self.central_widget = QWidget()
         self.setCentralWidget(self.central_widget)
@@ -112,7 +277,10 @@ class BigDataAnalysisApp(QMainWindow):
         self.create_results_area()
 
         self.worker = None
-        self.hadoop_worker = None
+        # Çalışan HDFS iş parçacıkları bitene kadar referansla canlı tutulur
+        self.hdfs_workers = []
+        self.pending_upload = None
+        self.group_by = "none"
         self.clear_results()
 
         # Hadoop'daki mevcut dosyaları listele
@@ -135,6 +303,28 @@ class BigDataAnalysisApp(QMainWindow):
         local_file_layout.addWidget(self.upload_button)
         file_layout.addLayout(local_file_layout)
 
+        # Optional columnar binary cache built once at upload time
+        self.columnar_upload_check = QCheckBox(
+            "Yüklerken sütunsal önbellek oluştur (sayısal sütunlar, .npy blokları)"
+        )
+        file_layout.addWidget(self.columnar_upload_check)
+        # Yıl/eyalet bölümlü Parquet; taramalar yalnızca gereken sütunları okur
+        self.parquet_upload_check = QCheckBox(
+            "Yüklerken Parquet deposu oluştur (yıl ve eyalete göre bölümlü)"
+        )
+        file_layout.addWidget(self.parquet_upload_check)
+
+        # gzip arşiv için; bz2 bölünebilir olduğundan map paralelliği korunur
+        codec_layout = QHBoxLayout()
+        codec_layout.addWidget(QLabel("Yükleme Sıkıştırması:"))
+        self.upload_codec_combo = QComboBox()
+        self.upload_codec_combo.addItem("Yok (dosya olduğu gibi)", "none")
+        self.upload_codec_combo.addItem("gzip (.gz, arşiv; tek mapper)", "gzip")
+        self.upload_codec_combo.addItem("bz2 (.bz2, bölünebilir)", "bz2")
+        codec_layout.addWidget(self.upload_codec_combo)
+        codec_layout.addStretch()
+        file_layout.addLayout(codec_layout)
+
         # Hadoop file selection
         hadoop_file_layout = QHBoxLayout()
         hadoop_file_layout.addWidget(QLabel("HDFS Dosyası:"))
@@ -164,6 +354,9 @@ class BigDataAnalysisApp(QMainWindow):
             ("Standart Sapma", "stddev"),
             ("Min-Max Normalizasyon", "minmax"),
             ("Çarpıklık (Skewness)", "skewness"),
+            ("Tüm İstatistikler (Tek Tarama)", "summary"),
+            ("Yüzdelikler (Kutu Grafiği)", "percentiles"),
+            ("Değer Dağılımı (Histogram)", "histogram"),
         ]
 
         for i, (text, value) in enumerate(stats):
@@ -180,28 +373,83 @@ class BigDataAnalysisApp(QMainWindow):
 
     def create_column_selection(self):
         column_group = QGroupBox("Sütun Seçimi")
+        group_layout = QVBoxLayout()
         column_layout = QHBoxLayout()
 
         column_layout.addWidget(QLabel("Analiz Edilecek Sütun İndeksi:"))
         self.column_index = QLineEdit()
-        self.column_index.setPlaceholderText("2 (Varsayılan)")
-        self.column_index.setValidator(QIntValidator(0, 100))  # Only allow numbers
-        self.column_index.setMaximumWidth(50)
+        self.column_index.setPlaceholderText("2 (Varsayılan), özet için: 2,9,20")
+        # Only allow numbers; the summary job accepts a comma-separated list
+        self.column_index.setValidator(
+            QRegExpValidator(QRegExp(r"\d{1,2}(,\d{1,2})*"))
+        )
+        self.column_index.setMaximumWidth(200)
         column_layout.addWidget(self.column_index)
+        self.use_columnar_check = QCheckBox("Sütunsal önbelleği kullan (özet)")
+        column_layout.addWidget(self.use_columnar_check)
+        column_layout.addWidget(QLabel("Gruplama (özet):"))
+        self.group_combo = QComboBox()
+        self.group_combo.addItem("Yok", "none")
+        self.group_combo.addItem("Eyalet (State)", "State")
+        self.group_combo.addItem("Şehir (City)", "City")
+        self.group_combo.addItem("Yıl", "year")
+        column_layout.addWidget(self.group_combo)
         column_layout.addStretch()
+        group_layout.addLayout(column_layout)
 
-        column_group.setLayout(column_layout)
+        parquet_layout = QHBoxLayout()
+        self.use_parquet_check = QCheckBox(
+            "Parquet deposunu kullan (yıl/eyalet bölümleri, yalnızca gereken sütunlar)"
+        )
+        parquet_layout.addWidget(self.use_parquet_check)
+        parquet_layout.addWidget(QLabel("Bölüm Filtresi:"))
+        self.where_edit = QLineEdit()
+        self.where_edit.setPlaceholderText("State=CA,year=2021")
+        self.where_edit.setMaximumWidth(200)
+        parquet_layout.addWidget(self.where_edit)
+        parquet_layout.addStretch()
+        group_layout.addLayout(parquet_layout)
+
+        column_group.setLayout(group_layout)
         self.main_layout.addWidget(column_group)
 
     def create_run_button(self):
         run_layout = QVBoxLayout()
+        engine_layout = QHBoxLayout()
+        engine_layout.addWidget(QLabel("Çalıştırma Motoru:"))
+        self.engine_combo = QComboBox()
+        # Yerel motor aynı sonuçları tek düğümde NumPy ile saniyeler içinde üretir
+        self.engine_combo.addItem("Hadoop MapReduce", "hadoop")
+        self.engine_combo.addItem("Yerel NumPy (tek düğüm)", "local")
+        engine_layout.addWidget(self.engine_combo)
+        self.use_cache_check = QCheckBox("Önbellekteki sonuçları kullan")
+        self.use_cache_check.setChecked(True)
+        engine_layout.addWidget(self.use_cache_check)
+        engine_layout.addWidget(QLabel("Ara Çıktı Sıkıştırması:"))
+        self.map_codec_combo = QComboBox()
+        # Map çıktısı diske ve shuffle'a sıkıştırılarak yazılır (Hadoop)
+        self.map_codec_combo.addItem("Küme varsayılanı", None)
+        self.map_codec_combo.addItem("Kapalı", "none")
+        self.map_codec_combo.addItem("Snappy", "snappy")
+        self.map_codec_combo.addItem("LZ4", "lz4")
+        self.map_codec_combo.addItem("gzip", "gzip")
+        self.map_codec_combo.addItem("bz2", "bz2")
+        engine_layout.addWidget(self.map_codec_combo)
+        engine_layout.addStretch()
+        run_layout.addLayout(engine_layout)
         self.run_button = QPushButton("MapReduce İşini Çalıştır")
         self.run_button.clicked.connect(self.run_mapreduce_job)
         run_layout.addWidget(self.run_button)
+        self.cancel_button = QPushButton("İptal")
+        self.cancel_button.clicked.connect(self.cancel_job)
+        self.cancel_button.setEnabled(False)
+        progress_layout = QHBoxLayout()
         self.progress = QProgressBar()
         self.progress.setRange(0, 0)
         self.progress.setVisible(False)
-        run_layout.addWidget(self.progress)
+        progress_layout.addWidget(self.progress)
+        progress_layout.addWidget(self.cancel_button)
+        run_layout.addLayout(progress_layout)
         self.main_layout.addLayout(run_layout)
 
     def create_results_area(self):
@@ -242,13 +490,26 @@ class BigDataAnalysisApp(QMainWindow):
             return "mean"
 
     def get_column_index(self):
+        return self.get_column_indices()[0]
+
+    def get_column_indices(self):
         try:
-            col_text = self.column_index.text()
+            col_text = self.column_index.text().strip(",")
             if col_text:
-                return int(col_text)
-            return 2  # Default value
+                return [int(c) for c in col_text.split(",")]
+            return [2]  # Default value
         except:
-            return 2  # Default value
+            return [2]  # Default value
+
+    def get_columnar_dir(self, path):
+        """HDFS directory of the columnar cache of a CSV file"""
+        stem = os.path.splitext(os.path.basename(strip_codec(path)))[0]
+        return f"{self.hadoop_columnar_dir}/{stem}"
+
+    def get_parquet_dir(self, path):
+        """HDFS directory of the Parquet store of a CSV file"""
+        stem = os.path.splitext(os.path.basename(strip_codec(path)))[0]
+        return f"{self.hadoop_parquet_dir}/{stem}"
 
     def browse_local_file(self):
         file_path, _ = QFileDialog.getOpenFileName(
@@ -257,6 +518,14 @@ class BigDataAnalysisApp(QMainWindow):
         if file_path:
             self.local_file_path.setText(file_path)
 
+    def start_hdfs_worker(self, slot, function, *args):
+        """function(*args)'ı arka planda çalıştır; sonucu slot'a ilet"""
+        worker = HdfsWorker(function, *args)
+        worker.finished.connect(slot)
+        self.hdfs_workers = [w for w in self.hdfs_workers if w.isRunning()]
+        self.hdfs_workers.append(worker)
+        worker.start()
+
     def upload_to_hadoop(self):
         local_path = self.local_file_path.text()
         if not local_path:
@@ -268,11 +537,24 @@ class BigDataAnalysisApp(QMainWindow):
             return
 
         filename = os.path.basename(local_path)
+        codec = self.upload_codec_combo.currentData()
+        if codec != "none":
+            filename = with_codec(strip_codec(filename), codec)
         hdfs_path = f"{self.hadoop_data_dir}/{filename}"
+        self.pending_upload = (local_path, hdfs_path)
+
+        # Dosyanın HDFS'de olup olmadığı arka planda kontrol edilir
+        self.progress.setVisible(True)
+        self.set_buttons_enabled(False)
+        self.start_hdfs_worker(self.upload_checked, self.hdfs.exists, hdfs_path)
 
-        # Check if file already exists in HDFS
-        check_cmd = f"hadoop fs -test -e {hdfs_path}"
-        if subprocess.call(check_cmd, shell=True) == 0:
+    def upload_checked(self, exists, error):
+        local_path, hdfs_path = self.pending_upload
+        if error:
+            self.upload_finished(None, error)
+            return
+
+        if exists:
             reply = QMessageBox.question(
                 self,
                 "Dosya Mevcut",
@@ -281,48 +563,73 @@ class BigDataAnalysisApp(QMainWindow):
                 QMessageBox.No,
             )
             if reply == QMessageBox.No:
+                self.progress.setVisible(False)
+                self.set_buttons_enabled(True)
                 return
 
         self.result_text.append(
             f"{local_path} dosyası {hdfs_path} konumuna yükleniyor..."
         )
-        self.progress.setVisible(True)
-        self.set_buttons_enabled(False)
 
-        self.hadoop_worker = HadoopFileWorker("upload", local_path, hdfs_path)
-        self.hadoop_worker.finished.connect(self.upload_finished)
-        self.hadoop_worker.start()
+        columnar_dir = None
+        if self.columnar_upload_check.isChecked():
+            columnar_dir = self.get_columnar_dir(local_path)
+            self.result_text.append(
+                f"Sütunsal önbellek {columnar_dir} konumunda oluşturulacak..."
+            )
+        parquet_dir = None
+        if self.parquet_upload_check.isChecked():
+            parquet_dir = self.get_parquet_dir(local_path)
+            self.result_text.append(
+                f"Parquet deposu {parquet_dir} konumunda oluşturulacak..."
+            )
+
+        self.start_hdfs_worker(
+            self.upload_finished,
+            upload_dataset,
+            self.hdfs,
+            local_path,
+            hdfs_path,
+            columnar_dir,
+            parquet_dir,
+        )
 
     def list_hadoop_files(self):
         self.result_text.append("Hadoop'daki veri dosyaları listeleniyor...")
         self.progress.setVisible(True)
         self.set_buttons_enabled(False)
 
-        self.hadoop_worker = HadoopFileWorker("list")
-        self.hadoop_worker.finished.connect(self.list_files_finished)
-        self.hadoop_worker.start()
+        self.start_hdfs_worker(
+            self.list_files_finished, self.hdfs.list, self.hadoop_data_dir
+        )
 
-    def upload_finished(self, stdout, stderr, return_code):
+    def upload_finished(self, _, error):
         self.progress.setVisible(False)
         self.set_buttons_enabled(True)
 
-        if return_code == 0:
+        if not error:
             self.result_text.append("Dosya başarıyla yüklendi!\n")
+            # Üzerine yazılan dosyanın eski sonuçlarını önbellekten sil
+            self.result_cache.invalidate(self.pending_upload[1])
             # Listeyi güncelle
             self.list_hadoop_files()
         else:
-            error_msg = f"HATA (Kod: {return_code}):\n{stderr}"
+            error_msg = f"HATA:\n{error}"
             self.result_text.append(error_msg)
             QMessageBox.critical(self, "Yükleme Başarısız", error_msg)
 
-    def list_files_finished(self, stdout, stderr, return_code):
+    def list_files_finished(self, entries, error):
         self.progress.setVisible(False)
         self.set_buttons_enabled(True)
 
-        if return_code == 0:
-            files = stdout.strip().split("\n")
-            # Sadece CSV dosyalarını filtrele
-            csv_files = [f for f in files if f.lower().endswith(".csv")]
+        if not error:
+            # Sadece CSV dosyalarını (sıkıştırılmışlar dahil) filtrele
+            csv_files = [
+                entry["path"]
+                for entry in entries
+                if entry["type"] == "FILE"
+                and strip_codec(entry["path"]).lower().endswith(".csv")
+            ]
 
             self.hadoop_file_combo.clear()
             if csv_files:
@@ -334,114 +641,370 @@ class BigDataAnalysisApp(QMainWindow):
                     "Hadoop'da CSV dosyası bulunamadı. Varsayılan dosya kullanılacak.\n"
                 )
         else:
-            error_msg = f"HATA (Kod: {return_code}):\n{stderr}"
+            error_msg = f"HATA:\n{error}"
             self.result_text.append(error_msg)
             QMessageBox.critical(self, "Listeleme Başarısız", error_msg)
 
     def set_buttons_enabled(self, enabled):
         self.browse_button.setEnabled(enabled)
         self.upload_button.setEnabled(enabled)
+        self.columnar_upload_check.setEnabled(enabled)
+        self.parquet_upload_check.setEnabled(enabled)
+        self.upload_codec_combo.setEnabled(enabled)
         self.refresh_button.setEnabled(enabled)
         self.run_button.setEnabled(enabled)
+        self.engine_combo.setEnabled(enabled)
+        self.group_combo.setEnabled(enabled)
 
     def run_mapreduce_job(self):
         try:
+            request = self.build_request()
+        except Exception as e:
+            QMessageBox.critical(self, "Hata", str(e))
+            return
+        if request is None:
+            return
+
+        if self.current_batch is None and not len(self.job_queue):
             self.clear_results()
-            stat_type = self.get_selected_stat()
-            column_index = self.get_column_index()
-            hdfs_path = self.hadoop_file_combo.currentText()
-            self.output_dir = (
-                f"/user/student/us-accidents/outputs/{stat_type}_{uuid.uuid4().hex[:6]}"
+
+        if self.use_cache_check.isChecked():
+            cached = self.lookup_cache(request)
+            if cached is not None:
+                self.result_text.append(f"Sonuçlar (önbellek):\n{cached}")
+                self.group_by = request.group_by
+                self.show_job_output(request.stat_type, cached)
+                return
+
+        self.job_queue.add(request)
+        self.result_text.append(f"Kuyruğa eklendi: {request.describe()}")
+        # Kısa süre içinde gelen istekler aynı işte birleştirilebilir
+        if self.current_batch is None and not self.queue_timer.isActive():
+            self.queue_timer.start(COALESCE_WINDOW_MS)
+
+    def build_request(self):
+        """Seçili istatistik, sütun ve dosya için bir istek; geçersizse None"""
+        stat_type = self.get_selected_stat()
+        hdfs_path = self.hadoop_file_combo.currentText()
+
+        # Özet ve yüzdelik işleri birden fazla sütunu tek taramada işler
+        if stat_type in ("summary", "percentiles"):
+            columns = self.get_column_indices()
+            column_args = ["--columns", ",".join(str(c) for c in columns)]
+        else:
+            columns = [self.get_column_index()]
+            column_args = ["--column", str(columns[0])]
+
+        engine = self.engine_combo.currentData()
+        group_by = "none"
+        if stat_type == "summary":
+            group_by = self.group_combo.currentData()
+        if group_by != "none":
+            if engine == "local":
+                QMessageBox.warning(
+                    self,
+                    "Uyarı",
+                    "Gruplanmış istatistikler yalnızca Hadoop motoruyla çalışır.",
+                )
+                return None
+            salt = GROUP_SALT.get(group_by, 1)
+            column_args = ["--group-by", group_by, "--salt", str(salt)] + column_args
+
+        # Only the needed column chunks of the year/State partitions are read;
+        # on Hadoop the summary job reads the store for the statistics it covers
+        where = self.where_edit.text().strip()
+        parquet = (
+            group_by == "none"
+            and (engine == "local" or derivable(stat_type, columns))
+            and self.use_parquet_check.isChecked()
+        )
+        if where and not parquet:
+            QMessageBox.warning(
+                self,
+                "Uyarı",
+                "Bölüm filtresi yalnızca gruplamasız Parquet taramalarında "
+                "kullanılabilir (Hadoop'ta standart sapma, çarpıklık, özet ve "
+                "Severity için ortalama, maksimum; yerel motorda tüm "
+                "istatistikler).",
             )
+            return None
+
+        # Read memory-mapped column blocks instead of the CSV text
+        columnar = (
+            engine == "hadoop"
+            and stat_type == "summary"
+            and group_by == "none"
+            and self.use_columnar_check.isChecked()
+        )
+
+        input_format = "csv"
+        if parquet:
+            input_format = "parquet"
+        elif columnar:
+            input_format = "columnar"
+        request = AnalysisRequest(
+            stat_type,
+            hdfs_path,
+            columns,
+            column_args,
+            engine,
+            group_by,
+            input_format,
+            where,
+        )
+        if parquet and engine == "local":
+            parquet_dir = self.get_parquet_dir(hdfs_path)
+            input_args = ["--parquet", f"hdfs://{parquet_dir}"]
+            if where:
+                input_args += ["--where", where]
+        else:
+            input_args = request.input_args()
+        request.column_args = input_args + column_args
+        return request
 
-            scripts = {
-                "mean": "mean_value.py",
-                "max": "max_value.py",
-                "stddev": "stddev_value.py",
-                "minmax": "minmax_normalization.py",
-                "skewness": "skewness.py",
-            }
+    def dispatch_queue(self):
+        """En eski isteği, onunla aynı taramada çalışabilenlerle birlikte başlat"""
+        if self.current_batch is not None:
+            return
+        batch = self.job_queue.next_batch()
+        if not batch:
+            return
 
+        self.current_batch = batch
+        cmd, size_path = self.build_command(batch)
+        if len(batch) > 1:
+            self.result_text.append(
+                f"{len(batch)} istek tek bir taramada birleştirildi:\n"
+                + "\n".join(f"  {request.describe()}" for request in batch)
+            )
+        self.result_text.append(f"Komut çalıştırılıyor: {' '.join(cmd)}\n")
+        self.progress.setVisible(True)
+        self.cancel_button.setEnabled(True)
+
+        self.worker = MapReduceWorker(cmd, size_path, self.hdfs)
+        self.worker.progress.connect(self.job_progress)
+        self.worker.finished.connect(self.job_finished)
+        self.worker.start()
+
+    def build_command(self, batch):
+        """(komut, boyutu okunacak girdi); birden çok istek özet işinde birleşir"""
+        request = batch[0]
+        stat_type = request.stat_type
+        column_args = request.column_args
+        if fused(batch):
+            stat_type = "summary"
+            columns = ",".join(str(c) for c in batch_columns(batch))
+            column_args = request.input_args() + ["--columns", columns]
+
+        input_path = f"hdfs://{request.path}"
+        if request.engine == "local":
+            # Sonuçlar HDFS yerine doğrudan stdout'tan okunur; ilerleme yazılmaz
             cmd = [
                 "python",
-                f"{self.script_dir}/../mapreduce/{scripts[stat_type]}",
-                "-r",
-                "hadoop",
-                f"hdfs://{hdfs_path}",
-                "--output-dir",
-                f"hdfs://{self.output_dir}",
-                "--column",
-                str(column_index),
-            ]
-
-            self.result_text.append(f"Komut çalıştırılıyor: {' '.join(cmd)}\n")
-            self.result_text.append(f"Analiz edilen sütun indeksi: {column_index}\n")
-            self.set_buttons_enabled(False)
-            self.progress.setVisible(True)
-
-            self.worker = MapReduceWorker(cmd)
-            self.worker.finished.connect(self.job_finished)
-            self.worker.start()
-        except Exception as e:
-            QMessageBox.critical(self, "Hata", str(e))
-            self.set_buttons_enabled(True)
-            self.progress.setVisible(False)
+                f"{self.script_dir}/../engine/local_engine.py",
+                input_path,
+                "--stat",
+                stat_type,
+            ] + column_args
+            return cmd, None
+
+        self.output_dir = (
+            f"/user/student/us-accidents/outputs/{stat_type}_{uuid.uuid4().hex[:6]}"
+        )
+        # Hadoop işleri için ilerlemeden MB/s tahmini yapılır
+        size_path = input_path
+        if request.input_format == "columnar":
+            columnar_dir = self.get_columnar_dir(request.path)
+            input_path = f"hdfs://{columnar_dir}/blocks.txt"
+            size_path = None
+        elif request.input_format == "parquet":
+            parquet_dir = self.get_parquet_dir(request.path)
+            input_path = f"hdfs://{parquet_dir}/row_groups.txt"
+            size_path = None
+
+        cmd = [
+            "python",
+            f"{self.script_dir}/../mapreduce/{SCRIPTS[stat_type]}",
+            "-r",
+            "hadoop",
+            input_path,
+            "--output-dir",
+            f"hdfs://{self.output_dir}",
+        ] + column_args
+        # Sıkıştırma sonucu değiştirmez; önbellek anahtarına girmez
+        map_codec = self.map_codec_combo.currentData()
+        if map_codec:
+            cmd += ["--map-output-codec", map_codec]
+        return cmd, size_path
+
+    def job_progress(self, percent, status):
+        if self.progress.maximum() == 0:
+            # İlk ilerleme satırı gelene kadar belirsiz çubuk gösterilir
+            self.progress.setRange(0, 100)
+        self.progress.setValue(percent)
+        self.progress.setFormat(f"%p% - {status}")
+
+    def cancel_job(self):
+        if self.worker and self.worker.isRunning():
+            self.cancel_button.setEnabled(False)
+            self.result_text.append("İş iptal ediliyor...")
+            self.worker.cancel()
+
+    def reset_progress(self):
+        self.cancel_button.setEnabled(False)
+        self.progress.setVisible(False)
+        self.progress.setRange(0, 0)
+        self.progress.setFormat("%p%")
+
+    def display_counters(self, log):
+        """Hadoop sayaçlarından özet (yalnızca Hadoop motorunda bulunur)"""
+        counters = [
+            ("Map input records", "Okunan kayıt"),
+            ("Map output bytes", "Map çıktısı (bayt)"),
+            ("Reduce shuffle bytes", "Shuffle (bayt)"),
+            ("Reduce output records", "Reduce çıktısı (kayıt)"),
+        ]
+        lines = [
+            f"  {label}: {log.counter(name)}"
+            for name, label in counters
+            if log.counter(name) is not None
+        ]
+        if lines:
+            self.result_text.append("\nHadoop Sayaçları:\n" + "\n".join(lines))
 
     def job_finished(self, stdout, stderr, return_code):
-        self.set_buttons_enabled(True)
-        self.progress.setVisible(False)
+        self.reset_progress()
+
+        if self.worker.cancelled:
+            self.result_text.append("İş kullanıcı tarafından iptal edildi.")
+            self.finish_batch()
+            return
 
         if return_code != 0:
             error_msg = f"HATA (Kod: {return_code}):\n{stderr}"
             self.result_text.append(error_msg)
             QMessageBox.critical(self, "İşlem Başarısız", error_msg)
+            self.finish_batch()
             return
 
-        try:
-            stat_type = self.get_selected_stat()
-            result_cmd = f"hadoop fs -cat {self.output_dir}/part-*"
-            hdfs_result = subprocess.check_output(result_cmd, shell=True).decode()
-            self.result_text.append(f"Sonuçlar ({self.output_dir}):\n{hdfs_result}")
-
-            # Parse output based on stat type
-            if stat_type == "minmax":
-                results = []
-                for line in hdfs_result.strip().split("\n"):
-                    if line.strip():
-                        try:
-                            parts = line.split("\t")
-                            if len(parts) >= 2:
-                                key = parts[0]
-                                value = json.loads("\t".join(parts[1:]))
-                                results.append((key, value))
-                        except:
-                            continue
-                result_data = dict(results[:10])  # Take first 10 samples
-            else:
-                # For other stats, take the last line and try to parse as JSON
-                last_line = hdfs_result.strip().split("\n")[-1]
-                if "\t" in last_line:
-                    key, value = last_line.split("\t", 1)
-                    try:
-                        value = json.loads(value)
-                    except json.JSONDecodeError:
-                        value = value.strip('"')
-                    result_data = {key.strip('"'): value}
-                else:
-                    try:
-                        result_data = json.loads(last_line)
-                    except json.JSONDecodeError:
-                        result_data = {"raw_output": hdfs_result}
+        self.job_stdout = stdout
+        if self.current_batch[0].engine == "local":
+            self.deliver_results(stdout)
+            self.finish_batch()
+        else:
+            # Çıktı dosyaları arayüzü bekletmeden WebHDFS üzerinden okunur
+            self.progress.setVisible(True)
+            self.start_hdfs_worker(
+                self.results_fetched, self.hdfs.cat, f"{self.output_dir}/part-*"
+            )
 
-            self.display_results(stat_type, result_data)
+    def results_fetched(self, data, error):
+        self.progress.setVisible(False)
+        if error:
+            error_msg = (
+                f"Sonuç alınırken hata: {error}\n\nMapReduce Logları:\n"
+                f"{self.job_stdout}"
+            )
+            self.result_text.append(error_msg)
+            QMessageBox.warning(self, "Sonuç Alma Hatası", error_msg)
+        else:
+            self.deliver_results(data.decode())
+            self.display_counters(self.worker.log)
+        self.finish_batch()
+
+    def deliver_results(self, output):
+        """İşin çıktısını partideki her isteğe kendi biçiminde dağıt"""
+        batch = self.current_batch
+        try:
+            # Birleşik özet çıktısından her isteğin sonucu ayrıca üretilir
+            summaries = parse_summary(output) if fused(batch) else None
+            for request in batch:
+                result = output
+                if summaries is not None:
+                    result = split_output(request, summaries)
+                source = self.output_dir
+                if request.engine == "local":
+                    source = "yerel motor"
+                self.result_text.append(
+                    f"Sonuçlar ({source}) - {request.describe()}:\n{result}"
+                )
+                if request.cache_key:
+                    self.result_cache.put(request.cache_key, result, request.cache_meta)
+                self.group_by = request.group_by
+                self.show_job_output(request.stat_type, result)
 
         except Exception as e:
             error_msg = (
-                f"Sonuç işlenirken hata: {str(e)}\n\nMapReduce Logları:\n{stdout}"
+                f"Sonuç işlenirken hata: {str(e)}\n\nMapReduce Logları:\n"
+                f"{self.job_stdout}"
             )
             self.result_text.append(error_msg)
             QMessageBox.warning(self, "Sonuç Alma Hatası", error_msg)
 
+    def finish_batch(self):
+        self.current_batch = None
+        # İş sürerken kuyruğa eklenen istekler hemen başlatılır
+        self.dispatch_queue()
+
+    def lookup_cache(self, request):
+        """Önbellekteki sonucu döndür; yoksa None (anahtar isteğe yazılır)"""
+        try:
+            request.cache_key, request.cache_meta = self.result_cache.make_key(
+                request.path,
+                SCRIPTS[request.stat_type],
+                request.column_args,
+                request.engine,
+            )
+        except OSError:
+            # Dosya bilgisi alınamazsa önbellek atlanır
+            request.cache_key = None
+            return None
+        return self.result_cache.get(request.cache_key)
+
+    def show_job_output(self, stat_type, hdfs_result):
+        # Parse every "key<TAB>value" line; the data quality summary is
+        # reported separately from the statistic itself
+        results = []
+        quality = None
+        for line in hdfs_result.strip().split("\n"):
+            if "\t" not in line:
+                continue
+            key, value = line.split("\t", 1)
+            try:
+                value = json.loads(value)
+            except json.JSONDecodeError:
+                value = value.strip('"')
+            key = key.strip('"')
+            if key == "data_quality":
+                quality = value
+            else:
+                results.append((key, value))
+
+        if stat_type == "minmax":
+            samples = [(k, v) for k, v in results if k != "bounds"]
+            result_data = dict(samples[:10])  # Take first 10 samples
+        elif results:
+            # e.g. mean_value, statistics, or one line per column for summary
+            result_data = dict(results)
+        else:
+            result_data = {"raw_output": hdfs_result}
+
+        if quality:
+            self.display_data_quality(quality)
+        self.display_results(stat_type, result_data)
+
+    def display_data_quality(self, quality):
+        self.result_text.append(
+            f"\nVeri Kalitesi: {quality['missing']} eksik, "
+            f"{quality['parse_errors']} hatalı değer"
+        )
+        for name, count in quality.get("error_types", {}).items():
+            self.result_text.append(f"  {name}: {count}")
+        if quality.get("examples"):
+            self.result_text.append("Örnek satırlar:")
+            for example in quality["examples"]:
+                self.result_text.append(f"  [{example['type']}] {example['line']}")
+
     def display_results(self, stat_type, output):
         try:
             self.result_text.append(f"\nİstatistik Türü: {stat_type}\n")
@@ -550,6 +1113,99 @@ class BigDataAnalysisApp(QMainWindow):
                     bbox=dict(facecolor="white", alpha=0.8),
                 )
 
+        elif stat_type == "summary" and self.group_by != "none":
+            # Anahtarlar [grup, sütun]; ilk sütunun en kalabalık 20 grubu çizilir
+            groups = []
+            for key, stats in result_data.items():
+                group, column = json.loads(key)
+                if column == self.get_column_index() and stats.get("count"):
+                    groups.append((group or "(boş)", stats))
+            groups.sort(key=lambda item: item[1]["count"], reverse=True)
+            groups = groups[:20]
+
+            labels = [group for group, _ in groups]
+            means = [stats["mean"] for _, stats in groups]
+            stds = [stats["std_dev"] for _, stats in groups]
+            ax.bar(labels, means, yerr=stds, capsize=3, color="purple", alpha=0.7)
+            ax.set_ylabel("Ortalama ± Std. Sapma")
+            ax.set_title(
+                f"Sütun {self.get_column_index()} - {self.group_by} grupları "
+                "(en kalabalık 20)"
+            )
+            plt.setp(ax.get_xticklabels(), rotation=45, ha="right")
+
+        elif stat_type == "summary":
+            if isinstance(result_data, dict):
+                columns = sorted(
+                    (k for k, v in result_data.items() if v.get("count")), key=int
+                )
+                means = [result_data[c]["mean"] for c in columns]
+                stds = [result_data[c]["std_dev"] for c in columns]
+                labels = [f"Sütun {c}" for c in columns]
+
+                ax.bar(labels, means, yerr=stds, capsize=6, color="purple", alpha=0.7)
+                for i, c in enumerate(columns):
+                    stats = result_data[c]
+                    ax.annotate(
+                        f"min={stats['min']:.2f} max={stats['max']:.2f}\n"
+                        f"çarp.={stats['skewness']:.2f} bas.={stats['kurtosis']:.2f}",
+                        (i, means[i]),
+                        ha="center",
+                        va="bottom",
+                        fontsize=7,
+                    )
+                ax.set_ylabel("Ortalama ± Std. Sapma")
+                ax.set_title("Sütun Özetleri (Tek Tarama)")
+
+        elif stat_type == "histogram":
+            stats = result_data.get("statistics", {})
+            if stats.get("method") == "histogram":
+                values = [str(value) for value, _ in stats["histogram"]]
+                counts = [count for _, count in stats["histogram"]]
+                ax.bar(values, counts, color="teal")
+                ax.set_xlabel("Değer")
+                ax.set_ylabel("Kayıt Sayısı")
+                ax.set_title(
+                    f"Değer Dağılımı (ortalama={stats['mean']:.3f}, "
+                    f"medyan={stats['median']}, mod={stats['mode']})"
+                )
+                if len(values) > 20:
+                    plt.setp(ax.get_xticklabels(), visible=False)
+            elif stats:
+                # Çok fazla farklı değer: yalnızca moment istatistikleri var
+                ax.text(
+                    0.5,
+                    0.5,
+                    "Farklı değer sayısı çok yüksek, momentlere geçildi\n"
+                    f"ortalama={stats['mean']:.3f}, std={stats['std_dev']:.3f}",
+                    ha="center",
+                    va="center",
+                    transform=ax.transAxes,
+                )
+
+        elif stat_type == "percentiles":
+            if isinstance(result_data, dict):
+                # Kutu: çeyrekler ve medyan, bıyıklar: %5 ve %95 yüzdelikleri
+                boxes = []
+                for column in sorted(result_data, key=int):
+                    stats = result_data[column]
+                    q = stats["quantiles"]
+                    boxes.append(
+                        {
+                            "label": f"Sütun {column}",
+                            "whislo": q.get("0.05", stats["min"]),
+                            "q1": q["0.25"],
+                            "med": q["0.5"],
+                            "q3": q["0.75"],
+                            "whishi": q.get("0.95", stats["max"]),
+                            "fliers": [stats["min"], stats["max"]],
+                        }
+                    )
+                ax.bxp(boxes, showfliers=True)
+                error = next(iter(result_data.values()))["rank_error"]
+                ax.set_ylabel("Değer")
+                ax.set_title(f"Yüzdelikler (KLL, sıra hatası ±%{error * 100:.1f})")
+
         self.fig.tight_layout()
         self.canvas.draw()
 
@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""
+Arayüzden gelen analiz isteklerinin kuyruğu.
+
+İstekler kısa bir süre (COALESCE_WINDOW_MS) ya da çalışan iş bitene kadar
+biriktirilir. Aynı HDFS dosyası üzerindeki ve tek bir ColumnSummary
+taramasından türetilebilen istekler (standart sapma, çarpıklık, özet ve
+tamsayı sütunlarında ortalama, maksimum) tek bir işte birleştirilir; her
+isteğin sonucu bu ortak çıktıdan, kendi işinin çıktı biçiminde üretilir.
+Böylece kümedeki yük tıklama sayısıyla değil, farklı dosya sayısıyla
+artar. Diğer istekler (yüzdelikler, histogram, normalizasyon, gruplanmış
+özet, ondalıklı sütunlarda ortalama ve maksimum, yerel motor) sırası
+gelince kendi işlerinde çalışır. Yalnızca aynı girdi biçimini
+(CSV, sütunsal önbellek, Parquet ve bölüm filtresi) kullanan istekler
+birleştirilir.
+"""
+import json
+
+from column_summary import derivable, summary_outputs
+
+# Birleştirme için ilk isteğin ardından beklenen süre
+COALESCE_WINDOW_MS = 1500
+# Gruplanmış özette gruplama sütunu -> --salt (grup başına reducer anahtarı).
+# Satırların çoğu birkaç eyalette (CA, FL, TX) toplandığından yalnızca State
+# tuzlanır. City binlerce gruba kendiliğinden dağılır; year'ın ~8 grubu
+# eşit boyludur ve tuzlanınca yalnızca shuffle kayıtları artar
+# (group_balance_benchmark: 278 yerine 526)
+GROUP_SALT = {"State": 8, "City": 1, "year": 1}
+
+
+class AnalysisRequest:
+    """Kullanıcının tek bir analiz isteği (istatistik, dosya, sütunlar)"""
+
+    def __init__(
+        self,
+        stat_type,
+        path,
+        columns,
+        column_args,
+        engine="hadoop",
+        group_by="none",
+        input_format="csv",
+        where="",
+    ):
+        self.stat_type = stat_type
+        self.path = path
+        self.columns = columns
+        # Tek başına çalıştırıldığında işe verilen argümanlar (önbellek anahtarı)
+        self.column_args = column_args
+        self.engine = engine
+        self.group_by = group_by
+        # csv, columnar (sütunsal önbellek) veya parquet (where: bölüm filtresi)
+        self.input_format = input_format
+        self.where = where
+        self.cache_key = None
+        self.cache_meta = None
+
+    @property
+    def batch_key(self):
+        """Birleştirilebilen isteklerin ortak anahtarı; None ise tek başına"""
+        if (
+            self.engine != "hadoop"
+            or self.group_by != "none"
+            or not derivable(self.stat_type, self.columns)
+        ):
+            return None
+        return self.path, self.input_format, self.where
+
+    def input_args(self):
+        """Özet işinin girdi biçimi argümanları"""
+        if self.input_format == "csv":
+            return []
+        args = ["--input-format", self.input_format]
+        if self.where:
+            args += ["--where", self.where]
+        return args
+
+    def describe(self):
+        columns = ",".join(str(c) for c in self.columns)
+        return f"{self.stat_type} (sütun {columns}) - {self.path}"
+
+
+class JobQueue:
+    """Bekleyen istekler; next_batch() birleştirilebilenleri birlikte verir"""
+
+    def __init__(self):
+        self.pending = []
+
+    def __len__(self):
+        return len(self.pending)
+
+    def add(self, request):
+        self.pending.append(request)
+
+    def next_batch(self):
+        """En eski istek ve onunla aynı taramada çalışabilen diğer istekler"""
+        if not self.pending:
+            return []
+        first = self.pending.pop(0)
+        if first.batch_key is None:
+            return [first]
+        batch = [first]
+        batch += [r for r in self.pending if r.batch_key == first.batch_key]
+        self.pending = [r for r in self.pending if r.batch_key != first.batch_key]
+        return batch
+
+
+def batch_columns(batch):
+    """Birleşik özet işinin tarayacağı sütunlar"""
+    return sorted({column for request in batch for column in request.columns})
+
+
+def fused(batch):
+    """
+    Parti birleşik özet işiyle mi çalışır: birden çok istek ya da Parquet
+    girdili tek bir istek (Parquet deposunu yalnızca özet işi okur)
+    """
+    request = batch[0]
+    return len(batch) > 1 or (
+        request.engine == "hadoop"
+        and request.input_format == "parquet"
+        and request.stat_type != "summary"
+    )
+
+
+def parse_summary(output):
+    """ColumnSummary çıktısı -> {sütun: özet}"""
+    summaries = {}
+    for line in output.strip().split("\n"):
+        if "\t" not in line:
+            continue
+        key, value = line.split("\t", 1)
+        key = json.loads(key)
+        if key != "data_quality":
+            summaries[int(key)] = json.loads(value)
+    return summaries
+
+
+def split_output(request, summaries):
+    """Birleşik özetten isteğin kendi işinin üreteceği "key<TAB>value" metni"""
+    pairs = summary_outputs(
+        request.stat_type, {c: summaries[c] for c in request.columns}
+    )
+    return "".join(f"{json.dumps(k)}\t{json.dumps(v)}\n" for k, v in pairs)
@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+from mrjob.job import MRJob
+
+from compression import MAP_OUTPUT_CODECS
+from protocols import MsgPackProtocol
+
+SPLIT_MAXSIZE = "mapreduce.input.fileinputformat.split.maxsize"
+SPLIT_MINSIZE = "mapreduce.input.fileinputformat.split.minsize"
+MAP_TASKS = "mapreduce.job.maps"
+MAP_OUTPUT_COMPRESS = "mapreduce.map.output.compress"
+MAP_OUTPUT_CODEC = "mapreduce.map.output.compress.codec"
+
+
+class AccidentsJob(MRJob):
+    """
+    Base class of the US Accidents jobs: ships the shared modules and adds
+    input split tuning, map output compression and the choice of the
+    intermediate protocol. Mappers detect the header row by content
+    (csv_fields.is_header), so results do not depend on the number of
+    splits. Compressed inputs (.gz, .bz2) are decompressed by Hadoop.
+    """
+
+    FILES = [
+        "accidents_job.py",
+        "compression.py",
+        "csv_fields.py",
+        "data_quality.py",
+        "protocols.py",
+    ]
+
+    def configure_args(self):
+        super(AccidentsJob, self).configure_args()
+        self.add_passthru_arg(
+            "--split-size-mb",
+            type=int,
+            help="Input split size in MB (smaller splits -> more map tasks)",
+        )
+        self.add_passthru_arg(
+            "--map-tasks",
+            type=int,
+            help="Requested number of map tasks (mapreduce.job.maps hint)",
+        )
+        self.add_passthru_arg(
+            "--internal-protocol",
+            choices=["json", "msgpack"],
+            default="json",
+            help="Encoding between map and reduce: JSON text or packed MessagePack",
+        )
+        self.add_passthru_arg(
+            "--map-output-codec",
+            choices=["none"] + list(MAP_OUTPUT_CODECS),
+            help="Compress map output with this codec (default: cluster setting)",
+        )
+
+    def internal_protocol(self):
+        if self.options.internal_protocol == "msgpack":
+            return MsgPackProtocol()
+        return super(AccidentsJob, self).internal_protocol()
+
+    def jobconf(self):
+        jobconf = super(AccidentsJob, self).jobconf()
+
+        # Explicit --jobconf values win over the shortcuts below
+        if self.options.split_size_mb:
+            split_size = str(self.options.split_size_mb * 1024 * 1024)
+            jobconf.setdefault(SPLIT_MAXSIZE, split_size)
+            jobconf.setdefault(SPLIT_MINSIZE, split_size)
+        if self.options.map_tasks:
+            jobconf.setdefault(MAP_TASKS, str(self.options.map_tasks))
+        codec = self.options.map_output_codec
+        if codec == "none":
+            jobconf.setdefault(MAP_OUTPUT_COMPRESS, "false")
+        elif codec:
+            jobconf.setdefault(MAP_OUTPUT_COMPRESS, "true")
+            jobconf.setdefault(MAP_OUTPUT_CODEC, MAP_OUTPUT_CODECS[codec])
+
+        return jobconf
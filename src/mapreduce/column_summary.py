@@ -0,0 +1,418 @@
+#!/usr/bin/env python3
+import os
+import random
+
+from mrjob.step import MRStep
+
+from accidents_job import AccidentsJob
+from csv_fields import GROUP_COLUMNS, fields_reader, group_value, is_header, to_float
+from data_quality import QualityTracker, merge_quality
+from moments import (
+    MomentAccumulator,
+    array_moments,
+    describe,
+    interpret_skewness,
+    merge_moments,
+)
+
+NLINE_INPUT_FORMAT = "org.apache.hadoop.mapred.lib.NLineInputFormat"
+# Row groups are small (most year/State partitions hold a single one)
+PARQUET_ROW_GROUPS_PER_MAP = 32
+# Statistics of other jobs that summary_outputs() derives from one summary
+SUMMARY_STATS = ["mean", "max", "stddev", "skewness", "summary"]
+# MeanValue and MaxValue parse values with int(), which accepts only the
+# CSV text of Severity; the summary parses every column as floats
+INTEGER_COLUMNS = [2]
+
+
+class ColumnSummary(AccidentsJob):
+    """
+    MapReduce job computing count, min, max, mean, standard deviation,
+    skewness and kurtosis for several numerical columns in a single scan.
+
+    With --input-format columnar the input is the blocks.txt index of a
+    column store (column_store.py) and every mapper memory-maps the binary
+    blocks of the requested columns instead of parsing CSV text. With
+    --input-format parquet the input is the row_groups.txt index of a
+    Parquet store (parquet_store.py); mappers read only the column chunks
+    of the requested columns, and row groups outside the --where
+    partitions (e.g. State=CA,year=2021) are skipped without being read.
+
+    With --emit-partials the reducer outputs the mergeable partial state per
+    input file ([file, column] keys) instead of the summary, which lets
+    incremental.py scan only newly added files.
+
+    With --group-by State|City|year every statistic is computed per group
+    ([group, column] keys). In-mapper combining already sends one partial
+    per group and mapper; --salt N additionally spreads each group over N
+    reducer keys and merges those in a second step, so dominant groups
+    (CA, FL, TX) do not turn one reducer into a straggler.
+    """
+
+    FILES = AccidentsJob.FILES + [
+        "moments.py",
+        "column_store.py",
+        "parquet_store.py",
+    ]
+
+    def configure_args(self):
+        super(ColumnSummary, self).configure_args()
+        self.add_passthru_arg(
+            "--columns",
+            default="2",
+            help="Comma-separated indexes of the numerical columns (0-based)",
+        )
+        self.add_passthru_arg(
+            "--input-format",
+            choices=["csv", "columnar", "parquet"],
+            default="csv",
+            help="csv: raw CSV lines, columnar: blocks.txt of a column store, "
+            "parquet: row_groups.txt of a Parquet store",
+        )
+        self.add_passthru_arg(
+            "--where",
+            help="Partitions of the Parquet store to scan (e.g. State=CA,year=2021)",
+        )
+        self.add_passthru_arg(
+            "--emit-partials",
+            action="store_true",
+            help="Output the mergeable partials per input file instead of the summary",
+        )
+        self.add_passthru_arg(
+            "--group-by",
+            choices=["none"] + list(GROUP_COLUMNS),
+            default="none",
+            help="Compute the statistics per State, City or year (of Start_Time)",
+        )
+        self.add_passthru_arg(
+            "--salt",
+            type=int,
+            default=1,
+            help="Reducer keys per group; >1 enables two-level aggregation",
+        )
+
+    def steps(self):
+        if self.options.group_by != "none" and self.options.salt > 1:
+            return [
+                MRStep(
+                    mapper_init=self.mapper_init,
+                    mapper=self.mapper,
+                    mapper_final=self.mapper_final,
+                    combiner=self.combiner,
+                    reducer=self.reducer_salted,
+                ),
+                MRStep(reducer=self.reducer),
+            ]
+        return super(ColumnSummary, self).steps()
+
+    def hadoop_input_format(self):
+        # Index lines (column blocks or row groups) are split among map tasks
+        if self.options.input_format in ("columnar", "parquet"):
+            return NLINE_INPUT_FORMAT
+        return super(ColumnSummary, self).hadoop_input_format()
+
+    def jobconf(self):
+        jobconf = super(ColumnSummary, self).jobconf()
+        if self.options.input_format in ("columnar", "parquet"):
+            lines = "1"
+            if self.options.input_format == "parquet":
+                lines = str(PARQUET_ROW_GROUPS_PER_MAP)
+            jobconf.setdefault("mapreduce.input.lineinputformat.linespermap", lines)
+            # Streaming passes the NLineInputFormat offset key unless told not to
+            jobconf.setdefault("stream.map.input.ignoreKey", "true")
+        return jobconf
+
+    def mapper_init(self):
+        self.columns = [int(c) for c in self.options.columns.split(",")]
+        self.group_by = None
+        if self.options.group_by != "none":
+            if self.options.emit_partials or self.options.input_format != "csv":
+                raise ValueError(
+                    "--group-by cannot be combined with --emit-partials, "
+                    "columnar or Parquet input"
+                )
+            self.group_by = self.options.group_by
+            # The group field is read first, followed by the value columns
+            self.read_values = fields_reader(
+                [GROUP_COLUMNS[self.group_by]] + self.columns
+            )
+        else:
+            self.read_values = fields_reader(self.columns)
+
+        # Per (group, column): moments, min, max, missing and unparsable counts
+        self.moments = {}
+        self.min_val = {}
+        self.max_val = {}
+        self.missing = {}
+        self.invalid = {}
+        if self.group_by is None:
+            self.add_group(None)
+        self.quality = QualityTracker(self)
+        # Streaming exports the jobconf with dots replaced by underscores
+        self.input_file = os.environ.get(
+            "mapreduce_map_input_file", os.environ.get("map_input_file", "")
+        )
+
+        if self.options.input_format == "columnar":
+            # NumPy is only needed on the columnar path
+            from column_store import load_block
+
+            self.load_block = load_block
+
+        self.where = {}
+        if self.options.where and self.options.input_format != "parquet":
+            raise ValueError("--where needs --input-format parquet")
+        if self.options.input_format == "parquet":
+            # pyarrow is only needed on the Parquet path
+            from parquet_store import parse_where, partition_matches, read_row_group
+
+            self.where = parse_where(self.options.where)
+            self.partition_matches = partition_matches
+            self.read_row_group = read_row_group
+
+    def mapper(self, _, line):
+        if self.options.input_format == "columnar":
+            self.map_block(line)
+            return
+        if self.options.input_format == "parquet":
+            self.map_row_group(line)
+            return
+
+        # Skip the header row, detected by content (safe for any input split)
+        if is_header(line):
+            return
+
+        values = self.read_values(line)
+        group = None
+        if self.group_by:
+            group = group_value(self.group_by, values[0])
+            values = values[1:]
+            if (group, self.columns[0]) not in self.moments:
+                self.add_group(group)
+
+        for idx, value_str in zip(self.columns, values):
+            key = (group, idx)
+            try:
+                value = to_float(value_str)
+            except ValueError as e:
+                self.invalid[key] += 1
+                self.quality.malformed(line, e)
+                continue
+
+            if value is None:
+                self.missing[key] += 1
+                self.quality.missing(line)
+                continue
+
+            self.moments[key].add(value)
+            if self.min_val[key] is None or value < self.min_val[key]:
+                self.min_val[key] = value
+            if self.max_val[key] is None or value > self.max_val[key]:
+                self.max_val[key] = value
+
+    def add_group(self, group):
+        for idx in self.columns:
+            key = (group, idx)
+            self.moments[key] = MomentAccumulator()
+            self.min_val[key] = None
+            self.max_val[key] = None
+            self.missing[key] = 0
+            self.invalid[key] = 0
+
+    def map_block(self, line):
+        """Summarize one "column<TAB>values<TAB>nulls<TAB>rows" block at once"""
+        idx, values_path, nulls_path, rows = line.rstrip("\n").split("\t")
+        key = (None, int(idx))
+        if key not in self.moments:
+            return
+
+        values, valid = self.load_block(values_path, nulls_path, int(rows))
+        if valid is not None:
+            values = values[valid]
+        # Nulls were counted when the store was built; invalid values are nulls
+        self.add_values(key, values, int(rows) - len(values))
+
+    def map_row_group(self, line):
+        """Summarize one "path<TAB>row group<TAB>rows<TAB>year<TAB>State" line"""
+        path, row_group, _, year, state = line.rstrip("\n").split("\t")
+        # Row groups outside --where are skipped without opening the file
+        if not self.partition_matches({"year": year, "State": state}, self.where):
+            return
+
+        columns = self.read_row_group(path, int(row_group), self.columns)
+        for idx, (values, nulls) in columns.items():
+            self.add_values((None, idx), values, nulls)
+
+    def add_values(self, key, values, missing):
+        """Merge a NumPy array of valid values into the partial of key"""
+        self.missing[key] += missing
+        if not len(values):
+            return
+
+        self.moments[key].merge(array_moments(values))
+        block_min = float(values.min())
+        block_max = float(values.max())
+        if self.min_val[key] is None or block_min < self.min_val[key]:
+            self.min_val[key] = block_min
+        if self.max_val[key] is None or block_max > self.max_val[key]:
+            self.max_val[key] = block_max
+
+    def output_key(self, group, idx):
+        if self.options.emit_partials:
+            return [self.input_file, idx]
+        if self.group_by is None:
+            return idx
+        if self.options.salt > 1:
+            # Each mapper sends a group's partial to one of N reducer keys
+            return [group, idx, random.randrange(self.options.salt)]
+        return [group, idx]
+
+    def mapper_final(self):
+        for (group, idx), moments in self.moments.items():
+            key = (group, idx)
+            yield self.output_key(group, idx), (
+                moments.partial(),
+                self.min_val[key],
+                self.max_val[key],
+                self.missing[key],
+                self.invalid[key],
+            )
+
+        quality = self.quality.final()
+        if quality:
+            if self.options.emit_partials:
+                yield [self.input_file, "data_quality"], quality
+            else:
+                yield "data_quality", quality
+
+    @staticmethod
+    def is_quality_key(key):
+        return key == "data_quality" or (
+            isinstance(key, list) and key[-1] == "data_quality"
+        )
+
+    @staticmethod
+    def merge_partials(values):
+        moment_partials = []
+        min_val = None
+        max_val = None
+        missing = 0
+        invalid = 0
+
+        for moments, other_min, other_max, other_missing, other_invalid in values:
+            moment_partials.append(moments)
+            if other_min is not None and (min_val is None or other_min < min_val):
+                min_val = other_min
+            if other_max is not None and (max_val is None or other_max > max_val):
+                max_val = other_max
+            missing += other_missing
+            invalid += other_invalid
+
+        return merge_moments(moment_partials), min_val, max_val, missing, invalid
+
+    def combiner(self, key, values):
+        if self.is_quality_key(key):
+            yield key, merge_quality(values)
+        else:
+            yield key, self.merge_partials(values)
+
+    def reducer_salted(self, key, values):
+        # First level: merge the salted keys of a group back to [group, column]
+        if self.is_quality_key(key):
+            yield key, merge_quality(values)
+        else:
+            yield key[:2], self.merge_partials(values)
+
+    def reducer(self, key, values):
+        if self.is_quality_key(key):
+            yield key, merge_quality(values)
+        elif self.options.emit_partials:
+            yield key, self.merge_partials(values)
+        else:
+            yield key, self.summarize(self.merge_partials(values))
+
+    @staticmethod
+    def summarize(partial):
+        """Final statistics of a merged column partial"""
+        moments, min_val, max_val, missing, invalid = partial
+        summary = {"count": 0, "missing": missing, "invalid": invalid}
+
+        if moments[0] > 0:
+            summary.update(describe(moments))
+            summary["min"] = min_val
+            summary["max"] = max_val
+
+        return summary
+
+
+def derivable(stat, columns):
+    """
+    Whether summary_outputs() gives the same result as the job computing
+    stat over columns; mean and max only match on integer columns
+    """
+    if stat in ("mean", "max"):
+        return all(idx in INTEGER_COLUMNS for idx in columns)
+    return stat in SUMMARY_STATS
+
+
+def summary_outputs(stat, summaries):
+    """
+    The (key, value) output pairs of the job computing stat, derived from
+    the ColumnSummary results {column: summary} of the columns it asked
+    for. This lets requests for several statistics of one file share a
+    single scan (only where derivable() holds).
+    """
+    if not derivable(stat, summaries):
+        raise ValueError(f"{stat} cannot be derived from a column summary")
+    if stat == "summary":
+        pairs = sorted(summaries.items())
+    else:
+        (summary,) = summaries.values()
+        pairs = []
+        if summary["count"] and stat == "mean":
+            pairs.append(("mean_value", summary["mean"]))
+        elif summary["count"] and stat == "max":
+            max_value = summary["max"]
+            if max_value.is_integer():
+                max_value = int(max_value)
+            pairs.append(("max_value", max_value))
+        elif summary["count"] and stat == "stddev":
+            pairs.append(
+                (
+                    "statistics",
+                    {
+                        "mean": summary["mean"],
+                        "std_dev": summary["std_dev"],
+                        "count": summary["count"],
+                    },
+                )
+            )
+        elif summary["count"] and stat == "skewness":
+            pairs.append(
+                (
+                    "skewness_result",
+                    {
+                        "skewness": summary["skewness"],
+                        "kurtosis": summary["kurtosis"],
+                        "sample_size": summary["count"],
+                        "interpretation": interpret_skewness(summary["skewness"]),
+                    },
+                )
+            )
+
+    # Bad values are counted per column, so the totals match a separate run
+    missing = sum(summary["missing"] for summary in summaries.values())
+    invalid = sum(summary["invalid"] for summary in summaries.values())
+    if missing or invalid:
+        quality = {
+            "missing": missing,
+            "parse_errors": invalid,
+            "error_types": {},
+            "examples": [],
+        }
+        pairs.append(("data_quality", quality))
+    return pairs
+
+
+if __name__ == "__main__":
+    ColumnSummary.run()
@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+"""
+Compressed CSV inputs and map output compression.
+
+Hadoop picks the decompressor of an input file from its extension, so a
+compressed copy of the CSV can be given to every job unchanged:
+
+  gzip  .gz   fast and compact, for archival; not splittable, so the
+              whole file is read by a single map task
+  bz2   .bz2  slower to compress and decompress, but splittable: the
+              number of map tasks is the same as for the plain CSV
+
+Map output compression is a per-job setting (mapreduce.map.output.compress)
+that shrinks the data written to local disk and sent through the shuffle.
+MAP_OUTPUT_CODECS are the codecs selectable with the jobs'
+--map-output-codec option; snappy, lz4 and zstd need Hadoop's native
+libraries on the nodes.
+
+open_input() and open_output() (de)compress local and hdfs:// paths by
+extension; hdfs:// paths are streamed through "hadoop fs -text"/"-cat"
+and "hadoop fs -put".
+
+Usage:
+  python compression.py US_Accidents.csv \
+      hdfs:///user/student/us-accidents/data/US_Accidents.csv.bz2
+"""
+import argparse
+import bz2
+import gzip
+import os
+import shutil
+import subprocess
+
+INPUT_CODECS = {"gzip": ".gz", "bz2": ".bz2"}
+SPLITTABLE_CODECS = {"bz2"}
+MAP_OUTPUT_CODECS = {
+    "default": "org.apache.hadoop.io.compress.DefaultCodec",
+    "gzip": "org.apache.hadoop.io.compress.GzipCodec",
+    "bz2": "org.apache.hadoop.io.compress.BZip2Codec",
+    "snappy": "org.apache.hadoop.io.compress.SnappyCodec",
+    "lz4": "org.apache.hadoop.io.compress.Lz4Codec",
+    "zstd": "org.apache.hadoop.io.compress.ZStandardCodec",
+}
+# Level of the gzip command line tool; level 9 is much slower for ~2% less
+GZIP_LEVEL = 6
+COPY_BUFFER = 16 * 1024 * 1024
+
+
+def input_codec(path):
+    """Codec of a file from its extension, or None for plain text"""
+    for codec, extension in INPUT_CODECS.items():
+        if path.endswith(extension):
+            return codec
+    return None
+
+
+def with_codec(path, codec):
+    """Path of the copy of path compressed with codec ("none" keeps path)"""
+    if codec in (None, "none"):
+        return path
+    return path + INPUT_CODECS[codec]
+
+
+def strip_codec(path):
+    """path without its compression extension"""
+    codec = input_codec(path)
+    return path[: -len(INPUT_CODECS[codec])] if codec else path
+
+
+def _codec_stream(fileobj, codec, mode):
+    if codec == "gzip":
+        return gzip.open(fileobj, mode, compresslevel=GZIP_LEVEL)
+    return bz2.open(fileobj, mode)
+
+
+class _CompressedPipe:
+    """Compressing writer that also closes the pipe it writes to"""
+
+    def __init__(self, pipe, codec):
+        self.pipe = pipe
+        self.stream = _codec_stream(pipe, codec, "wb")
+
+    def write(self, data):
+        return self.stream.write(data)
+
+    def close(self):
+        self.stream.close()
+        self.pipe.close()
+
+
+def open_input(path):
+    """(file, process) reading decompressed bytes from a local or hdfs:// path"""
+    codec = input_codec(path)
+    if path.startswith("hdfs://"):
+        # -text decompresses by extension like the jobs' input format
+        command = "-text" if codec else "-cat"
+        process = subprocess.Popen(
+            ["hadoop", "fs", command, path], stdout=subprocess.PIPE
+        )
+        return process.stdout, process
+    if codec:
+        return _codec_stream(path, codec, "rb"), None
+    return open(path, "rb"), None
+
+
+def open_output(path):
+    """(file, process) writing to a local or hdfs:// path, compressed by extension"""
+    codec = input_codec(path)
+    if path.startswith("hdfs://"):
+        process = subprocess.Popen(
+            ["hadoop", "fs", "-put", "-f", "-", path], stdin=subprocess.PIPE
+        )
+        if codec:
+            return _CompressedPipe(process.stdin, codec), process
+        return process.stdin, process
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    if codec:
+        return _codec_stream(path, codec, "wb"), None
+    return open(path, "wb"), None
+
+
+def wait_all(processes):
+    """Wait for the "hadoop fs" processes of open_input/open_output"""
+    for process in processes:
+        if process is not None and process.wait() != 0:
+            raise subprocess.CalledProcessError(process.returncode, process.args)
+
+
+def compress_file(input_path, output_path):
+    """
+    Copy input_path to output_path, recompressing by the extensions of both
+    (e.g. US_Accidents.csv -> hdfs:///.../US_Accidents.csv.bz2)
+    """
+    source, source_process = open_input(input_path)
+    sink, sink_process = open_output(output_path)
+    try:
+        shutil.copyfileobj(source, sink, COPY_BUFFER)
+    finally:
+        source.close()
+        sink.close()
+    wait_all([source_process, sink_process])
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Copy a CSV file, compressing it by the output extension"
+    )
+    parser.add_argument("input_path", help="Local or hdfs:// file")
+    parser.add_argument(
+        "output_path", help="Local or hdfs:// file ending in .gz or .bz2"
+    )
+    args = parser.parse_args()
+    compress_file(args.input_path, args.output_path)
+
+
+if __name__ == "__main__":
+    main()
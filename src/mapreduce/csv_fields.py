@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""
+Fast field extraction from US Accidents CSV lines, shared by all jobs.
+
+Most rows have no quotes before the requested fields, so they are split
+only up to the last requested index with str.split. Rows with a quote in
+that prefix (e.g. a quoted Description) fall back to the csv module.
+"""
+import csv
+
+# The 46 columns of the US Accidents (2016-2023) CSV
+HEADER = [
+    "ID",
+    "Source",
+    "Severity",
+    "Start_Time",
+    "End_Time",
+    "Start_Lat",
+    "Start_Lng",
+    "End_Lat",
+    "End_Lng",
+    "Distance(mi)",
+    "Description",
+    "Street",
+    "City",
+    "County",
+    "State",
+    "Zipcode",
+    "Country",
+    "Timezone",
+    "Airport_Code",
+    "Weather_Timestamp",
+    "Temperature(F)",
+    "Wind_Chill(F)",
+    "Humidity(%)",
+    "Pressure(in)",
+    "Visibility(mi)",
+    "Wind_Direction",
+    "Wind_Speed(mph)",
+    "Precipitation(in)",
+    "Weather_Condition",
+    "Amenity",
+    "Bump",
+    "Crossing",
+    "Give_Way",
+    "Junction",
+    "No_Exit",
+    "Railway",
+    "Roundabout",
+    "Station",
+    "Stop",
+    "Traffic_Calming",
+    "Traffic_Signal",
+    "Turning_Loop",
+    "Sunrise_Sunset",
+    "Civil_Twilight",
+    "Nautical_Twilight",
+    "Astronomical_Twilight",
+]
+
+HEADER_PREFIX = HEADER[0] + ","
+
+# --group-by choices -> source column (the year is taken from Start_Time)
+GROUP_COLUMNS = {"State": 14, "City": 12, "year": 3}
+
+
+def is_header(line):
+    """
+    Detect the header row by content, so any input split can be processed
+    independently (record IDs look like "A-1", never "ID")
+    """
+    return line.startswith(HEADER_PREFIX) or line.startswith("\ufeff" + HEADER_PREFIX)
+
+
+def _split_fields(line, max_split):
+    quote = line.find('"')
+
+    # A quote after the last requested field does not affect the split
+    if quote == -1 or line.count(",", 0, quote) >= max_split:
+        return line.split(",", max_split)
+
+    return next(csv.reader([line]))
+
+
+def field_reader(index):
+    """
+    Return a function that extracts the string at index from a CSV line,
+    or None when the row is shorter than that
+    """
+    max_split = index + 1
+
+    def read(line):
+        row = _split_fields(line, max_split)
+        return row[index] if index < len(row) else None
+
+    return read
+
+
+def fields_reader(indices):
+    """
+    Return a function that extracts the strings at several indexes from a
+    CSV line (None for indexes beyond the end of the row)
+    """
+    indices = list(indices)
+    max_split = max(indices) + 1
+
+    def read(line):
+        row = _split_fields(line, max_split)
+        size = len(row)
+        return [row[i] if i < size else None for i in indices]
+
+    return read
+
+
+def group_value(group_by, field):
+    """Group key of a row from its group column field ("" when absent)"""
+    if not field:
+        return ""
+    if group_by == "year":
+        return field[:4]
+    return field
+
+
+def to_int(value):
+    """int() that returns None for empty or absent fields"""
+    if not value:
+        return None
+    return int(value)
+
+
+def to_float(value):
+    """float() that returns None for empty or absent fields"""
+    if not value:
+        return None
+    return float(value)
@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Missing/malformed value tracking shared by all jobs.
+
+Instead of emitting one "error" record per bad row, each mapper counts bad
+values per error class, keeps a small reservoir sample of example lines,
+reports the counts as Hadoop counters once in mapper_final and emits a
+single mergeable "data_quality" partial:
+  {"missing": n, "parse_errors": n, "error_types": {name: n}, "examples": [...]}
+"""
+import random
+
+COUNTER_GROUP = "Data Quality"
+SAMPLE_SIZE = 5
+MAX_EXAMPLE_LENGTH = 200
+
+
+class QualityTracker:
+    """
+    Per-mapper counters plus a reservoir sample of bad lines
+    """
+
+    def __init__(self, job, sample_size=SAMPLE_SIZE):
+        self.job = job
+        self.sample_size = sample_size
+        self.missing_count = 0
+        self.error_types = {}
+        self.examples = []
+        self.seen = 0
+
+    def missing(self, line):
+        self.missing_count += 1
+        self._sample("missing", line)
+
+    def malformed(self, line, error):
+        name = type(error).__name__
+        self.error_types[name] = self.error_types.get(name, 0) + 1
+        self._sample(name, line)
+
+    def _sample(self, kind, line):
+        # Reservoir sampling (Algorithm R) over all bad lines of this mapper
+        self.seen += 1
+        if len(self.examples) < self.sample_size:
+            self.examples.append({"type": kind, "line": line[:MAX_EXAMPLE_LENGTH]})
+        else:
+            slot = random.randrange(self.seen)
+            if slot < self.sample_size:
+                self.examples[slot] = {"type": kind, "line": line[:MAX_EXAMPLE_LENGTH]}
+
+    def final(self):
+        """
+        Report the counters once and return the partial (None if no bad values)
+        """
+        if not self.seen:
+            return None
+
+        if self.missing_count:
+            self.job.increment_counter(COUNTER_GROUP, "missing", self.missing_count)
+        for name, count in self.error_types.items():
+            self.job.increment_counter(COUNTER_GROUP, f"parse error: {name}", count)
+
+        return {
+            "missing": self.missing_count,
+            "parse_errors": sum(self.error_types.values()),
+            "error_types": self.error_types,
+            "examples": self.examples,
+        }
+
+
+def merge_quality(partials, sample_size=SAMPLE_SIZE):
+    """
+    Merge data quality partials; examples are drawn from each partial in
+    proportion to the number of bad lines it saw
+    """
+    merged = {"missing": 0, "parse_errors": 0, "error_types": {}, "examples": []}
+    pools = []
+
+    for partial in partials:
+        merged["missing"] += partial["missing"]
+        merged["parse_errors"] += partial["parse_errors"]
+        for name, count in partial["error_types"].items():
+            merged["error_types"][name] = merged["error_types"].get(name, 0) + count
+        if partial["examples"]:
+            weight = partial["missing"] + partial["parse_errors"]
+            pools.append([weight, list(partial["examples"])])
+
+    while pools and len(merged["examples"]) < sample_size:
+        pick = random.uniform(0, sum(weight for weight, _ in pools))
+        for pool in pools:
+            pick -= pool[0]
+            if pick <= 0:
+                break
+        merged["examples"].append(pool[1].pop())
+        pool[0] = max(1, pool[0] - 1)
+        if not pool[1]:
+            pools.remove(pool)
+
+    return merged
@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+Exact statistics of low-cardinality columns from value -> count histograms.
+
+Severity only takes the values 1-4, so a mapper's whole input reduces to a
+handful of (value, count) pairs; mean, variance, skewness, kurtosis, min,
+max, mode and the exact median all follow from the merged histogram.
+Histograms travel as lists of [value, count] pairs (JSON object keys would
+have to be strings). When a column has too many distinct values the
+histogram is converted to a moment partial (moments.py) and only the
+moment-based statistics are reported.
+"""
+from moments import describe
+
+DEFAULT_MAX_DISTINCT = 1000
+
+
+def merge_histograms(histograms, into=None):
+    """Merge [value, count] pair lists (or dicts) into one value -> count dict"""
+    merged = {} if into is None else into
+    for histogram in histograms:
+        pairs = histogram.items() if isinstance(histogram, dict) else histogram
+        for value, count in pairs:
+            merged[value] = merged.get(value, 0) + count
+    return merged
+
+
+def histogram_pairs(histogram):
+    """Sorted [value, count] pairs of a histogram dict, ready to be emitted"""
+    return [[value, count] for value, count in sorted(histogram.items())]
+
+
+def histogram_moments(histogram):
+    """Exact (count, mean, M2, M3, M4) moment partial of a histogram"""
+    count = sum(histogram.values())
+    if count == 0:
+        return 0, 0.0, 0.0, 0.0, 0.0
+
+    mean = sum(value * n for value, n in histogram.items()) / count
+    m2 = m3 = m4 = 0.0
+    for value, n in histogram.items():
+        delta = value - mean
+        delta2 = delta * delta
+        m2 += n * delta2
+        m3 += n * delta2 * delta
+        m4 += n * delta2 * delta2
+    return count, mean, m2, m3, m4
+
+
+def histogram_median(histogram, count=None):
+    """Exact median (mean of the two middle values for an even count)"""
+    count = sum(histogram.values()) if count is None else count
+    lower_rank = (count - 1) // 2
+    upper_rank = count // 2
+
+    lower = upper = None
+    seen = 0
+    for value in sorted(histogram):
+        seen += histogram[value]
+        if lower is None and seen > lower_rank:
+            lower = value
+        if seen > upper_rank:
+            upper = value
+            break
+    return (lower + upper) / 2
+
+
+def histogram_stats(histogram):
+    """
+    Mean, variance, std_dev, skewness, kurtosis, min, max, mode and median
+    of a non-empty value -> count histogram
+    """
+    partial = histogram_moments(histogram)
+    stats = describe(partial)
+    stats.update(
+        {
+            "min": min(histogram),
+            "max": max(histogram),
+            # Ties go to the smallest value
+            "mode": max(sorted(histogram), key=histogram.get),
+            "median": histogram_median(histogram, partial[0]),
+        }
+    )
+    return stats
@@ -0,0 +1,196 @@
+#!/usr/bin/env python3
+"""
+KLL quantile sketch (Karnin, Lang and Liberty, 2016) used by the
+percentiles job.
+
+A sketch is a stack of compactors; level h holds items of weight 2**h.
+When the sketch is full, the lowest full compactor is sorted and every
+other item (random offset) is promoted one level up, halving its size.
+Capacities shrink geometrically towards the lower levels, so a sketch
+holds about 3k values no matter how many it has seen, and two sketches
+merge by concatenating their levels and compacting again.
+
+Partials are plain dicts so they can travel through mrjob's protocols:
+  {"k": k, "n": count, "min": min, "max": max, "compactors": [[...], ...]}
+
+Every sketch draws its compaction offsets from its own random.Random(seed),
+so the same input in the same order gives the same sketch. task_seed()
+mixes the job seed with the task and column, so sketches of different
+mappers compact independently.
+"""
+import math
+import random
+
+DEFAULT_K = 200
+DEFAULT_SEED = 42
+DEFAULT_QUANTILES = "0.01,0.05,0.25,0.5,0.75,0.95,0.99"
+CAPACITY_RATIO = 2.0 / 3.0
+
+
+def rank_error(k=DEFAULT_K):
+    """
+    Normalized rank error of a single quantile at 99% confidence, as
+    estimated for KLL by Apache DataSketches: a returned q-quantile has a
+    true rank within (q +- rank_error) * n
+    """
+    return 2.296 / k**0.9723
+
+
+def task_seed(seed, *parts):
+    """
+    Seed of one task's sketch, e.g. task_seed(42, "map", 3, 20): the same
+    for reruns of the same task, different across tasks and columns
+    """
+    # random.Random seeds strings with their SHA-512 hash
+    return ":".join(map(str, (seed,) + parts))
+
+
+class KLLSketch:
+    """
+    Mergeable quantile sketch with bounded memory (about 3k values)
+    """
+
+    def __init__(self, k=DEFAULT_K, seed=DEFAULT_SEED):
+        self.k = k
+        self.random = random.Random(seed)
+        self.n = 0
+        self.min = None
+        self.max = None
+        self.compactors = []
+        self.size = 0
+        self.max_size = 0
+        self._grow()
+
+    def _grow(self):
+        self.compactors.append([])
+        self.max_size = sum(self._capacity(h) for h in range(len(self.compactors)))
+
+    def _capacity(self, level):
+        depth = len(self.compactors) - level - 1
+        return int(math.ceil(self.k * CAPACITY_RATIO**depth)) + 1
+
+    def update(self, value):
+        self.n += 1
+        if self.min is None or value < self.min:
+            self.min = value
+        if self.max is None or value > self.max:
+            self.max = value
+
+        self.compactors[0].append(value)
+        self.size += 1
+        if self.size >= self.max_size:
+            self._compress()
+
+    def update_many(self, values):
+        """Add a batch of values (e.g. a NumPy chunk converted with tolist())"""
+        for start in range(0, len(values), self.k):
+            batch = values[start : start + self.k]
+            self.n += len(batch)
+            batch_min = min(batch)
+            batch_max = max(batch)
+            if self.min is None or batch_min < self.min:
+                self.min = batch_min
+            if self.max is None or batch_max > self.max:
+                self.max = batch_max
+
+            self.compactors[0].extend(batch)
+            self.size += len(batch)
+            while self.size >= self.max_size:
+                self._compress()
+
+    def _compress(self):
+        for level in range(len(self.compactors)):
+            items = self.compactors[level]
+            if len(items) < self._capacity(level):
+                continue
+
+            if level + 1 == len(self.compactors):
+                self._grow()
+
+            # Promote every other item; an odd one out stays at this level
+            items.sort()
+            leftover = items.pop() if len(items) % 2 else None
+            self.compactors[level + 1].extend(items[self.random.randint(0, 1) :: 2])
+            self.compactors[level] = [leftover] if leftover is not None else []
+
+            self.size = sum(len(c) for c in self.compactors)
+            if self.size < self.max_size:
+                break
+
+    def merge(self, other):
+        """Fold another sketch (with the same k) into this one"""
+        while len(self.compactors) < len(other.compactors):
+            self._grow()
+        for level, items in enumerate(other.compactors):
+            self.compactors[level].extend(items)
+
+        self.n += other.n
+        if other.min is not None and (self.min is None or other.min < self.min):
+            self.min = other.min
+        if other.max is not None and (self.max is None or other.max > self.max):
+            self.max = other.max
+
+        self.size = sum(len(c) for c in self.compactors)
+        while self.size >= self.max_size:
+            self._compress()
+
+    def quantiles(self, fractions):
+        """Approximate values at the given fractions (0..1) of the sorted data"""
+        weighted = sorted(
+            (value, 1 << level)
+            for level, items in enumerate(self.compactors)
+            for value in items
+        )
+        total = sum(weight for _, weight in weighted)
+
+        results = []
+        for fraction in fractions:
+            if fraction <= 0:
+                results.append(self.min)
+                continue
+            if fraction >= 1:
+                results.append(self.max)
+                continue
+
+            target = fraction * total
+            cumulative = 0
+            for value, weight in weighted:
+                cumulative += weight
+                if cumulative >= target:
+                    results.append(value)
+                    break
+        return results
+
+    def partial(self):
+        return {
+            "k": self.k,
+            "n": self.n,
+            "min": self.min,
+            "max": self.max,
+            "compactors": self.compactors,
+        }
+
+    @classmethod
+    def from_partial(cls, partial, seed=DEFAULT_SEED):
+        sketch = cls(partial["k"], seed)
+        sketch.n = partial["n"]
+        sketch.min = partial["min"]
+        sketch.max = partial["max"]
+        sketch.compactors = [list(items) for items in partial["compactors"]]
+        sketch.size = sum(len(c) for c in sketch.compactors)
+        sketch.max_size = sum(
+            sketch._capacity(h) for h in range(len(sketch.compactors))
+        )
+        return sketch
+
+
+def merge_sketches(partials, seed=DEFAULT_SEED):
+    """Merge sketch partials into one KLLSketch (None if there are none)"""
+    merged = None
+    for partial in partials:
+        sketch = KLLSketch.from_partial(partial, seed)
+        if merged is None:
+            merged = sketch
+        else:
+            merged.merge(sketch)
+    return merged
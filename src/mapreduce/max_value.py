@@ -1,10 +1,12 @@
 #!/usr/bin/env python3
-from mrjob.job import MRJob
 from mrjob.step import MRStep
-import csv
 
+from accidents_job import AccidentsJob
+from csv_fields import field_reader, is_header, to_int
+from data_quality import QualityTracker, merge_quality
 
-class MaxValue(MRJob):
+
+class MaxValue(AccidentsJob):
     """
     MapReduce job to find the maximum accident severity
     """
@@ -19,35 +21,54 @@ class MaxValue(MRJob):
         )
 
     def mapper_init(self):
-        # CSV başlıklarını atla
-        self.is_header = True
+        self.read_value = field_reader(self.options.column)
+        # Hatalı/eksik değerler satır başına kayıt yerine sayaçlarla izlenir
+        self.quality = QualityTracker(self)
+        # Mapper içi birleştirme için yerel maksimum
+        self.max_value = None
 
     def mapper(self, _, line):
-        # Başlık satırını atla
-        if self.is_header:
-            self.is_header = False
+        # Başlık satırını içeriğinden tanı (her input split için güvenli)
+        if is_header(line):
             return
 
         try:
-            # CSV satırını parse et
-            row = next(csv.reader([line]))
+            # Satırın tamamını değil, yalnızca istenen sütunu çıkar
+            value = to_int(self.read_value(line))
+        except ValueError as e:
+            self.quality.malformed(line, e)
+            return
+
+        if value is None:
+            self.quality.missing(line)
+            return
 
-            idx = self.options.column
-            value = int(row[idx])
+        if self.max_value is None or value > self.max_value:
+            self.max_value = value
 
-            yield "max_value", value
-        except Exception as e:
-            yield "error", str(e)
+    def mapper_final(self):
+        # Her mapper yalnızca kendi maksimumunu döndürür
+        if self.max_value is not None:
+            yield "max_value", self.max_value
+
+        quality = self.quality.final()
+        if quality:
+            yield "data_quality", quality
+
+    def combiner(self, key, values):
+        if key == "max_value":
+            yield key, max(values)
+        elif key == "data_quality":
+            yield key, merge_quality(values)
 
     def reducer(self, key, values):
         if key == "max_value":
             # Maximum değeri bul
             max_value = max(values)
             yield key, max_value
-        else:
-            # Hataları loglama
-            for value in values:
-                yield key, value
+        elif key == "data_quality":
+            # Eksik ve hatalı değer özeti
+            yield key, merge_quality(values)
 
 
 if __name__ == "__main__":
@@ -1,10 +1,12 @@
 #!/usr/bin/env python3
-from mrjob.job import MRJob
 from mrjob.step import MRStep
-import csv
 
+from accidents_job import AccidentsJob
+from csv_fields import field_reader, is_header, to_int
+from data_quality import QualityTracker, merge_quality
 
-class MeanValue(MRJob):
+
+class MeanValue(AccidentsJob):
     """
     MapReduce job to calculate the average accident severity
     """
@@ -16,28 +18,52 @@ class MeanValue(MRJob):
         )
 
     def mapper_init(self):
-        # CSV başlıklarını atla
-        self.is_header = True
+        self.read_value = field_reader(self.options.column)
+        # Hatalı/eksik değerler satır başına kayıt yerine sayaçlarla izlenir
+        self.quality = QualityTracker(self)
+        # Mapper içi birleştirme (in-mapper combining) için ara toplamlar
+        self.count = 0
+        self.total = 0
 
     def mapper(self, _, line):
-        # Başlık satırını atla
-        if self.is_header:
-            self.is_header = False
+        # Başlık satırını içeriğinden tanı (her input split için güvenli)
+        if is_header(line):
             return
 
         try:
-            # CSV satırını parse et
-            row = next(csv.reader([line]))
+            # Satırın tamamını değil, yalnızca istenen sütunu çıkar
+            value = to_int(self.read_value(line))
+        except ValueError as e:
+            self.quality.malformed(line, e)
+            return
+
+        if value is None:
+            self.quality.missing(line)
+            return
+
+        # Satır başına kayıt üretmek yerine yerel toplamları güncelle
+        self.count += 1
+        self.total += value
 
-            idx = self.options.column
+    def mapper_final(self):
+        # Her mapper tek bir (sayım, toplam) çifti döndürür
+        if self.count > 0:
+            yield "value", (self.count, self.total)
 
-            value = int(row[idx])
+        quality = self.quality.final()
+        if quality:
+            yield "data_quality", quality
 
-            # (1, severity) çifti döndür (1 sayısı sayım için, severity toplam için)
-            yield "value", (1, value)
-        except Exception as e:
-            # Hatalı satırlar için loglama yapabilirsiniz
-            yield "error", str(e)
+    def combiner(self, key, values):
+        if key == "value":
+            total_count = 0
+            total_severity = 0
+            for count, severity in values:
+                total_count += count
+                total_severity += severity
+            yield key, (total_count, total_severity)
+        elif key == "data_quality":
+            yield key, merge_quality(values)
 
     def reducer(self, key, values):
         if key == "value":
@@ -53,10 +79,9 @@ class MeanValue(MRJob):
             if total_count > 0:
                 mean_value = total_severity / total_count
                 yield "mean_value", mean_value
-        else:
-            # Hataları loglama
-            for value in values:
-                yield key, value
+        elif key == "data_quality":
+            # Eksik ve hatalı değer özeti
+            yield key, merge_quality(values)
 
 
 if __name__ == "__main__":
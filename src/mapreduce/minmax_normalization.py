@@ -1,12 +1,20 @@
 #!/usr/bin/env python3
-from mrjob.job import MRJob
+from mrjob.protocol import RawProtocol
 from mrjob.step import MRStep
-import csv
 
+from accidents_job import AccidentsJob
+from csv_fields import field_reader, fields_reader, is_header, to_float
+from data_quality import QualityTracker, merge_quality
 
-class MinMaxNormalization(MRJob):
+
+class MinMaxNormalization(AccidentsJob):
     """
     MapReduce job to normalize numerical features using min-max normalization
+
+    --mode bounds (default) finds the column min/max with a combiner and
+    reports a few normalized samples. --mode transform is a map-only pass
+    that normalizes every row with bounds passed in as --min/--max, so the
+    whole column is written in parallel without going through a reducer.
     """
 
     def configure_args(self):
@@ -17,77 +25,209 @@ class MinMaxNormalization(MRJob):
             default=9,
             help="Index of the numerical column to normalize (0-based)",
         )
+        self.add_passthru_arg(
+            "--mode",
+            choices=["bounds", "transform"],
+            default="bounds",
+            help="bounds: find min/max; transform: normalize every row",
+        )
+        self.add_passthru_arg(
+            "--min", type=float, help="Column minimum (required for transform)"
+        )
+        self.add_passthru_arg(
+            "--max", type=float, help="Column maximum (required for transform)"
+        )
+        self.add_passthru_arg(
+            "--id-column",
+            type=int,
+            default=0,
+            help="Index of the row ID written next to each value (-1 to omit)",
+        )
+        self.add_passthru_arg(
+            "--samples",
+            type=int,
+            default=10,
+            help="Number of example values reported in bounds mode",
+        )
 
     def steps(self):
+        if self.options.mode == "transform":
+            # Map-only: every mapper writes its own part file
+            return [
+                MRStep(
+                    mapper_init=self.mapper_init,
+                    mapper=self.mapper_normalize,
+                    mapper_final=self.mapper_final_normalize,
+                )
+            ]
+
         return [
-            # First step: Find Min and Max values
             MRStep(
                 mapper_init=self.mapper_init,
                 mapper=self.mapper_find_min_max,
-                reducer=self.reducer_find_min_max,
-            ),
-            # Second step: Apply normalization
-            MRStep(mapper=self.mapper_normalize, reducer=self.reducer_normalize),
+                mapper_final=self.mapper_final_min_max,
+                combiner=self.combiner_min_max,
+                reducer=self.reducer_min_max,
+            )
         ]
 
+    def output_protocol(self):
+        if self.options.mode == "transform":
+            # Plain "id<TAB>value" lines, ready for downstream tools
+            return RawProtocol()
+        return super(MinMaxNormalization, self).output_protocol()
+
     def mapper_init(self):
-        self.is_header = True
+        self.min_val = None
+        self.max_val = None
+        self.samples = []
+        self.quality = QualityTracker(self)
+        self.read_value = field_reader(self.options.column)
+        if self.options.id_column >= 0:
+            self.read_id_and_value = fields_reader(
+                [self.options.id_column, self.options.column]
+            )
+
+        if self.options.mode == "transform":
+            if self.options.min is None or self.options.max is None:
+                raise ValueError("--mode transform requires --min and --max")
+            self.range_val = self.options.max - self.options.min
 
     def mapper_find_min_max(self, _, line):
-        # Skip header line
-        if self.is_header:
-            self.is_header = False
+        # Skip the header row, detected by content (safe for any input split)
+        if is_header(line):
             return
 
         try:
-            # Parse CSV line
-            row = next(csv.reader([line]))
+            # Get value from specified column
+            value = to_float(self.read_value(line))
+        except ValueError as e:
+            self.quality.malformed(line, e)
+            return
 
-            column_idx = self.options.column
+        if value is None:
+            self.quality.missing(line)
+            return
 
-            # Get value from specified column
-            value_str = row[column_idx]
-            if value_str and value_str != "":
-                value = float(value_str)
-
-                # Emit for min/max calculation
-                yield "value", value
-        except Exception as e:
-            yield "error", str(e)
-
-    def reducer_find_min_max(self, key, values):
-        if key == "value":
-            # Get all values
-            all_values = list(values)
-            if all_values:
-                min_val = min(all_values)
-                max_val = max(all_values)
-
-                # Emit each value with min and max for normalization
-                for val in all_values:
-                    yield None, (val, min_val, max_val)
-
-    def mapper_normalize(self, _, value_min_max):
-        value, min_val, max_val = value_min_max
-
-        # Apply min-max normalization
+        if self.min_val is None or value < self.min_val:
+            self.min_val = value
+        if self.max_val is None or value > self.max_val:
+            self.max_val = value
+        if len(self.samples) < self.options.samples:
+            self.samples.append(value)
+
+    def mapper_final_min_max(self):
+        if self.min_val is not None:
+            yield "bounds", (self.min_val, self.max_val, self.samples)
+
+        quality = self.quality.final()
+        if quality:
+            yield "data_quality", quality
+
+    def merge_bounds(self, values):
+        min_val = None
+        max_val = None
+        samples = []
+
+        for other_min, other_max, other_samples in values:
+            if min_val is None or other_min < min_val:
+                min_val = other_min
+            if max_val is None or other_max > max_val:
+                max_val = other_max
+            samples.extend(other_samples[: self.options.samples - len(samples)])
+
+        return min_val, max_val, samples
+
+    def combiner_min_max(self, key, values):
+        if key == "bounds":
+            yield key, self.merge_bounds(values)
+        elif key == "data_quality":
+            yield key, merge_quality(values)
+
+    def reducer_min_max(self, key, values):
+        if key == "data_quality":
+            yield key, merge_quality(values)
+            return
+
+        min_val, max_val, samples = self.merge_bounds(values)
         range_val = max_val - min_val
-        if range_val > 0:
-            normalized = (value - min_val) / range_val
+
+        # Output example values with original and normalized values
+        for count, original in enumerate(samples):
+            if range_val > 0:
+                normalized = (original - min_val) / range_val
+            else:
+                normalized = 0
+            yield count, {"original": original, "normalized": normalized}
+
+        yield "bounds", {"min": min_val, "max": max_val}
+
+    def mapper_normalize(self, _, line):
+        # Skip the header row, detected by content (safe for any input split)
+        if is_header(line):
+            return
+
+        if self.options.id_column >= 0:
+            row_id, value_str = self.read_id_and_value(line)
         else:
-            normalized = 0
+            row_id, value_str = None, self.read_value(line)
 
-        yield "normalized", (value, normalized)
+        # Blank and malformed values are written as "" (and counted), so the
+        # output stays aligned with the input even without --id-column
+        try:
+            value = to_float(value_str)
+        except ValueError as e:
+            self.quality.malformed(line, e)
+            yield row_id, ""
+            return
 
-    def reducer_normalize(self, key, values):
-        # Output first 10 samples with original and normalized values
-        count = 0
-        for original, normalized in values:
-            if count < 10:  # Show first 10 values as examples
-                yield count, {"original": original, "normalized": normalized}
-                count += 1
+        if value is None:
+            self.quality.missing(line)
+            normalized = ""
+        elif self.range_val > 0:
+            normalized = repr((value - self.options.min) / self.range_val)
+        else:
+            normalized = "0.0"
+
+        yield row_id, normalized
+
+    def mapper_final_normalize(self):
+        # Map-only: there is no reducer to merge examples, report counters only
+        self.quality.final()
+
+
+def normalize_dataset(input_path, output_dir, column=9, runner="hadoop", extra_args=()):
+    """
+    Run the full preprocessing stage: find the bounds, then broadcast them
+    to a map-only transform job writing into output_dir. Returns the bounds.
+    """
+    common_args = ["-r", runner, "--column", str(column)] + list(extra_args)
+
+    bounds_job = MinMaxNormalization(common_args + [input_path])
+    with bounds_job.make_runner() as runner_:
+        runner_.run()
+        output = dict(bounds_job.parse_output(runner_.cat_output()))
+    bounds = output["bounds"]
+
+    transform_job = MinMaxNormalization(
+        common_args
+        + [
+            "--mode",
+            "transform",
+            "--min",
+            repr(bounds["min"]),
+            "--max",
+            repr(bounds["max"]),
+            "--output-dir",
+            output_dir,
+            input_path,
+        ]
+    )
+    with transform_job.make_runner() as runner_:
+        runner_.run()
+
+    return bounds
 
 
 if __name__ == "__main__":
     MinMaxNormalization.run()
-
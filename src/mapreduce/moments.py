@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+"""
+Mergeable central-moment accumulators shared by the statistics jobs.
+
+Partials are plain tuples so they can travel through mrjob's protocols:
+  variance partial: (count, mean, M2)
+  moment partial:   (count, mean, M2, M3, M4)
+where Mk is the sum of k-th powers of deviations from the mean.
+"""
+import math
+
+
+def merge_variance(partials):
+    """
+    Merge (count, mean, M2) partials with Chan et al.'s parallel formula
+    """
+    count = 0
+    mean = 0.0
+    m2 = 0.0
+
+    for other_count, other_mean, other_m2 in partials:
+        if other_count == 0:
+            continue
+
+        total = count + other_count
+        delta = other_mean - mean
+        mean += delta * other_count / total
+        m2 += other_m2 + delta * delta * count * other_count / total
+        count = total
+
+    return count, mean, m2
+
+
+def merge_moments(partials):
+    """
+    Merge (count, mean, M2, M3, M4) partials (Pébay, 2008)
+    """
+    n_a, mean_a, m2_a, m3_a, m4_a = 0, 0.0, 0.0, 0.0, 0.0
+
+    for n_b, mean_b, m2_b, m3_b, m4_b in partials:
+        if n_b == 0:
+            continue
+        if n_a == 0:
+            n_a, mean_a, m2_a, m3_a, m4_a = n_b, mean_b, m2_b, m3_b, m4_b
+            continue
+
+        n = n_a + n_b
+        delta = mean_b - mean_a
+        delta_n = delta / n
+        delta_n2 = delta_n * delta_n
+        term = delta * delta_n * n_a * n_b
+
+        m4 = (
+            m4_a
+            + m4_b
+            + term * delta_n2 * (n_a * n_a - n_a * n_b + n_b * n_b)
+            + 6 * delta_n2 * (n_a * n_a * m2_b + n_b * n_b * m2_a)
+            + 4 * delta_n * (n_a * m3_b - n_b * m3_a)
+        )
+        m3 = (
+            m3_a
+            + m3_b
+            + term * delta_n * (n_a - n_b)
+            + 3 * delta_n * (n_a * m2_b - n_b * m2_a)
+        )
+        m2 = m2_a + m2_b + term
+
+        n_a, mean_a, m2_a, m3_a, m4_a = n, mean_a + delta * n_b / n, m2, m3, m4
+
+    return n_a, mean_a, m2_a, m3_a, m4_a
+
+
+class MomentAccumulator:
+    """
+    Online (count, mean, M2, M3, M4) accumulator updated one value at a time
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.m3 = 0.0
+        self.m4 = 0.0
+
+    def add(self, value):
+        n1 = self.count
+        self.count += 1
+        n = self.count
+        delta = value - self.mean
+        delta_n = delta / n
+        delta_n2 = delta_n * delta_n
+        term = delta * delta_n * n1
+
+        self.mean += delta_n
+        self.m4 += (
+            term * delta_n2 * (n * n - 3 * n + 3)
+            + 6 * delta_n2 * self.m2
+            - 4 * delta_n * self.m3
+        )
+        self.m3 += term * delta_n * (n - 2) - 3 * delta_n * self.m2
+        self.m2 += term
+
+    def merge(self, partial):
+        """Fold another moment partial into this accumulator"""
+        merged = merge_moments([self.partial(), partial])
+        self.count, self.mean, self.m2, self.m3, self.m4 = merged
+
+    def partial(self):
+        return self.count, self.mean, self.m2, self.m3, self.m4
+
+
+def array_moments(values):
+    """
+    Moment partial of a whole NumPy array at once (e.g. a memory-mapped
+    column block), computed in float64 with two passes
+    """
+    count = len(values)
+    if count == 0:
+        return 0, 0.0, 0.0, 0.0, 0.0
+
+    values = values.astype("float64")
+    mean = float(values.mean())
+    deviations = values - mean
+    squared = deviations * deviations
+    return (
+        count,
+        mean,
+        float(squared.sum()),
+        float((squared * deviations).sum()),
+        float((squared * squared).sum()),
+    )
+
+
+def interpret_skewness(skewness):
+    """Interpret the skewness value"""
+    if skewness > 0.5:
+        return "Positive skew (Right-tailed distribution)"
+    elif skewness < -0.5:
+        return "Negative skew (Left-tailed distribution)"
+    else:
+        return "Approximately symmetric distribution"
+
+
+def describe(partial):
+    """
+    Population statistics derived from a merged moment partial
+    """
+    count, mean, m2, m3, m4 = partial
+    variance = m2 / count
+    if m2 > 0:
+        skewness = math.sqrt(count) * m3 / m2**1.5
+        kurtosis = count * m4 / (m2 * m2) - 3
+    else:
+        skewness = 0.0
+        kurtosis = 0.0
+
+    return {
+        "count": count,
+        "mean": mean,
+        "variance": variance,
+        "std_dev": math.sqrt(variance),
+        "skewness": skewness,
+        "kurtosis": kurtosis,
+    }
@@ -0,0 +1,282 @@
+#!/usr/bin/env python3
+"""
+Parquet copy of the US Accidents CSV, partitioned by year and State.
+
+The numerical columns are converted once (same types and null handling as
+column_store.py) and written as a hive-partitioned Parquet dataset:
+
+  year=2021/State=CA/part-0.parquet
+  year=2021/State=FL/part-0.parquet
+  ...
+  row_groups.txt   "path<TAB>row group<TAB>rows<TAB>year<TAB>State" per row
+                   group, used as MapReduce input
+
+Scans read only the column chunks of the requested columns, and a filter
+on year/State (--where State=CA,year=2021) skips whole directories without
+reading them. Every row group footer stores the min, max and null count of
+each column, which answers max/minmax without reading the values
+(local_engine.py).
+
+Reading and writing need pyarrow; hdfs:// stores are read through
+pyarrow's HDFS filesystem (libhdfs of the Hadoop installation).
+
+Usage:
+  python parquet_store.py US_Accidents.csv accidents_parquet --columns 2,9,20
+  python column_summary.py -r hadoop --input-format parquet --columns 2,9 \
+      --where State=CA,year=2021 \
+      hdfs:///user/student/us-accidents/parquet/US_Accidents/row_groups.txt
+"""
+import argparse
+import os
+
+from column_store import NUMERIC_COLUMNS, _convert, column_dtype
+from csv_fields import GROUP_COLUMNS, HEADER, group_value
+
+ROW_GROUP_INDEX = "row_groups.txt"
+PARTITION_COLUMNS = ["year", "State"]
+DEFAULT_CHUNK_ROWS = 1_000_000
+# Rows of a partition are buffered across chunks until a row group has at
+# least MIN_ROWS_PER_GROUP rows; smaller partitions get a single row group
+MIN_ROWS_PER_GROUP = 128 * 1024
+MAX_ROWS_PER_GROUP = 1024 * 1024
+
+
+def partitioning():
+    import pyarrow as pa
+    import pyarrow.dataset as ds
+
+    schema = pa.schema([(name, pa.string()) for name in PARTITION_COLUMNS])
+    return ds.partitioning(schema, flavor="hive")
+
+
+def open_dataset(store_dir):
+    """The store as a pyarrow dataset (local directory or hdfs:// URI)"""
+    import pyarrow.dataset as ds
+
+    return ds.dataset(
+        store_dir,
+        format="parquet",
+        partitioning=partitioning(),
+        ignore_prefixes=[".", "_", ROW_GROUP_INDEX],
+    )
+
+
+def parse_where(text):
+    """Partition filter: "State=CA,year=2021" -> {"State": "CA", "year": "2021"}"""
+    where = {}
+    for condition in (text or "").split(","):
+        if not condition.strip():
+            continue
+        name, _, value = condition.partition("=")
+        name = name.strip()
+        if name not in PARTITION_COLUMNS:
+            raise ValueError(f"Can only filter on {', '.join(PARTITION_COLUMNS)}")
+        where[name] = value.strip()
+    return where
+
+
+def partition_matches(partition, where):
+    return all(partition.get(name) == value for name, value in where.items())
+
+
+def _partition_array(values):
+    import pyarrow as pa
+
+    # Rows without year/State go to the __HIVE_DEFAULT_PARTITION__ directory
+    return pa.array(values.tolist(), mask=(values == "").to_numpy(), type=pa.string())
+
+
+def _batches(csv_path, columns, chunk_rows, schema):
+    import pandas as pd
+    import pyarrow as pa
+
+    group_columns = [GROUP_COLUMNS[name] for name in PARTITION_COLUMNS]
+    usecols = sorted(set(columns + group_columns))
+    reader = pd.read_csv(
+        csv_path,
+        usecols=usecols,
+        dtype=str,
+        keep_default_na=False,
+        chunksize=chunk_rows,
+    )
+    for chunk in reader:
+        arrays = []
+        for idx in columns:
+            raw = chunk.iloc[:, usecols.index(idx)]
+            values, nulls = _convert(raw, idx, column_dtype(idx))
+            arrays.append(pa.array(values, mask=nulls))
+        for name in PARTITION_COLUMNS:
+            raw = chunk.iloc[:, usecols.index(GROUP_COLUMNS[name])]
+            arrays.append(_partition_array(raw.map(lambda f: group_value(name, f))))
+        yield pa.RecordBatch.from_arrays(arrays, schema=schema)
+
+
+def build_parquet_store(
+    csv_path, store_dir, columns=None, chunk_rows=DEFAULT_CHUNK_ROWS
+):
+    """
+    Convert csv_path into a Parquet dataset under store_dir partitioned by
+    year and State, converting chunk_rows CSV rows at a time
+    """
+    import pyarrow as pa
+    import pyarrow.dataset as ds
+
+    columns = sorted(columns or NUMERIC_COLUMNS)
+    schema = pa.schema(
+        [(HEADER[idx], column_dtype(idx)) for idx in columns]
+        + [(name, pa.string()) for name in PARTITION_COLUMNS]
+    )
+    ds.write_dataset(
+        _batches(csv_path, columns, chunk_rows, schema),
+        store_dir,
+        schema=schema,
+        format="parquet",
+        partitioning=partitioning(),
+        basename_template="part-{i}.parquet",
+        min_rows_per_group=MIN_ROWS_PER_GROUP,
+        max_rows_per_group=MAX_ROWS_PER_GROUP,
+        existing_data_behavior="delete_matching",
+    )
+    return write_row_group_index(store_dir)
+
+
+def write_row_group_index(store_dir, base_uri=None):
+    """
+    Write row_groups.txt listing every row group and return the number of
+    rows; base_uri (e.g. the HDFS directory the store is uploaded to)
+    replaces the local directory in the paths
+    """
+    import pyarrow.dataset as ds
+
+    base = (base_uri or os.path.abspath(store_dir)).rstrip("/")
+    dataset = open_dataset(store_dir)
+    rows = 0
+
+    with open(os.path.join(store_dir, ROW_GROUP_INDEX), "w") as f:
+        for fragment in sorted(dataset.get_fragments(), key=lambda f: f.path):
+            partition = ds.get_partition_keys(fragment.partition_expression)
+            relative = os.path.relpath(fragment.path, store_dir).replace(os.sep, "/")
+            metadata = fragment.metadata
+            for row_group in range(metadata.num_row_groups):
+                group_rows = metadata.row_group(row_group).num_rows
+                rows += group_rows
+                f.write(
+                    f"{base}/{relative}\t{row_group}\t{group_rows}\t"
+                    f"{partition.get('year') or ''}\t{partition.get('State') or ''}\n"
+                )
+    return rows
+
+
+def _non_null(column):
+    """(values without nulls as a NumPy array, null count) of an Arrow column"""
+    return column.drop_null().to_numpy(), column.null_count
+
+
+def read_row_group(path, row_group, columns):
+    """
+    {column: (values, null count)} of one row group, reading only the
+    column chunks of the requested columns (ValueError if one is missing)
+    """
+    import pyarrow.parquet as pq
+    from pyarrow import fs
+
+    source = path
+    if "://" in path:
+        filesystem, file_path = fs.FileSystem.from_uri(path)
+        source = filesystem.open_input_file(file_path)
+    parquet_file = pq.ParquetFile(source)
+    for idx in columns:
+        if HEADER[idx] not in parquet_file.schema_arrow.names:
+            raise ValueError(f"Column {idx} is not in the Parquet store")
+    table = parquet_file.read_row_group(
+        row_group, columns=[HEADER[idx] for idx in columns]
+    )
+    return {idx: _non_null(table.column(HEADER[idx])) for idx in columns}
+
+
+class ParquetStore:
+    """
+    Read access to a Parquet store (local directory or hdfs:// URI),
+    optionally restricted to the partitions matching where
+    """
+
+    def __init__(self, store_dir, where=None):
+        import pyarrow.dataset as ds
+
+        self.dataset = open_dataset(store_dir)
+        self.filter = None
+        for name, value in (where or {}).items():
+            condition = ds.field(name) == value
+            self.filter = condition if self.filter is None else self.filter & condition
+
+    def has_column(self, idx):
+        return HEADER[idx] in self.dataset.schema.names
+
+    def is_integer(self, idx):
+        import pyarrow as pa
+
+        return pa.types.is_integer(self.dataset.schema.field(HEADER[idx]).type)
+
+    def blocks(self, idx):
+        """Yield (values, null count) per record batch of a column"""
+        for batch in self.dataset.to_batches(columns=[HEADER[idx]], filter=self.filter):
+            yield _non_null(batch.column(0))
+
+    def footer_stats(self, idx):
+        """
+        (min, max, null count) of a column from the row group footers
+        without reading any values; None if a footer has no statistics
+        """
+        min_value = max_value = None
+        null_count = 0
+        for fragment in self.dataset.get_fragments(filter=self.filter):
+            metadata = fragment.metadata
+            position = metadata.schema.names.index(HEADER[idx])
+            for row_group in range(metadata.num_row_groups):
+                column = metadata.row_group(row_group).column(position)
+                stats = column.statistics
+                if stats is None or not stats.has_null_count:
+                    return None
+                null_count += stats.null_count
+                if stats.has_min_max:
+                    if min_value is None or stats.min < min_value:
+                        min_value = stats.min
+                    if max_value is None or stats.max > max_value:
+                        max_value = stats.max
+                elif stats.null_count < column.num_values:
+                    return None
+        return min_value, max_value, null_count
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Build a Parquet store of a CSV partitioned by year and State"
+    )
+    parser.add_argument("csv_path", help="Local US Accidents CSV file")
+    parser.add_argument("store_dir", help="Output directory of the Parquet store")
+    parser.add_argument(
+        "--columns",
+        help="Comma-separated column indexes (default: all numerical columns)",
+    )
+    parser.add_argument(
+        "--chunk-rows",
+        type=int,
+        default=DEFAULT_CHUNK_ROWS,
+        help="CSV rows converted at once",
+    )
+    parser.add_argument(
+        "--base-uri",
+        help="Directory the store will be uploaded to (e.g. hdfs:///user/...), "
+        "used for the file paths in row_groups.txt",
+    )
+    args = parser.parse_args()
+
+    columns = [int(c) for c in args.columns.split(",")] if args.columns else None
+    rows = build_parquet_store(args.csv_path, args.store_dir, columns, args.chunk_rows)
+    if args.base_uri:
+        write_row_group_index(args.store_dir, args.base_uri)
+    print(f"{rows} rows written to {args.store_dir}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+import os
+
+from accidents_job import AccidentsJob
+from csv_fields import fields_reader, is_header, to_float
+from data_quality import QualityTracker, merge_quality
+from kll import (
+    DEFAULT_K,
+    DEFAULT_QUANTILES,
+    DEFAULT_SEED,
+    KLLSketch,
+    merge_sketches,
+    rank_error,
+    task_seed,
+)
+
+
+class Percentiles(AccidentsJob):
+    """
+    MapReduce job computing approximate median and percentiles of several
+    numerical columns: every mapper builds a KLL sketch per column (a few
+    KB regardless of the input size), combiners and the reducer merge them
+    """
+
+    FILES = AccidentsJob.FILES + ["kll.py"]
+
+    def configure_args(self):
+        super(Percentiles, self).configure_args()
+        self.add_passthru_arg(
+            "--columns",
+            default="2",
+            help="Comma-separated indexes of the numerical columns (0-based)",
+        )
+        self.add_passthru_arg(
+            "--quantiles",
+            default=DEFAULT_QUANTILES,
+            help="Comma-separated fractions to report (0.5 = median)",
+        )
+        self.add_passthru_arg(
+            "--k",
+            type=int,
+            default=DEFAULT_K,
+            help="Sketch size parameter (larger k -> smaller error, more memory)",
+        )
+        self.add_passthru_arg(
+            "--seed",
+            type=int,
+            default=DEFAULT_SEED,
+            help="Seed of the sketch compactions (same seed -> same result)",
+        )
+
+    def mapper_init(self):
+        self.columns = [int(c) for c in self.options.columns.split(",")]
+        self.read_values = fields_reader(self.columns)
+        self.sketches = {
+            idx: KLLSketch(self.options.k, self.sketch_seed("map", idx))
+            for idx in self.columns
+        }
+        self.quality = QualityTracker(self)
+
+    def sketch_seed(self, stage, key):
+        """--seed mixed with the task partition, stage and column"""
+        # Streaming exports the jobconf with dots replaced by underscores
+        partition = os.environ.get(
+            "mapreduce_task_partition", os.environ.get("mapred_task_partition", 0)
+        )
+        return task_seed(self.options.seed, stage, partition, key)
+
+    def mapper(self, _, line):
+        # Skip the header row, detected by content (safe for any input split)
+        if is_header(line):
+            return
+
+        for idx, value_str in zip(self.columns, self.read_values(line)):
+            try:
+                value = to_float(value_str)
+            except ValueError as e:
+                self.quality.malformed(line, e)
+                continue
+
+            if value is None:
+                self.quality.missing(line)
+                continue
+
+            self.sketches[idx].update(value)
+
+    def mapper_final(self):
+        for idx, sketch in self.sketches.items():
+            if sketch.n > 0:
+                yield idx, sketch.partial()
+
+        quality = self.quality.final()
+        if quality:
+            yield "data_quality", quality
+
+    def combiner(self, key, values):
+        if key == "data_quality":
+            yield key, merge_quality(values)
+        else:
+            seed = self.sketch_seed("combine", key)
+            yield key, merge_sketches(values, seed).partial()
+
+    def reducer(self, key, values):
+        if key == "data_quality":
+            yield key, merge_quality(values)
+            return
+
+        sketch = merge_sketches(values, self.sketch_seed("reduce", key))
+        fractions = [float(q) for q in self.options.quantiles.split(",")]
+
+        yield key, {
+            "count": sketch.n,
+            "min": sketch.min,
+            "max": sketch.max,
+            "quantiles": dict(zip(map(str, fractions), sketch.quantiles(fractions))),
+            # Returned q-quantiles have a true rank within (q +- rank_error) * count
+            "rank_error": rank_error(sketch.k),
+        }
+
+
+if __name__ == "__main__":
+    Percentiles.run()
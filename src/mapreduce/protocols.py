@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+Compact binary protocols for the data passed between map and reduce.
+
+mrjob's default JSONProtocol writes every partial as text: a moment partial
+(count, mean, M2, M3, M4) becomes ~90 bytes of decimal digits that are
+formatted by the mapper and parsed again by the combiner and reducer.
+MsgPackProtocol writes the same values as MessagePack: floats are stored
+as 8-byte IEEE doubles (struct ">d"), small integers as single bytes, so
+records are smaller and encoding/decoding avoids float <-> text conversion.
+
+Hadoop Streaming still splits records at newlines and keys at the first
+tab, so the packed bytes are escaped: backslash, tab, newline and carriage
+return become two-byte sequences. Equal keys always pack to equal bytes,
+so grouping and partitioning work as with text keys. Decoded values have
+the same shape as with JSON (tuples arrive as lists).
+
+msgpack is only imported when one of these protocols is used, and must be
+installed on every node running the tasks.
+"""
+import re
+
+_ESCAPES = [(b"\\", b"\\\\"), (b"\t", b"\\t"), (b"\n", b"\\n"), (b"\r", b"\\r")]
+_UNESCAPES = {b"\\": b"\\", b"t": b"\t", b"n": b"\n", b"r": b"\r"}
+_ESCAPE_RE = re.compile(rb"\\(.)", re.DOTALL)
+
+
+def escape(data):
+    """Packed bytes -> bytes without tabs or line breaks"""
+    for raw, escaped in _ESCAPES:
+        data = data.replace(raw, escaped)
+    return data
+
+
+def unescape(data):
+    if b"\\" not in data:
+        return data
+    return _ESCAPE_RE.sub(lambda match: _UNESCAPES[match.group(1)], data)
+
+
+class MsgPackProtocol:
+    """Key and value as escaped MessagePack, separated by a tab"""
+
+    def __init__(self):
+        import msgpack
+
+        self._packer = msgpack.Packer(use_bin_type=True)
+        self._unpackb = msgpack.unpackb
+
+    def _unpack(self, data):
+        # Integer dict keys are allowed, as in the values the jobs emit
+        return self._unpackb(unescape(data), raw=False, strict_map_key=False)
+
+    def read(self, line):
+        key, value = line.split(b"\t", 1)
+        return self._unpack(key), self._unpack(value)
+
+    def write(self, key, value):
+        return b"%s\t%s" % (
+            escape(self._packer.pack(key)),
+            escape(self._packer.pack(value)),
+        )
+
+
+class MsgPackValueProtocol(MsgPackProtocol):
+    """Value only, like RawValueProtocol; the key is always None"""
+
+    def read(self, line):
+        return None, self._unpack(line)
+
+    def write(self, key, value):
+        return escape(self._packer.pack(value))
@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+from mrjob.protocol import RawValueProtocol
+
+from accidents_job import AccidentsJob
+from csv_fields import is_header
+from sampling import DEFAULT_SEED, METHODS, RowSampler
+
+
+class SampleRows(AccidentsJob):
+    """
+    Map-only MapReduce job writing a seeded sample of the CSV rows (header
+    included), for inputs too large to stream through one client with
+    sampling.py.
+
+    Bernoulli samples hash the row ID, so they are identical to the local
+    tool's and nested across fractions. Stratified samples are systematic
+    per mapper and stratum, i.e. exact per split up to one row per stratum.
+    Streaming jobs have a single output directory, so one run writes one
+    fraction; sampling.py writes several fractions in one pass.
+    """
+
+    FILES = AccidentsJob.FILES + ["sampling.py"]
+    OUTPUT_PROTOCOL = RawValueProtocol
+
+    def configure_args(self):
+        super(SampleRows, self).configure_args()
+        self.add_passthru_arg(
+            "--fraction", type=float, default=0.1, help="Share of rows to keep"
+        )
+        self.add_passthru_arg("--seed", type=int, default=DEFAULT_SEED)
+        self.add_passthru_arg(
+            "--method",
+            choices=METHODS,
+            default="bernoulli",
+            help="Hash-based Bernoulli or stratified systematic sampling",
+        )
+        self.add_passthru_arg(
+            "--stratify",
+            choices=["State", "year"],
+            default="State",
+            help="Strata of --method stratified",
+        )
+
+    def mapper_init(self):
+        stratify = None
+        if self.options.method == "stratified":
+            stratify = self.options.stratify
+        self.sampler = RowSampler([self.options.fraction], self.options.seed, stratify)
+        self.selected = 0
+
+    def mapper(self, _, line):
+        # The header row is kept; it is the first line of the first split
+        if is_header(line):
+            yield None, line
+        elif line and self.sampler.select(line):
+            self.selected += 1
+            yield None, line
+
+    def mapper_final(self):
+        # One counter update per mapper instead of one stderr line per row
+        self.increment_counter("sampling", "selected_rows", self.selected)
+
+
+if __name__ == "__main__":
+    SampleRows.run()
@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+"""
+Seeded row sampling of the US Accidents CSV in a single streaming pass.
+
+Rows are selected by a keyed hash of their ID instead of their position,
+so samples cover all years instead of the first lines of the file, and
+the same seed always selects the same rows (locally and in sample_rows.py
+on Hadoop):
+
+  bernoulli   a row belongs to the fraction-f sample if u(ID) < f, where
+              u(ID) is uniform in [0, 1). Samples of several fractions are
+              nested (the 10% sample is contained in the 25% sample).
+  stratified  systematic sampling inside each State or year: every stratum
+              contributes round(f * rows) rows (+-1), spread evenly over
+              the stratum starting at a seeded offset.
+
+The local tool reads the input once and writes every requested fraction,
+each starting with the header row. hdfs:// paths are streamed through
+"hadoop fs -cat" and "hadoop fs -put"; .gz/.bz2 paths are (de)compressed
+(compression.py).
+
+Usage:
+  python sampling.py hdfs:///user/student/us-accidents/data/US_Accidents.csv \
+      --fractions 0.1,0.25,0.5 --stratify State \
+      --output-pattern hdfs:///user/student/us-accidents/data/sample_{name}_data.csv
+"""
+import argparse
+import hashlib
+import math
+import sys
+
+from compression import open_input, open_output, wait_all
+from csv_fields import GROUP_COLUMNS, field_reader, group_value, is_header
+
+DEFAULT_SEED = 42
+METHODS = ["bernoulli", "stratified"]
+
+
+def hash_uniform(key, seed=DEFAULT_SEED):
+    """Deterministic value in [0, 1) for key; independent across seeds"""
+    digest = hashlib.blake2b(
+        key.encode("utf-8"), digest_size=8, key=str(seed).encode()
+    ).digest()
+    return int.from_bytes(digest, "big") / 2.0**64
+
+
+def fraction_name(fraction):
+    """0.25 -> "0_25", the file name suffix used by the evaluator"""
+    return str(fraction).replace(".", "_")
+
+
+class RowSampler:
+    """
+    Decides for every data row which of the fractions it belongs to.
+    Memory is constant for bernoulli and one counter per stratum and
+    fraction for stratified sampling.
+    """
+
+    def __init__(self, fractions, seed=DEFAULT_SEED, stratify=None):
+        self.fractions = list(fractions)
+        self.seed = seed
+        self.stratify = stratify
+        self.read_id = field_reader(0)
+        self.read_stratum = None
+        if stratify:
+            self.read_stratum = field_reader(GROUP_COLUMNS[stratify])
+        # stratum -> [rows seen, offset in [0, 1)]
+        self.positions = {}
+
+    def select(self, line):
+        """Indexes of the fractions whose sample includes this data row"""
+        if self.stratify is None:
+            # Rows without an ID fall back to hashing the whole line
+            u = hash_uniform(self.read_id(line) or line, self.seed)
+            return [i for i, fraction in enumerate(self.fractions) if u < fraction]
+
+        stratum = group_value(self.stratify, self.read_stratum(line))
+        position = self.positions.get(stratum)
+        if position is None:
+            position = [0, hash_uniform(stratum, self.seed)]
+            self.positions[stratum] = position
+        count, offset = position
+        position[0] += 1
+
+        # Take row c when an integer lies in (c * f + offset, (c + 1) * f + offset]
+        return [
+            i
+            for i, fraction in enumerate(self.fractions)
+            if math.floor((count + 1) * fraction + offset)
+            > math.floor(count * fraction + offset)
+        ]
+
+
+def sample_file(input_path, outputs, seed=DEFAULT_SEED, stratify=None):
+    """
+    Write the samples {fraction: output path} of input_path in one pass and
+    return {fraction: number of data rows written}
+    """
+    fractions = list(outputs)
+    sampler = RowSampler(fractions, seed, stratify)
+    counts = dict.fromkeys(fractions, 0)
+
+    source, source_process = open_input(input_path)
+    sinks = [open_output(outputs[fraction]) for fraction in fractions]
+    try:
+        for raw in source:
+            line = raw.decode("utf-8", "replace").rstrip("\r\n")
+            if is_header(line):
+                for sink, _ in sinks:
+                    sink.write(raw)
+                continue
+            if not line:
+                continue
+            for i in sampler.select(line):
+                sinks[i][0].write(raw)
+                counts[fractions[i]] += 1
+    finally:
+        source.close()
+        for sink, _ in sinks:
+            sink.close()
+
+    wait_all([source_process] + [process for _, process in sinks])
+    return counts
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Write seeded samples of several fractions in one pass"
+    )
+    parser.add_argument("input_path", help="Local or hdfs:// CSV file")
+    parser.add_argument(
+        "--fractions", default="0.1,0.25,0.5", help="Comma-separated fractions"
+    )
+    parser.add_argument(
+        "--output-pattern",
+        default="sample_{name}_data.csv",
+        help="Output path per fraction; {name} becomes e.g. 0_25",
+    )
+    parser.add_argument("--seed", type=int, default=DEFAULT_SEED)
+    parser.add_argument(
+        "--stratify",
+        choices=["none", "State", "year"],
+        default="none",
+        help="Keep the share of every State or year exact",
+    )
+    args = parser.parse_args()
+
+    fractions = [float(f) for f in args.fractions.split(",")]
+    outputs = {
+        fraction: args.output_pattern.format(name=fraction_name(fraction))
+        for fraction in fractions
+    }
+    stratify = None if args.stratify == "none" else args.stratify
+    counts = sample_file(args.input_path, outputs, args.seed, stratify)
+
+    for fraction, path in outputs.items():
+        print(f"{path}: {counts[fraction]} rows ({fraction:.0%})", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,15 +1,19 @@
 #!/usr/bin/env python3
-from mrjob.job import MRJob
-from mrjob.step import MRStep
-import csv
-import math
 
+from accidents_job import AccidentsJob
+from csv_fields import field_reader, is_header, to_float
+from data_quality import QualityTracker, merge_quality
+from moments import MomentAccumulator, describe, interpret_skewness, merge_moments
 
-class SkewnessSeverity(MRJob):
+
+class SkewnessSeverity(AccidentsJob):
     """
-    MapReduce job to calculate skewness of numerical column distribution
+    MapReduce job to calculate skewness (and excess kurtosis) of a numerical
+    column distribution in a single pass over mergeable moment partials
     """
 
+    FILES = AccidentsJob.FILES + ["moments.py"]
+
     def configure_args(self):
         super(SkewnessSeverity, self).configure_args()
         self.add_passthru_arg(
@@ -19,103 +23,66 @@ class SkewnessSeverity(MRJob):
             help="Index of the numerical column to analyze (0-based)",
         )
 
-    def steps(self):
-        return [
-            # First step: Calculate mean and standard deviation
-            MRStep(
-                mapper_init=self.mapper_init,
-                mapper=self.mapper_stats,
-                reducer=self.reducer_stats,
-            ),
-            # Second step: Calculate skewness
-            MRStep(mapper=self.mapper_skewness, reducer=self.reducer_skewness),
-        ]
-
     def mapper_init(self):
-        self.is_header = True
+        self.read_value = field_reader(self.options.column)
+        self.moments = MomentAccumulator()
+        self.quality = QualityTracker(self)
 
-    def mapper_stats(self, _, line):
-        # Skip header line
-        if self.is_header:
-            self.is_header = False
+    def mapper(self, _, line):
+        # Skip the header row, detected by content (safe for any input split)
+        if is_header(line):
             return
 
         try:
-            # Parse CSV line
-            row = next(csv.reader([line]))
-
-            # Get value from specified column
-            column_idx = self.options.column
-            value = float(row[column_idx])
-
-            # Emit value
-            yield "value", value
-        except Exception as e:
-            yield "error", str(e)
-
-    def reducer_stats(self, key, values):
-        if key == "value":
-            all_values = list(values)
-            n = len(all_values)
-
-            if n > 0:
-                # Calculate mean
-                mean = sum(all_values) / n
-
-                # Calculate variance and standard deviation
-                variance = sum((x - mean) ** 2 for x in all_values) / n
-                std_dev = math.sqrt(variance)
-
-                # Emit all values with mean and std_dev for next step
-                for val in all_values:
-                    yield None, (val, mean, std_dev, n)
-
-    def mapper_skewness(self, _, value_stats):
-        value, mean, std_dev, n = value_stats
-
-        # Calculate contribution to skewness
-        if std_dev > 0:
-            z_score = (value - mean) / std_dev
-            skewness_contribution = z_score**3
-            yield "skewness", (skewness_contribution, 1, n)
-        else:
-            yield "skewness", (0, 1, n)
-
-    def reducer_skewness(self, key, values):
-        sum_skewness = 0
-        count = 0
-        n = None
-
-        # Sum all contributions
-        for skew_contrib, cnt, sample_size in values:
-            sum_skewness += skew_contrib
-            count += cnt
-            if n is None:
-                n = sample_size
+            # Extract only the requested field
+            value = to_float(self.read_value(line))
+        except ValueError as e:
+            self.quality.malformed(line, e)
+            return
+
+        if value is None:
+            self.quality.missing(line)
+            return
+
+        self.moments.add(value)
+
+    def mapper_final(self):
+        if self.moments.count > 0:
+            yield "moments", self.moments.partial()
+
+        quality = self.quality.final()
+        if quality:
+            yield "data_quality", quality
+
+    def combiner(self, key, values):
+        if key == "moments":
+            yield key, merge_moments(values)
+        elif key == "data_quality":
+            yield key, merge_quality(values)
+
+    def reducer(self, key, values):
+        if key == "data_quality":
+            yield key, merge_quality(values)
+            return
+
+        partial = merge_moments(values)
+        n = partial[0]
 
         # Calculate final skewness
         if n > 0:
-            skewness = sum_skewness / n
+            stats = describe(partial)
+            skewness = stats["skewness"]
 
             yield (
                 "skewness_result",
                 {
                     "skewness": skewness,
+                    "kurtosis": stats["kurtosis"],
                     "sample_size": n,
-                    "interpretation": self.interpret_skewness(skewness),
+                    "interpretation": interpret_skewness(skewness),
                 },
             )
 
-    def interpret_skewness(self, skewness):
-        """Interpret the skewness value"""
-        if skewness > 0.5:
-            return "Positive skew (Right-tailed distribution)"
-        elif skewness < -0.5:
-            return "Negative skew (Left-tailed distribution)"
-        else:
-            return "Approximately symmetric distribution"
-
 
 if __name__ == "__main__":
     SkewnessSeverity.run()
-
@@ -1,16 +1,21 @@
 #!/usr/bin/env python3
-from mrjob.job import MRJob
-from mrjob.step import MRStep
-import csv
 import math
 
+from accidents_job import AccidentsJob
+from csv_fields import field_reader, is_header, to_float
+from data_quality import QualityTracker, merge_quality
+from moments import merge_variance
 
-class StdDevValue(MRJob):
+
+class StdDevValue(AccidentsJob):
     """
     MapReduce job to calculate standard deviation of a numerical column
-    (implements two-pass algorithm for std dev calculation)
+    (single pass: each mapper keeps a Welford accumulator and emits one
+    mergeable (count, mean, M2) partial, so the shuffle is O(mappers))
     """
 
+    FILES = AccidentsJob.FILES + ["moments.py"]
+
     def configure_args(self):
         super(StdDevValue, self).configure_args()
         self.add_passthru_arg(
@@ -20,82 +25,59 @@ class StdDevValue(MRJob):
             help="Index of the numerical column to analyze (0-based)",
         )
 
-    def steps(self):
-        return [
-            # First step: Calculate mean
-            MRStep(
-                mapper_init=self.mapper_init,
-                mapper=self.mapper_mean,
-                reducer=self.reducer_mean,
-            ),
-            # Second step: Calculate variance and standard deviation
-            MRStep(mapper=self.mapper_variance, reducer=self.reducer_variance),
-        ]
-
     def mapper_init(self):
-        self.is_header = True
-
-    def mapper_mean(self, _, line):
-        # Skip header line
-        if self.is_header:
-            self.is_header = False
+        self.read_value = field_reader(self.options.column)
+        self.quality = QualityTracker(self)
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+
+    def mapper(self, _, line):
+        # Skip the header row, detected by content (safe for any input split)
+        if is_header(line):
             return
 
         try:
-            # Parse CSV line
-            row = next(csv.reader([line]))
-
-            column_idx = self.options.column
-            value = float(row[column_idx])
-
-            # Emit count and value
-            yield "value", (1, value)
-        except Exception as e:
-            yield "error", str(e)
-
-    def reducer_mean(self, key, values):
-        if key == "value":
-            count = 0
-            total = 0
-            all_values = []
-
-            # Aggregate all values
-            for cnt, val in values:
-                count += cnt
-                total += val
-                all_values.append(val)
-
-            # Calculate mean
-            if count > 0:
-                mean = total / count
-                # Emit all values with mean and count for next step
-                for val in all_values:
-                    yield None, (val, mean, count)
-
-    def mapper_variance(self, _, value_mean_count):
-        value, mean, count = value_mean_count
-        # Calculate squared difference for each value
-        squared_diff = (value - mean) ** 2
-        yield "variance", (squared_diff, 1, mean, count)
-
-    def reducer_variance(self, key, values):
-        sum_squared_diff = 0
-        total_count = 0
-        mean = None
-        count = None
-
-        # Sum all squared differences
-        for squared_diff, cnt, m, c in values:
-            sum_squared_diff += squared_diff
-            total_count += cnt
-            # All should have the same mean and count
-            if mean is None:
-                mean = m
-                count = c
+            # Extract only the requested field
+            value = to_float(self.read_value(line))
+        except ValueError as e:
+            self.quality.malformed(line, e)
+            return
+
+        if value is None:
+            self.quality.missing(line)
+            return
+
+        # Welford update of the running mean and sum of squared deviations
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (value - self.mean)
+
+    def mapper_final(self):
+        if self.count > 0:
+            yield "partial", (self.count, self.mean, self.m2)
+
+        quality = self.quality.final()
+        if quality:
+            yield "data_quality", quality
+
+    def combiner(self, key, values):
+        if key == "partial":
+            yield key, merge_variance(values)
+        elif key == "data_quality":
+            yield key, merge_quality(values)
+
+    def reducer(self, key, values):
+        if key == "data_quality":
+            yield key, merge_quality(values)
+            return
+
+        count, mean, m2 = merge_variance(values)
 
         # Calculate variance and standard deviation
-        if total_count > 0:
-            variance = sum_squared_diff / count
+        if count > 0:
+            variance = m2 / count
             std_dev = math.sqrt(variance)
 
             yield "statistics", {"mean": mean, "std_dev": std_dev, "count": count}
@@ -103,4 +85,3 @@ class StdDevValue(MRJob):
 
 if __name__ == "__main__":
     StdDevValue.run()
-
@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+
+from accidents_job import AccidentsJob
+from csv_fields import field_reader, is_header, to_float
+from data_quality import QualityTracker, merge_quality
+from histogram_stats import (
+    DEFAULT_MAX_DISTINCT,
+    histogram_moments,
+    histogram_pairs,
+    histogram_stats,
+    merge_histograms,
+)
+from moments import MomentAccumulator, describe, merge_moments
+
+
+class ValueHistogram(AccidentsJob):
+    """
+    MapReduce job counting the values of a low-cardinality column (e.g.
+    Severity): each mapper emits one value -> count histogram, so the
+    shuffle carries a handful of numbers instead of every value. Mean,
+    variance, skewness, min, max, mode and the exact median are derived
+    from the merged histogram.
+
+    Once a column exceeds --max-distinct values the histogram is turned
+    into a (moments, min, max) partial and only moment statistics are
+    reported, which keeps memory and shuffle bounded for any column.
+    Partials are tagged ["histogram", pairs] or ["moments", partial] and
+    share one key, so both kinds meet in the same reducer.
+    """
+
+    FILES = AccidentsJob.FILES + ["moments.py", "histogram_stats.py"]
+
+    def configure_args(self):
+        super(ValueHistogram, self).configure_args()
+        self.add_passthru_arg(
+            "--column", type=int, default=2, help="Index of the column (0-based)"
+        )
+        self.add_passthru_arg(
+            "--max-distinct",
+            type=int,
+            default=DEFAULT_MAX_DISTINCT,
+            help="Fall back to moments above this many distinct values",
+        )
+
+    def mapper_init(self):
+        self.read_value = field_reader(self.options.column)
+        self.quality = QualityTracker(self)
+        self.histogram = {}
+        # Set once the column turns out to have too many distinct values
+        self.moments = None
+        self.min_val = None
+        self.max_val = None
+
+    def mapper(self, _, line):
+        # Skip the header row, detected by content (safe for any input split)
+        if is_header(line):
+            return
+
+        try:
+            value = to_float(self.read_value(line))
+        except ValueError as e:
+            self.quality.malformed(line, e)
+            return
+
+        if value is None:
+            self.quality.missing(line)
+            return
+
+        if self.moments is None:
+            self.histogram[value] = self.histogram.get(value, 0) + 1
+            if len(self.histogram) > self.options.max_distinct:
+                # Too many distinct values: continue with moments only
+                self.moments = MomentAccumulator()
+                self.moments.merge(histogram_moments(self.histogram))
+                self.min_val = min(self.histogram)
+                self.max_val = max(self.histogram)
+                self.histogram = {}
+            return
+
+        self.moments.add(value)
+        if value < self.min_val:
+            self.min_val = value
+        if value > self.max_val:
+            self.max_val = value
+
+    def mapper_final(self):
+        if self.moments is not None:
+            yield "values", [
+                "moments",
+                [self.moments.partial(), self.min_val, self.max_val],
+            ]
+        elif self.histogram:
+            yield "values", ["histogram", histogram_pairs(self.histogram)]
+
+        quality = self.quality.final()
+        if quality:
+            yield "data_quality", quality
+
+    def merge_values(self, values):
+        """
+        Merge tagged partials; the result stays a histogram unless a moments
+        partial is involved or the merged histogram grows too large
+        """
+        histogram = {}
+        moment_partials = []
+        for kind, partial in values:
+            if kind == "histogram":
+                merge_histograms([partial], into=histogram)
+            else:
+                moment_partials.append(partial)
+
+        if not moment_partials and len(histogram) <= self.options.max_distinct:
+            return ["histogram", histogram_pairs(histogram)]
+
+        if histogram:
+            moment_partials.append(
+                [histogram_moments(histogram), min(histogram), max(histogram)]
+            )
+        moments = merge_moments(partial[0] for partial in moment_partials)
+        min_val = min(partial[1] for partial in moment_partials)
+        max_val = max(partial[2] for partial in moment_partials)
+        return ["moments", [moments, min_val, max_val]]
+
+    def combiner(self, key, values):
+        if key == "data_quality":
+            yield key, merge_quality(values)
+        else:
+            yield key, self.merge_values(values)
+
+    def reducer(self, key, values):
+        if key == "data_quality":
+            yield key, merge_quality(values)
+            return
+
+        kind, partial = self.merge_values(values)
+        if kind == "histogram":
+            histogram = merge_histograms([partial])
+            stats = histogram_stats(histogram)
+            stats["method"] = "histogram"
+            stats["distinct"] = len(histogram)
+            stats["histogram"] = partial
+        else:
+            moments, min_val, max_val = partial
+            stats = describe(moments)
+            stats.update({"min": min_val, "max": max_val, "method": "moments"})
+
+        yield "statistics", stats
+
+
+if __name__ == "__main__":
+    ValueHistogram.run()
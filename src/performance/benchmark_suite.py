@@ -0,0 +1,375 @@
+#!/usr/bin/env python3
+"""
+Küme gerektirmeyen performans regresyon kıyaslaması.
+
+Her iş, yerel bir CSV örneği üzerinde ayrı bir süreçte çalıştırılır:
+  --runner profiler : job_profiler ile süreç içinde; map/combine/shuffle/reduce
+                      süreleri ve shuffle'a giren kayıt/bayt sayıları ölçülür
+  --runner inline   : mrjob'un inline/local çalıştırıcısıyla uçtan uca süre
+  --runner local      (faz süreleri yoktur)
+
+Her iş için kayıt/saniye, en yüksek bellek kullanımı (peak RSS) ve makine
+bilgileri (işlemci, çekirdek sayısı, Python/mrjob sürümü, git commit'i)
+sonuç dosyasına yazılır. Her ölçümün --repeat tekrarındaki en iyi değeri
+ve tekrarlar arasındaki yayılımı (en kötü - en iyi) kaydedilir.
+--baseline ile verilen önceki sonuçlara göre hem eşiği (--threshold) hem
+de iki çalıştırmanın yayılımını aşan yavaşlama, bellek veya shuffle
+artışı regresyon olarak işaretlenir ve betik 1 koduyla çıkar; böylece
+yavaşlamalar kümeye gönderilmeden dizüstü bilgisayarda yakalanır, ölçüm
+gürültüsü ise regresyon sayılmaz.
+
+Örnek:
+  python benchmark_suite.py --input US_Accidents.csv --limit 200000 --save-baseline
+  python benchmark_suite.py --input US_Accidents.csv --limit 200000
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import platform
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+
+from tabulate import tabulate
+
+from job_profiler import JOB_CLASSES, load_job_class, profile_job, read_lines
+
+script_dir = Path(__file__).parent.resolve()
+DEFAULT_BASELINE = f"{script_dir}/../../results/benchmark_baseline.json"
+MULTI_COLUMN_SCRIPTS = {"column_summary.py", "percentiles.py"}
+
+# Ölçüm -> büyümesi kötü mü (True) yoksa düşmesi mi (False)
+METRICS = {
+    "wall_time": True,
+    "records_per_sec": False,
+    "map_time": True,
+    "reduce_time": True,
+    "shuffle_bytes": True,
+    "peak_rss_mb": True,
+}
+# Süreler arasında bundan küçük farklar (saniye) zamanlayıcı ve işlemci
+# gürültüsüdür, regresyon sayılmaz
+MIN_TIME = 0.05
+
+
+def parse_arguments():
+    """Komut satırı argümanlarını işle"""
+    parser = argparse.ArgumentParser(
+        description="Küme gerektirmeyen performans regresyon kıyaslaması"
+    )
+    parser.add_argument("--input", required=True, help="Yerel CSV dosyası")
+    parser.add_argument(
+        "--limit", type=int, default=None, help="Okunacak en fazla satır sayısı"
+    )
+    parser.add_argument(
+        "--scripts",
+        default=",".join(JOB_CLASSES),
+        help="Ölçülecek iş betikleri (virgülle ayrılmış)",
+    )
+    parser.add_argument("--columns", default="2", help="Sütun indeksleri")
+    parser.add_argument(
+        "--runner", choices=["profiler", "inline", "local"], default="profiler"
+    )
+    parser.add_argument(
+        "--mappers", type=int, default=4, help="Benzetilen mapper sayısı"
+    )
+    parser.add_argument(
+        "--repeat", type=int, default=3, help="İş başına tekrar (en iyisi alınır)"
+    )
+    parser.add_argument(
+        "--baseline", default=DEFAULT_BASELINE, help="Karşılaştırılacak sonuçlar"
+    )
+    parser.add_argument(
+        "--save-baseline",
+        action="store_true",
+        help="Sonuçları yeni taban çizgisi olarak kaydet",
+    )
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.15,
+        help="Regresyon sayılacak en küçük göreli kötüleşme (0.15 = %%15)",
+    )
+    parser.add_argument("--output", help="Sonuçların yazılacağı JSON dosyası")
+    return parser.parse_args()
+
+
+def machine_info():
+    """Sonuçların hangi makinede ve hangi kodla ölçüldüğü"""
+    try:
+        import mrjob
+
+        mrjob_version = mrjob.__version__
+    except (ImportError, AttributeError):
+        mrjob_version = None
+    try:
+        commit = (
+            subprocess.check_output(
+                ["git", "rev-parse", "--short", "HEAD"],
+                cwd=script_dir,
+                stderr=subprocess.DEVNULL,
+            )
+            .decode()
+            .strip()
+        )
+    except (subprocess.CalledProcessError, OSError):
+        commit = None
+
+    memory_gb = None
+    if hasattr(os, "sysconf") and "SC_PHYS_PAGES" in os.sysconf_names:
+        memory_gb = os.sysconf("SC_PAGE_SIZE") * os.sysconf("SC_PHYS_PAGES") / 1e9
+
+    return {
+        "hostname": platform.node(),
+        "platform": platform.platform(),
+        "processor": platform.processor() or platform.machine(),
+        "cpu_count": os.cpu_count(),
+        "memory_gb": round(memory_gb, 1) if memory_gb else None,
+        "python": platform.python_version(),
+        "mrjob": mrjob_version,
+        "git_commit": commit,
+    }
+
+
+def job_arguments(script, columns):
+    if script in MULTI_COLUMN_SCRIPTS:
+        return ["--columns", columns]
+    return ["--column", columns.split(",")[0]]
+
+
+def peak_rss_mb():
+    """Bu sürecin ve alt süreçlerinin en yüksek bellek kullanımı (MB)"""
+    peak = max(
+        resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+        resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss,
+    )
+    # Linux KB, macOS bayt cinsinden raporlar
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def _measure(script, job_args, input_path, limit, runner, mappers):
+    """Tek bir ölçüm; bellek ölçümü karışmasın diye ayrı bir süreçte çalışır"""
+    job_class = load_job_class(script)
+    lines = read_lines(input_path, limit)
+
+    if runner == "profiler":
+        stats = profile_job(job_class(job_args), lines, mappers=mappers)
+        for key in ("output", "counters", "reducer_loads"):
+            stats.pop(key)
+    else:
+        # mrjob çalıştırıcıları dosya okur; --limit için geçici dosya yazılır
+        with tempfile.NamedTemporaryFile("w", suffix=".csv", delete=False) as f:
+            f.write("\n".join(lines) + "\n")
+        try:
+            job = job_class(["-r", runner, f.name] + job_args)
+            t0 = time.perf_counter()
+            with job.make_runner() as job_runner:
+                job_runner.run()
+                for _ in job_runner.cat_output():
+                    pass
+            wall_time = time.perf_counter() - t0
+        finally:
+            os.unlink(f.name)
+        stats = {"input_records": len(lines), "wall_time": wall_time}
+        stats["records_per_sec"] = len(lines) / wall_time if wall_time else 0.0
+
+    stats["peak_rss_mb"] = peak_rss_mb()
+    return stats
+
+
+def best_of(runs, key):
+    """Tekrarların en iyi değeri: kayıt/s için en büyük, diğerleri için en küçük"""
+    values = [run[key] for run in runs]
+    return max(values) if key == "records_per_sec" else min(values)
+
+
+def run_suite(args):
+    """Her iş için --repeat ölçümün en iyi değerlerini ve yayılımlarını topla"""
+    scripts = [s.strip() for s in args.scripts.split(",") if s.strip()]
+    # Her ölçüm temiz bir süreçte: peak RSS önceki işlerden etkilenmez
+    context = multiprocessing.get_context("spawn")
+    runs = {script: [] for script in scripts}
+
+    # Tekrarlar turlar halinde: makinenin yükü zamanla değiştiğinde bu, tek
+    # bir işin bütün tekrarlarını değil her işin birer tekrarını etkiler
+    # ve yayılıma yansır
+    for _ in range(args.repeat):
+        for script in scripts:
+            with context.Pool(1) as pool:
+                runs[script].append(
+                    pool.apply(
+                        _measure,
+                        (
+                            script,
+                            job_arguments(script, args.columns),
+                            args.input,
+                            args.limit,
+                            args.runner,
+                            args.mappers,
+                        ),
+                    )
+                )
+
+    results = {}
+    for script in scripts:
+        # Tekil ölçümlerin gürültüsü tek yönlüdür (yavaşlatır), en iyisi
+        # kararlıdır; yayılım, aynı kodun ne kadar oynadığını gösterir
+        script_runs = runs[script]
+        results[script] = {key: best_of(script_runs, key) for key in script_runs[0]}
+        results[script]["spread"] = {
+            key: max(run[key] for run in script_runs)
+            - min(run[key] for run in script_runs)
+            for key in script_runs[0]
+        }
+        results[script]["times"] = [run["wall_time"] for run in script_runs]
+        print(f"{script}: {results[script]['wall_time']:.3f} s", file=sys.stderr)
+
+    return results
+
+
+def noise(base, stats, metric):
+    """Aynı kodun iki çalıştırması arasında beklenen en büyük fark
+
+    İki çalıştırmadaki tekrarların yayılımından büyük olanıdır; süreler
+    için en az MIN_TIME.
+    """
+    spread = max(
+        base.get("spread", {}).get(metric, 0),
+        stats.get("spread", {}).get(metric, 0),
+    )
+    return max(spread, MIN_TIME) if metric.endswith("_time") else spread
+
+
+def compare(results, baseline, threshold):
+    """(iş, ölçüm, taban, yeni, değişim, regresyon mu) satırları"""
+    rows = []
+    for script, stats in results.items():
+        base = baseline.get("jobs", {}).get(script)
+        if not base:
+            continue
+        for metric, higher_is_worse in METRICS.items():
+            old, new = base.get(metric), stats.get(metric)
+            if not old or new is None:
+                continue
+            change = (new - old) / old
+            worse = change if higher_is_worse else -change
+            # Kayıt/s duvar süresinden türetilir; gürültüsü de onunkidir
+            noisy = "wall_time" if metric == "records_per_sec" else metric
+            difference = abs(stats.get(noisy, 0) - base.get(noisy, 0))
+            regression = worse > threshold and difference > noise(
+                base, stats, noisy
+            )
+            rows.append((script, metric, old, new, change, regression))
+    return rows
+
+
+def print_report(results, comparison):
+    """Ölçümleri ve (varsa) taban çizgisine göre değişimleri yazdır"""
+    headers = [
+        "İş",
+        "Süre (s)",
+        "Kayıt/s",
+        "Map (s)",
+        "Combine (s)",
+        "Shuffle (s)",
+        "Reduce (s)",
+        "Shuffle (bayt)",
+        "Peak RSS (MB)",
+    ]
+    report = []
+    for script, stats in results.items():
+        report.append(
+            [script, f"{stats['wall_time']:.3f}", f"{stats['records_per_sec']:.0f}"]
+            + [
+                f"{stats[key]:.3f}" if key in stats else "-"
+                for key in ("map_time", "combine_time", "shuffle_time", "reduce_time")
+            ]
+            + [stats.get("shuffle_bytes", "-"), f"{stats['peak_rss_mb']:.1f}"]
+        )
+    print(tabulate(report, headers=headers, tablefmt="grid"))
+
+    if comparison:
+        print("\nTaban çizgisine göre:")
+        print(
+            tabulate(
+                [
+                    [
+                        script,
+                        metric,
+                        f"{old:.4g}",
+                        f"{new:.4g}",
+                        f"{change:+.1%}",
+                        "REGRESYON" if regression else "",
+                    ]
+                    for script, metric, old, new, change, regression in comparison
+                ],
+                headers=["İş", "Ölçüm", "Taban", "Yeni", "Değişim", ""],
+                tablefmt="grid",
+            )
+        )
+
+
+def main():
+    args = parse_arguments()
+    machine = machine_info()
+    results = run_suite(args)
+    document = {
+        "created": datetime.now().isoformat(),
+        "machine": machine,
+        "settings": {
+            "input": os.path.abspath(args.input),
+            "limit": args.limit,
+            "runner": args.runner,
+            "mappers": args.mappers,
+            "repeat": args.repeat,
+            "columns": args.columns,
+        },
+        "jobs": results,
+    }
+
+    comparison = []
+    if os.path.exists(args.baseline) and not args.save_baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        base_settings = baseline.get("settings", {})
+        if base_settings.get("runner") != args.runner:
+            print("Uyarı: taban çizgisi farklı bir çalıştırıcıyla ölçülmüş")
+        for key in ("input", "limit", "columns", "mappers"):
+            if base_settings.get(key) != document["settings"][key]:
+                print(
+                    f"Uyarı: taban çizgisi farklı bir {key} ile ölçülmüş "
+                    f"({base_settings.get(key)} -> {document['settings'][key]})"
+                )
+        base_machine = baseline.get("machine", {})
+        if any(
+            base_machine.get(key) != machine[key]
+            for key in ("hostname", "cpu_count", "python")
+        ):
+            print("Uyarı: taban çizgisi farklı bir makinede ölçülmüş")
+        comparison = compare(results, baseline, args.threshold)
+
+    print_report(results, comparison)
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(document, f, indent=2, ensure_ascii=False)
+        print(f"\nSonuçlar kaydedildi: {args.output}")
+    if args.save_baseline:
+        os.makedirs(os.path.dirname(args.baseline), exist_ok=True)
+        with open(args.baseline, "w") as f:
+            json.dump(document, f, indent=2, ensure_ascii=False)
+        print(f"\nTaban çizgisi kaydedildi: {args.baseline}")
+
+    regressions = [row for row in comparison if row[-1]]
+    if regressions:
+        print(f"\n{len(regressions)} regresyon bulundu (eşik {args.threshold:.0%})")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,416 @@
+#!/usr/bin/env python3
+"""
+US Accidents biçiminde, tohumlu ve istenen boyutta sentetik CSV üretici.
+
+Çıktı, işlerin indekslediği 46 sütunluk başlığın aynısını (csv_fields.HEADER)
+kullanır. Dağılımlar gerçek veri setine yakındır: Severity çoğunlukla 2,
+kazaların çoğu CA/FL/TX'te, hava durumu sütunlarında gerçek oranlarda boş
+değerler, virgül içeren tırnaklı Description alanları ve --multiline-rate
+oranında satır sonu içeren açıklamalar (satır tabanlı işler bunları hatalı
+satır olarak sayar; veri kalitesi raporunu sınamak için kullanışlıdır).
+
+Satırlar CHUNK_ROWS'luk parçalar halinde, her parça (tohum, parça no) ile
+ayrı bir NumPy üretecinden ve ayrı süreçlerde üretilir; bu nedenle çıktı
+süreç sayısından bağımsız olarak aynı tohum için bayt bayt aynıdır.
+
+Sürenin çoğu sayıların tek tek metne çevrilmesine gider. Ölçülen hız tek
+süreçle ~25 MB/s (saniyede ~70 bin satır), 4 süreçle ~21 MB/s'dir; ek
+süreçler ancak boş çekirdek varsa hızlandırır. 10 milyon satır (~3.5 GB)
+birkaç dakika sürer. hdfs:// çıktıları hdfs_client ile WebHDFS'e parça
+parça akıtılır; hadoop istemcisi gerekmez.
+
+Örnek:
+  python data_generator.py --rows 10000000 --output synthetic_10M.csv
+  python data_generator.py --rows 50000000 \\
+      --output hdfs:///user/student/us-accidents/data/synthetic_50M.csv
+"""
+import argparse
+import multiprocessing
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).parent.resolve().parent / "mapreduce"))
+sys.path.insert(0, str(Path(__file__).parent.resolve().parent / "storage"))
+from csv_fields import HEADER  # noqa: E402
+from hdfs_client import get_client  # noqa: E402
+
+DEFAULT_SEED = 42
+CHUNK_ROWS = 100_000
+
+START_TIME = np.datetime64("2016-01-01T00:00:00")
+END_TIME = np.datetime64("2023-04-01T00:00:00")
+
+SEVERITY_WEIGHTS = [0.009, 0.797, 0.168, 0.026]
+SOURCES = (["Source1", "Source2", "Source3"], [0.56, 0.42, 0.02])
+
+# Eyalet: (pay, enlem, boylam, saat dilimi)
+STATES = {
+    "CA": (0.225, 36.5, -119.5, "US/Pacific"),
+    "FL": (0.113, 28.1, -81.6, "US/Eastern"),
+    "TX": (0.075, 31.0, -97.5, "US/Central"),
+    "SC": (0.050, 33.8, -80.9, "US/Eastern"),
+    "NY": (0.045, 42.2, -74.9, "US/Eastern"),
+    "NC": (0.044, 35.5, -79.4, "US/Eastern"),
+    "VA": (0.040, 37.5, -78.8, "US/Eastern"),
+    "PA": (0.039, 40.9, -77.8, "US/Eastern"),
+    "MN": (0.025, 46.3, -94.3, "US/Central"),
+    "OR": (0.023, 44.0, -120.5, "US/Pacific"),
+    "AZ": (0.022, 34.3, -111.7, "US/Mountain"),
+    "GA": (0.022, 32.7, -83.4, "US/Eastern"),
+    "IL": (0.022, 40.0, -89.2, "US/Central"),
+    "TN": (0.022, 35.9, -86.4, "US/Central"),
+    "MI": (0.021, 44.3, -85.4, "US/Eastern"),
+    "LA": (0.019, 31.1, -92.0, "US/Central"),
+    "NJ": (0.018, 40.2, -74.7, "US/Eastern"),
+    "MD": (0.018, 39.0, -76.8, "US/Eastern"),
+    "OH": (0.017, 40.3, -82.8, "US/Eastern"),
+    "WA": (0.016, 47.4, -120.5, "US/Pacific"),
+    "UT": (0.014, 39.3, -111.7, "US/Mountain"),
+    "CO": (0.012, 39.0, -105.5, "US/Mountain"),
+    "AL": (0.012, 32.8, -86.8, "US/Central"),
+    "MO": (0.010, 38.4, -92.5, "US/Central"),
+    "CT": (0.010, 41.6, -72.7, "US/Eastern"),
+    "IN": (0.009, 39.9, -86.3, "US/Eastern"),
+    "MA": (0.008, 42.3, -71.8, "US/Eastern"),
+    "OK": (0.007, 35.6, -97.5, "US/Central"),
+    "WI": (0.005, 44.6, -89.9, "US/Central"),
+    "NV": (0.004, 39.3, -116.6, "US/Pacific"),
+}
+CITIES = {
+    "CA": ["Los Angeles", "Sacramento", "San Diego"],
+    "FL": ["Miami", "Orlando", "Jacksonville"],
+    "TX": ["Houston", "Dallas", "Austin"],
+    "SC": ["Columbia", "Charleston"],
+    "NY": ["New York", "Brooklyn", "Rochester"],
+    "NC": ["Charlotte", "Raleigh"],
+    "VA": ["Richmond", "Arlington"],
+    "PA": ["Philadelphia", "Pittsburgh"],
+    "MN": ["Minneapolis", "Saint Paul"],
+    "OR": ["Portland", "Eugene"],
+    "AZ": ["Phoenix", "Tucson"],
+    "GA": ["Atlanta", "Savannah"],
+    "IL": ["Chicago", "Springfield"],
+    "TN": ["Nashville", "Memphis"],
+    "MI": ["Detroit", "Grand Rapids"],
+    "LA": ["New Orleans", "Baton Rouge"],
+    "NJ": ["Newark", "Trenton"],
+    "MD": ["Baltimore", "Annapolis"],
+    "OH": ["Columbus", "Cleveland"],
+    "WA": ["Seattle", "Spokane"],
+    "UT": ["Salt Lake City", "Provo"],
+    "CO": ["Denver", "Boulder"],
+    "AL": ["Birmingham", "Montgomery"],
+    "MO": ["Saint Louis", "Kansas City"],
+    "CT": ["Hartford", "New Haven"],
+    "IN": ["Indianapolis", "Fort Wayne"],
+    "MA": ["Boston", "Worcester"],
+    "OK": ["Oklahoma City", "Tulsa"],
+    "WI": ["Milwaukee", "Madison"],
+    "NV": ["Las Vegas", "Reno"],
+}
+
+CITY_SLOTS = 6
+
+STREETS = ["I-5 N", "I-95 S", "I-10 E", "US-101 N", "Main St", "Broadway", "I-75 S"]
+DESCRIPTIONS = [
+    "Accident on {street}.",
+    "Lane blocked, use caution on {street}.",
+    "Incident on {street}, expect delays.",
+    "Crash on {street}, right lane closed.",
+    'Stationary traffic on {street}, due to "accident".',
+]
+AIRPORTS = ["KLAX", "KMIA", "KIAH", "KJFK", "KORD", "KATL", "KSEA"]
+WIND_DIRECTIONS = ["CALM", "N", "NE", "E", "SE", "S", "SW", "W", "NW", "VAR"]
+WEATHER = (
+    ["Fair", "Cloudy", "Mostly Cloudy", "Partly Cloudy", "Light Rain", "Clear", "Fog"],
+    [0.33, 0.13, 0.13, 0.10, 0.05, 0.22, 0.04],
+)
+
+# Sütun -> boş bırakılma oranı (gerçek veri setindeki eksik değer oranları)
+BLANK_RATES = {
+    "End_Lat": 0.44,
+    "Temperature(F)": 0.021,
+    "Wind_Chill(F)": 0.26,
+    "Humidity(%)": 0.022,
+    "Pressure(in)": 0.018,
+    "Visibility(mi)": 0.023,
+    "Wind_Speed(mph)": 0.074,
+    "Precipitation(in)": 0.285,
+}
+
+# True/False bayrak sütunları -> True oranı
+FLAG_RATES = {
+    "Amenity": 0.012,
+    "Bump": 0.0005,
+    "Crossing": 0.113,
+    "Give_Way": 0.005,
+    "Junction": 0.074,
+    "No_Exit": 0.003,
+    "Railway": 0.009,
+    "Roundabout": 0.0001,
+    "Station": 0.026,
+    "Stop": 0.028,
+    "Traffic_Calming": 0.001,
+    "Traffic_Signal": 0.148,
+    "Turning_Loop": 0.0,
+}
+# Gün/gece sütunları -> (gündüz başlangıç saati, gece başlangıç saati)
+DAYLIGHT_HOURS = {
+    "Sunrise_Sunset": (6, 19),
+    "Civil_Twilight": (6, 20),
+    "Nautical_Twilight": (5, 20),
+    "Astronomical_Twilight": (5, 21),
+}
+
+# Bayrak ve gün/gece sütunları ardışıktır; her satırda tek tek birleştirmek
+# yerine olası tüm değer kombinasyonlarının metni önceden hazırlanır
+FLAG_START = HEADER.index("Amenity")
+FLAG_SEGMENTS = np.array(
+    [
+        ",".join("True" if code >> i & 1 else "False" for i in range(len(FLAG_RATES)))
+        for code in range(2 ** len(FLAG_RATES))
+    ],
+    dtype=object,
+)
+DAYLIGHT_SEGMENTS = np.array(
+    [
+        ",".join(
+            "Day" if dawn <= hour < dusk else "Night"
+            for dawn, dusk in DAYLIGHT_HOURS.values()
+        )
+        for hour in range(24)
+    ],
+    dtype=object,
+)
+
+
+def _numbers(rng, values, fmt, blank_rate=0.0):
+    """
+    Sayıları fmt ("{:.1f}" gibi) ile biçimlendir; blank_rate oranında boş
+    bırak (str.format, np.char.mod'dan birkaç kat hızlıdır)
+    """
+    text = np.array(list(map(fmt.format, values.tolist())), dtype=object)
+    if blank_rate:
+        text[rng.random(len(values)) < blank_rate] = ""
+    return text
+
+
+def _choice(rng, options, count, weights=None):
+    return np.asarray(options, dtype=object)[
+        rng.choice(len(options), size=count, p=weights)
+    ]
+
+
+def _quote(field):
+    """CSV alanını gerekiyorsa tırnak içine al (RFC 4180)"""
+    if "," in field or '"' in field or "\n" in field:
+        return '"' + field.replace('"', '""') + '"'
+    return field
+
+
+def generate_chunk(chunk, rows, seed=DEFAULT_SEED, multiline_rate=0.001):
+    """
+    chunk numaralı parçanın satırlarını (ID'ler chunk * CHUNK_ROWS + 1'den
+    başlar) tek bir metin olarak üret
+    """
+    rng = np.random.default_rng([seed, chunk])
+    first_id = chunk * CHUNK_ROWS + 1
+    ids = [f"A-{i}" for i in range(first_id, first_id + rows)]
+    columns = {"ID": np.array(ids, dtype=object)}
+
+    columns["Source"] = _choice(rng, SOURCES[0], rows, SOURCES[1])
+    columns["Severity"] = _numbers(
+        rng, rng.choice([1, 2, 3, 4], size=rows, p=SEVERITY_WEIGHTS), "{:d}"
+    )
+
+    span = int((END_TIME - START_TIME) / np.timedelta64(1, "s"))
+    start = START_TIME + rng.integers(0, span, size=rows).astype("timedelta64[s]")
+    duration = (rng.exponential(3600, size=rows) + 600).astype("timedelta64[s]")
+    columns["Start_Time"] = np.char.replace(
+        np.datetime_as_string(start, unit="s"), "T", " "
+    ).astype(object)
+    columns["End_Time"] = np.char.replace(
+        np.datetime_as_string(start + duration, unit="s"), "T", " "
+    ).astype(object)
+    columns["Weather_Timestamp"] = np.char.replace(
+        np.datetime_as_string(start.astype("datetime64[h]"), unit="s"), "T", " "
+    ).astype(object)
+
+    names = list(STATES)
+    shares = np.array([STATES[name][0] for name in names])
+    state_idx = rng.choice(len(names), size=rows, p=shares / shares.sum())
+    lat = np.array([STATES[name][1] for name in names])[state_idx]
+    lng = np.array([STATES[name][2] for name in names])[state_idx]
+    lat = lat + rng.normal(0, 1.0, rows)
+    lng = lng + rng.normal(0, 1.5, rows)
+    columns["State"] = np.asarray(names, dtype=object)[state_idx]
+    columns["Timezone"] = np.array(
+        [STATES[name][3] for name in names], dtype=object
+    )[state_idx]
+    # Her eyaletin şehirleri CITY_SLOTS sütunluk tabloya tekrarlanarak yerleşir
+    city_table = np.array(
+        [
+            [CITIES[name][i % len(CITIES[name])] for i in range(CITY_SLOTS)]
+            for name in names
+        ],
+        dtype=object,
+    )
+    columns["City"] = city_table[state_idx, rng.integers(0, CITY_SLOTS, size=rows)]
+    columns["County"] = columns["City"]
+    columns["Zipcode"] = _numbers(rng, rng.integers(10000, 99999, size=rows), "{:05d}")
+    columns["Country"] = np.full(rows, "US", dtype=object)
+    columns["Airport_Code"] = _choice(rng, AIRPORTS, rows)
+
+    columns["Start_Lat"] = _numbers(rng, lat, "{:.6f}")
+    columns["Start_Lng"] = _numbers(rng, lng, "{:.6f}")
+    end_blank = rng.random(rows) < BLANK_RATES["End_Lat"]
+    end_lat = _numbers(rng, lat + rng.normal(0, 0.005, rows), "{:.6f}")
+    end_lng = _numbers(rng, lng + rng.normal(0, 0.005, rows), "{:.6f}")
+    end_lat[end_blank] = ""
+    end_lng[end_blank] = ""
+    columns["End_Lat"] = end_lat
+    columns["End_Lng"] = end_lng
+    columns["Distance(mi)"] = _numbers(rng, rng.exponential(0.56, rows), "{:.3f}")
+
+    streets = _choice(rng, STREETS, rows)
+    templates = _choice(rng, DESCRIPTIONS, rows)
+    multiline = rng.random(rows) < multiline_rate
+    descriptions = []
+    for template, street, broken in zip(templates, streets, multiline):
+        text = template.format(street=street)
+        if broken:
+            text += "\nUpdate: road reopened."
+        descriptions.append(_quote(text))
+    columns["Description"] = np.array(descriptions, dtype=object)
+    columns["Street"] = streets
+
+    temperature = rng.normal(61.7, 19.0, rows)
+    columns["Temperature(F)"] = _numbers(
+        rng, temperature, "{:.1f}", BLANK_RATES["Temperature(F)"]
+    )
+    wind_chill = temperature - rng.exponential(2.0, rows)
+    columns["Wind_Chill(F)"] = _numbers(
+        rng, wind_chill, "{:.1f}", BLANK_RATES["Wind_Chill(F)"]
+    )
+    columns["Humidity(%)"] = _numbers(
+        rng, rng.integers(1, 101, size=rows), "{:d}", BLANK_RATES["Humidity(%)"]
+    )
+    columns["Pressure(in)"] = _numbers(
+        rng, rng.normal(29.54, 1.0, rows), "{:.2f}", BLANK_RATES["Pressure(in)"]
+    )
+    visibility = np.where(rng.random(rows) < 0.8, 10.0, rng.uniform(0, 10, rows))
+    columns["Visibility(mi)"] = _numbers(
+        rng, visibility, "{:.1f}", BLANK_RATES["Visibility(mi)"]
+    )
+    columns["Wind_Direction"] = _choice(rng, WIND_DIRECTIONS, rows)
+    columns["Wind_Speed(mph)"] = _numbers(
+        rng, rng.gamma(2.0, 3.8, rows), "{:.1f}", BLANK_RATES["Wind_Speed(mph)"]
+    )
+    precipitation = np.where(rng.random(rows) < 0.9, 0.0, rng.exponential(0.1, rows))
+    columns["Precipitation(in)"] = _numbers(
+        rng, precipitation, "{:.2f}", BLANK_RATES["Precipitation(in)"]
+    )
+    columns["Weather_Condition"] = _choice(rng, WEATHER[0], rows, WEATHER[1])
+
+    flag_codes = np.zeros(rows, dtype=np.int64)
+    for bit, rate in enumerate(FLAG_RATES.values()):
+        flag_codes |= (rng.random(rows) < rate).astype(np.int64) << bit
+    hour = (start.astype("datetime64[h]") - start.astype("datetime64[D]")).astype(int)
+
+    ordered = [columns[name].tolist() for name in HEADER[:FLAG_START]]
+    ordered.append(FLAG_SEGMENTS[flag_codes].tolist())
+    ordered.append(DAYLIGHT_SEGMENTS[hour].tolist())
+    return "".join(",".join(row) + "\n" for row in zip(*ordered))
+
+
+def _generate(task):
+    chunk, rows, seed, multiline_rate = task
+    return generate_chunk(chunk, rows, seed, multiline_rate).encode("utf-8")
+
+
+def generate(
+    output,
+    rows,
+    seed=DEFAULT_SEED,
+    processes=None,
+    multiline_rate=0.001,
+    client=None,
+):
+    """
+    rows satırlık veri setini (başlık dahil) output'a (yerel dosya, "-" için
+    stdout veya hdfs:// yolu) yaz; yazılan baytları döndür. hdfs:// yolları
+    client ile (varsayılan: get_client()) yazılır.
+    """
+    tasks = [
+        (chunk, min(CHUNK_ROWS, rows - chunk * CHUNK_ROWS), seed, multiline_rate)
+        for chunk in range(-(-rows // CHUNK_ROWS))
+    ]
+    written = 0
+
+    def chunks():
+        nonlocal written
+        header = (",".join(HEADER) + "\n").encode()
+        written += len(header)
+        yield header
+        with multiprocessing.Pool(processes) as pool:
+            # imap sırayı korur; parçalar üretildikçe yazılır
+            for data in pool.imap(_generate, tasks):
+                written += len(data)
+                yield data
+
+    if output.startswith("hdfs://"):
+        (client or get_client()).write(output, chunks())
+    elif output == "-":
+        for data in chunks():
+            sys.stdout.buffer.write(data)
+    else:
+        with open(output, "wb", buffering=16 * 1024 * 1024) as sink:
+            for data in chunks():
+                sink.write(data)
+    return written
+
+
+def parse_arguments():
+    """Komut satırı argümanlarını işle"""
+    parser = argparse.ArgumentParser(
+        description="US Accidents biçiminde tohumlu sentetik veri üretici"
+    )
+    parser.add_argument("--rows", type=int, required=True, help="Satır sayısı")
+    parser.add_argument(
+        "--output", required=True, help="Yerel dosya, hdfs:// yolu veya - (stdout)"
+    )
+    parser.add_argument("--seed", type=int, default=DEFAULT_SEED)
+    parser.add_argument(
+        "--processes",
+        type=int,
+        default=None,
+        help="Süreç sayısı (varsayılan: çekirdek sayısı)",
+    )
+    parser.add_argument(
+        "--multiline-rate",
+        type=float,
+        default=0.001,
+        help="Açıklaması satır sonu içeren kayıtların oranı (0: hiç)",
+    )
+    return parser.parse_args()
+
+
+def main():
+    args = parse_arguments()
+    start_time = time.time()
+    written = generate(
+        args.output, args.rows, args.seed, args.processes, args.multiline_rate
+    )
+    elapsed = time.time() - start_time
+    print(
+        f"{args.rows} satır, {written / 1e6:.1f} MB, {elapsed:.1f} s "
+        f"({written / 1e6 / elapsed:.0f} MB/s)",
+        file=sys.stderr,
+    )
+
+
+if __name__ == "__main__":
+    main()
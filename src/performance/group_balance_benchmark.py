@@ -0,0 +1,184 @@
+#!/usr/bin/env python3
+"""
+Gruplanmış istatistiklerde (ColumnSummary --group-by) reducer yük dengesini
+ölçen kıyaslama.
+
+State gibi gruplarda birkaç anahtar (CA, FL, TX) verinin büyük kısmını
+taşır; Hadoop her anahtarı tek bir reducer'a gönderdiği için bu reducer
+diğerlerini bekletir. İş, aynı yerel CSV örneği üzerinde dört modda süreç
+içinde çalıştırılır:
+  satır başına        : her satır bir kayıt, combiner yok, tuz yok
+  satır başına + tuz  : her satır bir kayıt, anahtar --salt parçaya bölünür
+  mapper içi          : mapper başına grup başına tek kayıt, tuz yok
+  mapper içi + tuz    : mapper içi birleştirme ve iki seviyeli birleştirme
+
+Her mod için reducer'lara düşen en fazla / ortalama kayıt sayısı (dengesizlik
+oranı), en yavaş reducer süresi ve toplam süre raporlanır. Tüm modların
+sonuçlarının aynı olduğu da kontrol edilir.
+
+Örnek:
+  python group_balance_benchmark.py --input US_Accidents.csv --limit 500000 \\
+      --mappers 8 --reducers 8 --group-by State --salt 8
+"""
+import argparse
+import json
+import math
+
+from tabulate import tabulate
+
+from job_profiler import load_job_class, profile_job, read_lines
+
+PER_RECORD = {"flush_every_record": True, "use_combiner": False}
+IN_MAPPER = {"flush_every_record": False, "use_combiner": True}
+
+
+def parse_arguments():
+    """Komut satırı argümanlarını işle"""
+    parser = argparse.ArgumentParser(
+        description="Gruplanmış istatistiklerde reducer yük dengesi kıyaslaması"
+    )
+    parser.add_argument("--input", required=True, help="Yerel CSV dosyası")
+    parser.add_argument(
+        "--limit", type=int, default=None, help="Okunacak en fazla satır sayısı"
+    )
+    parser.add_argument(
+        "--mappers", type=int, default=4, help="Benzetilen mapper sayısı"
+    )
+    parser.add_argument(
+        "--reducers", type=int, default=8, help="Benzetilen reducer sayısı"
+    )
+    parser.add_argument("--columns", default="2,20", help="Sütun indeksleri")
+    parser.add_argument(
+        "--group-by", default="State", choices=["State", "City", "year"]
+    )
+    parser.add_argument(
+        "--salt", type=int, default=8, help="Grup başına reducer anahtarı sayısı"
+    )
+    parser.add_argument("--output", help="Sonuçların yazılacağı JSON dosyası")
+    return parser.parse_args()
+
+
+def modes(salt):
+    """(mod adı, profile_job seçenekleri, tuz) üçlüleri"""
+    return [
+        ("satır başına", PER_RECORD, 1),
+        ("satır başına + tuz", PER_RECORD, salt),
+        ("mapper içi", IN_MAPPER, 1),
+        ("mapper içi + tuz", IN_MAPPER, salt),
+    ]
+
+
+def load_summary(loads):
+    """Bir adımın reducer yüklerinden dengesizlik ölçümlerini çıkar"""
+    records = [load["records"] for load in loads]
+    mean = sum(records) / len(records)
+    return {
+        "max_records": max(records),
+        "mean_records": mean,
+        "imbalance": max(records) / mean if mean else 1.0,
+        "max_reduce_time": max(load["time"] for load in loads),
+    }
+
+
+def same_results(first, second):
+    """
+    İki çalıştırmanın grup istatistikleri (yuvarlama payıyla) aynı mı;
+    veri kalitesi örnek satırları moda göre değiştiği için karşılaştırılmaz
+    """
+    first = {json.dumps(k): v for k, v in first if k != "data_quality"}
+    second = {json.dumps(k): v for k, v in second if k != "data_quality"}
+    if first.keys() != second.keys():
+        return False
+    for key, stats in first.items():
+        other = second[key]
+        for name, value in stats.items():
+            if isinstance(value, float):
+                if not math.isclose(value, other[name], rel_tol=1e-6, abs_tol=1e-9):
+                    return False
+            elif value != other.get(name):
+                return False
+    return True
+
+
+def run_benchmark(lines, args):
+    """Her mod için reducer yüklerini ve süreleri topla"""
+    job_class = load_job_class("column_summary.py")
+    results = {}
+    reference = None
+
+    for mode, options, salt in modes(args.salt):
+        job = job_class(
+            [
+                "--columns",
+                args.columns,
+                "--group-by",
+                args.group_by,
+                "--salt",
+                str(salt),
+            ]
+        )
+        stats = profile_job(
+            job, lines, mappers=args.mappers, reducers=args.reducers, **options
+        )
+        output = [list(pair) for pair in stats.pop("output")]
+        stats.pop("counters")
+        if reference is None:
+            reference = output
+        stats["matches_reference"] = same_results(reference, output)
+        stats["groups"] = len({json.dumps(key) for key, _ in output})
+        # Darboğaz ilk adımdadır: tüm kayıtlar grup anahtarlarına göre dağılır
+        stats["balance"] = load_summary(stats["reducer_loads"][0])
+        results[mode] = stats
+
+    return results
+
+
+def print_report(results):
+    """Modları reducer yük dengesine göre karşılaştıran tablo yazdır"""
+    headers = [
+        "Mod",
+        "Shuffle kaydı",
+        "Shuffle (bayt)",
+        "En yüklü reducer",
+        "Ortalama",
+        "Dengesizlik",
+        "En yavaş reduce (s)",
+        "Toplam süre (s)",
+        "Sonuç aynı",
+    ]
+    report = []
+
+    for mode, stats in results.items():
+        balance = stats["balance"]
+        report.append(
+            [
+                mode,
+                stats["shuffle_records"],
+                stats["shuffle_bytes"],
+                balance["max_records"],
+                f"{balance['mean_records']:.0f}",
+                f"{balance['imbalance']:.2f}x",
+                f"{balance['max_reduce_time']:.4f}",
+                f"{stats['wall_time']:.3f}",
+                "evet" if stats["matches_reference"] else "HAYIR",
+            ]
+        )
+
+    print(tabulate(report, headers=headers, tablefmt="grid"))
+
+
+def main():
+    args = parse_arguments()
+    lines = read_lines(args.input, args.limit)
+
+    results = run_benchmark(lines, args)
+    print_report(results)
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2, ensure_ascii=False)
+        print(f"\nSonuçlar kaydedildi: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
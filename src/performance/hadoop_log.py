@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""
+mrjob/Hadoop Streaming stderr çıktısını satır satır çözümleyen yardımcılar.
+
+Hadoop runner çalışırken şu satırları yazar:
+  Running step 1 of 2...
+    Submitted application application_1589000000000_0001
+     map 45% reduce 0%
+  Counters: 49
+          Map-Reduce Framework
+                  Map input records=7728394
+
+JobLog bu satırlardan adım bilgisini, map/reduce yüzdelerini, YARN uygulama
+kimliğini (iptal için) ve iş bittiğinde sayaçları çıkarır; GUI ilerleme
+çubuğu ve değerlendirme raporları bunu kullanır. Reducer'sız adımlar
+(MinMax transform, sample_rows.py) "reduce 0%" yazmaya devam eder; bu
+adımlar map_only_steps ile verilirse ilerleme yalnızca map yüzdesinden
+hesaplanır, verilmezse adım bittiğinde tamamlanmış sayılır.
+"""
+import re
+
+STEP_RE = re.compile(r"Running step (\d+) of (\d+)")
+PROGRESS_RE = re.compile(r"map\s+(\d+)%\s+reduce\s+(\d+)%")
+APPLICATION_RE = re.compile(r"\b(application_\d+_\d+)")
+JOB_RE = re.compile(r"\bjob_(\d+_\d+)")
+COUNTERS_RE = re.compile(r"^\s*Counters: \d+")
+COMPLETED_RE = re.compile(r"\bJob job_\d+_\d+ completed successfully")
+
+
+class JobLog:
+    """Bir işin stderr satırlarından çıkarılan ilerleme durumu ve sayaçlar"""
+
+    def __init__(self, map_only_steps=()):
+        # Reducer'sız adımlar (1'den başlar); ilerlemeleri yalnızca map yüzdesi
+        self.map_only_steps = set(map_only_steps)
+        self.step = 1
+        self.steps = 1
+        self.map_percent = 0
+        self.reduce_percent = 0
+        # Şu an çalışan adımın YARN uygulaması (iptal için)
+        self.application_id = None
+        # {grup: {sayaç: değer}}; birden fazla adımın sayaçları toplanır
+        self.counters = {}
+        self._in_counters = False
+        self._group = None
+
+    def feed(self, line):
+        """Bir stderr satırını işle; ilerleme değiştiyse True döndür"""
+        line = line.rstrip("\n")
+
+        if self._in_counters:
+            if line[:1].isspace() and line.strip():
+                self._parse_counter(line)
+                return False
+            self._in_counters = False
+
+        if COUNTERS_RE.match(line):
+            self._in_counters = True
+            self._group = None
+            return False
+
+        match = STEP_RE.search(line)
+        if match:
+            self.step, self.steps = int(match.group(1)), int(match.group(2))
+            self.map_percent = self.reduce_percent = 0
+            # Her adım ayrı bir YARN uygulamasıdır
+            self.application_id = None
+            return True
+
+        match = PROGRESS_RE.search(line)
+        if match:
+            self.map_percent = int(match.group(1))
+            self.reduce_percent = int(match.group(2))
+            return True
+
+        if COMPLETED_RE.search(line):
+            # Reducer'sız adımlar da bitince tamamlanmış sayılır
+            self.map_percent = self.reduce_percent = 100
+            return True
+
+        match = APPLICATION_RE.search(line)
+        if match:
+            self.application_id = match.group(1)
+        elif self.application_id is None:
+            match = JOB_RE.search(line)
+            if match:
+                # job_<küme zamanı>_<sıra> işinin YARN uygulaması aynı sonekli
+                self.application_id = f"application_{match.group(1)}"
+        return False
+
+    def _parse_counter(self, line):
+        text = line.strip()
+        if "=" not in text:
+            self._group = text
+            return
+        name, _, value = text.rpartition("=")
+        try:
+            value = int(value)
+        except ValueError:
+            return
+        group = self.counters.setdefault(self._group or "", {})
+        group[name] = group.get(name, 0) + value
+
+    @property
+    def fraction(self):
+        """Tüm adımlar üzerinden tamamlanma oranı (0..1)"""
+        if self.step in self.map_only_steps:
+            step_fraction = self.map_percent / 100
+        else:
+            step_fraction = (self.map_percent + self.reduce_percent) / 200
+        return min(1.0, (self.step - 1 + step_fraction) / self.steps)
+
+    def counter(self, name, default=None):
+        """Grubundan bağımsız olarak bir sayacın değeri"""
+        for group in self.counters.values():
+            if name in group:
+                return group[name]
+        return default
+
+
+def parse_log(text):
+    """Tamamlanmış bir işin stderr metnini çözümle"""
+    log = JobLog()
+    for line in text.splitlines():
+        log.feed(line)
+    return log
@@ -0,0 +1,194 @@
+#!/usr/bin/env python3
+"""
+mrjob işlerini Hadoop olmadan, süreç içinde adım adım çalıştıran yardımcılar.
+
+Her adım Hadoop'taki gibi işlenir: girdi N mapper'a bölünür, mapper çıktısı
+işin ara protokolüyle serileştirilir, (varsa) combiner her mapper'ın çıktısına
+uygulanır, kayıtlar anahtara göre sıralanıp reducer'a gruplanarak verilir.
+Böylece shuffle'a giren kayıt ve bayt sayıları ile faz süreleri ölçülebilir.
+"""
+import importlib
+import itertools
+import sys
+import time
+import zlib
+from pathlib import Path
+
+mapreduce_dir = Path(__file__).parent.resolve().parent / "mapreduce"
+
+JOB_CLASSES = {
+    "mean_value.py": "MeanValue",
+    "max_value.py": "MaxValue",
+    "stddev_value.py": "StdDevValue",
+    "minmax_normalization.py": "MinMaxNormalization",
+    "skewness.py": "SkewnessSeverity",
+    "column_summary.py": "ColumnSummary",
+    "percentiles.py": "Percentiles",
+    "value_histogram.py": "ValueHistogram",
+}
+
+
+def load_job_class(script_name):
+    """src/mapreduce altındaki bir iş betiğinin MRJob sınıfını yükle"""
+    if str(mapreduce_dir) not in sys.path:
+        sys.path.insert(0, str(mapreduce_dir))
+    module = importlib.import_module(Path(script_name).stem)
+    return getattr(module, JOB_CLASSES[Path(script_name).name])
+
+
+def read_lines(path, limit=None):
+    """Yerel bir CSV dosyasının satırlarını (satır sonu olmadan) oku"""
+    with open(path, encoding="utf-8", errors="replace") as f:
+        return [line.rstrip("\r\n") for line in itertools.islice(f, limit)]
+
+
+def split_evenly(items, parts):
+    """Listeyi ardışık ve yaklaşık eşit parçalara böl (input split benzetimi)"""
+    size = max(1, -(-len(items) // max(1, parts)))
+    return [items[i : i + size] for i in range(0, len(items), size)] or [[]]
+
+
+def _call(handler, *args):
+    return handler(*args) or ()
+
+
+def _run_mapper(job, step, pairs, flush_every_record):
+    init = step["mapper_init"]
+    mapper = step["mapper"]
+    final = step["mapper_final"]
+    output = []
+
+    if init:
+        init()
+    for key, value in pairs:
+        if mapper:
+            output.extend(_call(mapper, key, value))
+        else:
+            output.append((key, value))
+
+        if flush_every_record and final:
+            # Mapper içi birleştirme olmadan, her satır için bir kayıt üretilir
+            output.extend(_call(final))
+            if init:
+                init()
+    if final:
+        output.extend(_call(final))
+
+    return output
+
+
+def _grouped(encoded, protocol, stats):
+    """Kodlanmış kayıtları Hadoop shuffle'ı gibi sıralayıp anahtara göre grupla"""
+    lines = sorted(encoded)
+    t0 = time.perf_counter()
+    decoded = [protocol.read(line) for line in lines]
+    stats["decode_time"] += time.perf_counter() - t0
+    for key, pairs in itertools.groupby(decoded, key=lambda pair: pair[0]):
+        yield key, [value for _, value in pairs]
+
+
+def _parse_counters(stderr_bytes):
+    counters = {}
+    for line in stderr_bytes.decode("utf-8", "replace").splitlines():
+        if line.startswith("reporter:counter:"):
+            group, counter, amount = line[len("reporter:counter:") :].rsplit(",", 2)
+            group_counters = counters.setdefault(group, {})
+            group_counters[counter] = group_counters.get(counter, 0) + int(amount)
+    return counters
+
+
+def _partition(encoded, reducers):
+    """Kayıtları anahtarın özetine göre reducer'lara dağıt (HashPartitioner gibi)"""
+    partitions = [[] for _ in range(reducers)]
+    for line in encoded:
+        key = line.split(b"\t", 1)[0]
+        partitions[zlib.crc32(key) % reducers].append(line)
+    return partitions
+
+
+def profile_job(
+    job, lines, mappers=1, flush_every_record=False, use_combiner=True, reducers=1
+):
+    """
+    İşi verilen satırlar üzerinde süreç içinde çalıştır ve faz ölçümlerini döndür.
+
+    flush_every_record=True, mapper içi birleştirmeyi kapatıp her satır için
+    mapper_final çağırır (eski, satır başına kayıt üreten davranış).
+    reducers > 1 olduğunda kayıtlar anahtara göre reducer'lara bölünür ve
+    her adımın reducer başına kayıt sayısı ve süresi "reducer_loads" altında
+    raporlanır (yük dengesi ölçümü). encode_time/decode_time, ara protokolün
+    kayıtları yazma/okuma süresidir (map/combine/shuffle sürelerine dahildir).
+    """
+    job.sandbox()
+    protocol = job.internal_protocol()
+    stats = {
+        "input_records": len(lines),
+        "map_time": 0.0,
+        "combine_time": 0.0,
+        "shuffle_time": 0.0,
+        "reduce_time": 0.0,
+        "map_output_records": 0,
+        "map_output_bytes": 0,
+        "shuffle_records": 0,
+        "shuffle_bytes": 0,
+        "encode_time": 0.0,
+        "decode_time": 0.0,
+        "reducer_loads": [],
+    }
+
+    step_input = [(None, line) for line in lines]
+    start_time = time.perf_counter()
+
+    for step in job.steps():
+        shuffled = []
+
+        for chunk in split_evenly(step_input, mappers):
+            t0 = time.perf_counter()
+            mapped = _run_mapper(job, step, chunk, flush_every_record)
+            t1 = time.perf_counter()
+            encoded = [protocol.write(key, value) for key, value in mapped]
+            stats["encode_time"] += time.perf_counter() - t1
+            stats["map_time"] += time.perf_counter() - t0
+            stats["map_output_records"] += len(encoded)
+            stats["map_output_bytes"] += sum(len(line) + 1 for line in encoded)
+
+            if step["combiner"] and use_combiner and step["reducer"]:
+                t0 = time.perf_counter()
+                combined = []
+                for key, values in _grouped(encoded, protocol, stats):
+                    combined.extend(_call(step["combiner"], key, values))
+                t1 = time.perf_counter()
+                encoded = [protocol.write(key, value) for key, value in combined]
+                stats["encode_time"] += time.perf_counter() - t1
+                stats["combine_time"] += time.perf_counter() - t0
+
+            shuffled.extend(encoded)
+
+        if not step["reducer"]:
+            # Sadece map adımı: çıktı doğrudan yazılır, shuffle yoktur
+            step_input = [protocol.read(line) for line in shuffled]
+            continue
+
+        stats["shuffle_records"] += len(shuffled)
+        stats["shuffle_bytes"] += sum(len(line) + 1 for line in shuffled)
+
+        step_input = []
+        loads = []
+        for partition in _partition(shuffled, reducers):
+            t0 = time.perf_counter()
+            groups = list(_grouped(partition, protocol, stats))
+            stats["shuffle_time"] += time.perf_counter() - t0
+
+            t0 = time.perf_counter()
+            for key, values in groups:
+                step_input.extend(_call(step["reducer"], key, values))
+            reduce_time = time.perf_counter() - t0
+            stats["reduce_time"] += reduce_time
+            loads.append({"records": len(partition), "time": reduce_time})
+        stats["reducer_loads"].append(loads)
+
+    stats["wall_time"] = time.perf_counter() - start_time
+    stats["records_per_sec"] = len(lines) / stats["wall_time"] if lines else 0.0
+    stats["counters"] = _parse_counters(job.stderr.getvalue())
+    stats["output"] = step_input
+    return stats
@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+"""
+Mapper satır ayrıştırma mikro kıyaslaması.
+
+Eski yol (her satır için yeni bir csv.reader ve 46 alanın tamamını bölmek)
+ile csv_fields modülündeki hızlı yol, her işin sütun erişim deseni için
+saniyede işlenen satır sayısı olarak karşılaştırılır.
+
+Örnek:
+  python parse_benchmark.py --input US_Accidents.csv --limit 500000
+"""
+import argparse
+import csv
+import sys
+import time
+from pathlib import Path
+
+from tabulate import tabulate
+
+sys.path.insert(0, str(Path(__file__).parent.resolve().parent / "mapreduce"))
+from csv_fields import field_reader, fields_reader, to_float, to_int  # noqa: E402
+from job_profiler import read_lines  # noqa: E402
+
+
+def parse_arguments():
+    """Komut satırı argümanlarını işle"""
+    parser = argparse.ArgumentParser(description="CSV ayrıştırma mikro kıyaslaması")
+    parser.add_argument("--input", required=True, help="Yerel CSV dosyası")
+    parser.add_argument(
+        "--limit", type=int, default=None, help="Okunacak en fazla satır sayısı"
+    )
+    parser.add_argument(
+        "--repeat", type=int, default=3, help="Her ölçüm için tekrar sayısı"
+    )
+    return parser.parse_args()
+
+
+def old_single(index, convert):
+    def parse(line):
+        try:
+            return convert(next(csv.reader([line]))[index])
+        except Exception:
+            return None
+
+    return parse
+
+
+def new_single(index, convert):
+    read = field_reader(index)
+
+    def parse(line):
+        try:
+            return convert(read(line))
+        except ValueError:
+            return None
+
+    return parse
+
+
+def old_multi(indices):
+    def parse(line):
+        row = next(csv.reader([line]))
+        values = []
+        for idx in indices:
+            try:
+                values.append(float(row[idx]))
+            except (ValueError, IndexError):
+                values.append(None)
+        return values
+
+    return parse
+
+
+def new_multi(indices):
+    read = fields_reader(indices)
+
+    def parse(line):
+        values = []
+        for value in read(line):
+            try:
+                values.append(to_float(value))
+            except ValueError:
+                values.append(None)
+        return values
+
+    return parse
+
+
+# Mapper adı -> (eski ayrıştırıcı, yeni ayrıştırıcı)
+PARSERS = {
+    "MeanValue / MaxValue (sütun 2, int)": (
+        old_single(2, int),
+        new_single(2, to_int),
+    ),
+    "StdDevValue / SkewnessSeverity (sütun 2, float)": (
+        old_single(2, float),
+        new_single(2, to_float),
+    ),
+    "MinMaxNormalization (sütun 9, float)": (
+        old_single(9, float),
+        new_single(9, to_float),
+    ),
+    "MinMaxNormalization (sütun 20, float)": (
+        old_single(20, float),
+        new_single(20, to_float),
+    ),
+    "ColumnSummary (sütun 2,9,20,24)": (
+        old_multi([2, 9, 20, 24]),
+        new_multi([2, 9, 20, 24]),
+    ),
+}
+
+
+def lines_per_second(parse, lines, repeat):
+    """En iyi tekrarın saniyedeki satır sayısı"""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for line in lines:
+            parse(line)
+        best = min(best, time.perf_counter() - start)
+    return len(lines) / best
+
+
+def main():
+    args = parse_arguments()
+    lines = read_lines(args.input, args.limit)[1:]
+    quoted = sum(1 for line in lines if '"' in line)
+    print(f"{len(lines)} satır, {quoted} tanesi tırnak içeriyor\n")
+
+    report = []
+    for name, (old_parse, new_parse) in PARSERS.items():
+        old_rate = lines_per_second(old_parse, lines, args.repeat)
+        new_rate = lines_per_second(new_parse, lines, args.repeat)
+        report.append(
+            [
+                name,
+                f"{old_rate:,.0f}",
+                f"{new_rate:,.0f}",
+                f"{new_rate / old_rate:.2f}x",
+            ]
+        )
+
+    headers = ["Mapper", "Önce (satır/s)", "Sonra (satır/s)", "Hızlanma"]
+    print(tabulate(report, headers=headers, tablefmt="grid"))
+
+
+if __name__ == "__main__":
+    main()
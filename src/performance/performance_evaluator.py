@@ -5,11 +5,49 @@ import argparse
 import matplotlib.pyplot as plt
 import numpy as np
 import json
+import math
+import getpass
+import os
+import posixpath
+import random
+import statistics
+import sys
+import threading
 from tabulate import tabulate
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from pathlib import Path
 
 script_dir = Path(__file__).parent.resolve()
+sys.path.insert(0, str(script_dir.parent / "storage"))
+sys.path.insert(0, str(script_dir.parent / "mapreduce"))
+from compression import compress_file, strip_codec, with_codec  # noqa: E402
+from hdfs_client import get_client, hdfs_path  # noqa: E402
+from result_cache import ResultCache  # noqa: E402
+from sampling import DEFAULT_SEED, fraction_name, sample_file  # noqa: E402
+from data_generator import generate  # noqa: E402
+from hadoop_log import parse_log  # noqa: E402
+
+# --use-cache ile sonuçlar arayüzün önbelleğine yazılır; tüm çalıştırmalar
+# süre ölçtüğünden önbellekten okunmaz
+result_cache = None
+# Dosya boyutu/varlık sorguları WebHDFS ile; --hdfs-url ile değiştirilebilir
+hdfs = None
+engine_script = f"{script_dir}/../engine/local_engine.py"
+
+# MapReduce işi -> yerel NumPy motorundaki karşılığı
+LOCAL_STATS = {
+    "mean_value.py": "mean",
+    "max_value.py": "max",
+    "stddev_value.py": "stddev",
+    "minmax_normalization.py": "minmax",
+    "skewness.py": "skewness",
+    "column_summary.py": "summary",
+}
+
+# Eşzamanlı çalıştırmaların çıktıları ve ortak sonuç yapısı için
+print_lock = threading.Lock()
+state_lock = threading.Lock()
 
 
 def parse_arguments():
@@ -32,120 +70,674 @@ def parse_arguments():
         default="0.1,0.5,1.0",
         help="Test edilecek veri setinin boyut oranları (virgülle ayrılmış)",
     )
+    parser.add_argument(
+        "--synthetic-rows",
+        type=int,
+        help="--input yoksa bu kadar satırlık sentetik veri üretip HDFS'e yaz",
+    )
+    parser.add_argument(
+        "--sample-seed",
+        type=int,
+        default=DEFAULT_SEED,
+        help="Örnekleme tohumu (aynı tohum aynı satırları seçer)",
+    )
+    parser.add_argument(
+        "--sample-stratify",
+        choices=["none", "State", "year"],
+        default="none",
+        help="Örneklerde her eyaletin/yılın payını birebir koru",
+    )
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=1,
+        help="Aynı anda çalıştırılacak en fazla iş sayısı",
+    )
+    parser.add_argument(
+        "--warmup",
+        type=int,
+        default=0,
+        help="İş ve boyut başına istatistiklere katılmayan ısınma çalıştırması",
+    )
+    parser.add_argument(
+        "--order-seed",
+        type=int,
+        default=None,
+        help="Rastgele çalıştırma sırasının tohumu (varsayılan: her seferinde farklı)",
+    )
+    parser.add_argument(
+        "--columns",
+        default="2",
+        help="Birleşik özet işinin tek taramada analiz edeceği sütunlar",
+    )
+    parser.add_argument(
+        "--fused-only",
+        action="store_true",
+        help="Beş ayrı iş yerine yalnızca birleşik özet işini çalıştır",
+    )
+    parser.add_argument(
+        "--check-splits",
+        type=str,
+        help="Sonuçların split sayısından bağımsız olduğunu doğrula (örn. 1,8,32)",
+    )
+    parser.add_argument(
+        "--check-codecs",
+        type=str,
+        help="Girdiyi bu codec'lerle sıkıştırıp okunan/shuffle baytlarını ve "
+        "süreyi karşılaştır (örn. none,gzip,bz2)",
+    )
+    parser.add_argument(
+        "--map-output-codecs",
+        default="none",
+        help="--check-codecs ile denenecek map çıktısı codec'leri (örn. none,snappy)",
+    )
+    parser.add_argument(
+        "--engine",
+        choices=["hadoop", "local", "both"],
+        default="hadoop",
+        help="Hadoop MapReduce, yerel NumPy motoru (taban çizgisi) veya ikisi",
+    )
+    parser.add_argument(
+        "--check-engines",
+        action="store_true",
+        help="Yerel motorun MapReduce işleriyle aynı sonucu verdiğini doğrula",
+    )
+    parser.add_argument(
+        "--use-cache",
+        action="store_true",
+        help="Sonuçları arayüzün önbelleğine yaz (ölçümler her zaman işi çalıştırır)",
+    )
+    parser.add_argument(
+        "--cache-hdfs-dir",
+        help="Önbelleğin ayrıca saklanacağı HDFS dizini (örn. /user/student/cache)",
+    )
+    parser.add_argument(
+        "--hdfs-url",
+        help="WebHDFS adresi (örn. http://namenode:9870) veya file:// yerel kök "
+        "(varsayılan: HDFS_URL ortam değişkeni)",
+    )
     return parser.parse_args()
 
 
+def get_hdfs_file_size(path):
+    """HDFS'deki dosyanın bayt cinsinden boyutunu döndür"""
+    return hdfs.status(path)["length"]
+
+
 def check_hdfs_file_exists(path):
     """HDFS'de dosyanın var olup olmadığını kontrol et"""
-    cmd = f"hadoop fs -test -e {path}; echo $?"
-    result = subprocess.run(
-        cmd, shell=True, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True
-    )
-    return result.stdout.strip() == "0"
+    return hdfs.exists(path)
+
+
+def absolute_hdfs_path(path):
+    """
+    --input yolunun mutlak hali; göreli yollar "hadoop fs" gibi kullanıcının
+    ev dizinine (/user/<kullanıcı>) göre çözülür
+    """
+    if path.startswith("hdfs://"):
+        return hdfs_path(path)
+    if not path.startswith("/"):
+        user = os.environ.get("HADOOP_USER_NAME") or getpass.getuser()
+        path = posixpath.join("/user", user, path)
+    return path
+
+
+def generate_input(path, rows, seed):
+    """
+    Sentetik veriyi önce geçici bir dosyaya üret, yalnızca başarıyla
+    bitince path'e taşı; yarıda kalan bir üretim sonraki çalıştırmalarda
+    tam veri seti sanılmaz
+    """
+    directory, name = posixpath.split(path)
+    # "_" ile başlayan dosyaları Hadoop girdi listelerinde atlar
+    temp_path = posixpath.join(directory, f"_{name}.generating")
+    try:
+        generate(f"hdfs://{temp_path}", rows, seed, client=hdfs)
+        hdfs.rename(temp_path, path)
+    except BaseException:
+        hdfs.delete(temp_path)
+        raise
+
 
+def sample_path(size):
+    """Bir örnek oranının HDFS yolu"""
+    return f"/user/student/us-accidents/data/sample_{fraction_name(size)}_data.csv"
 
-def create_sample_datasets(input_path, sample_sizes):
-    """Farklı boyutlarda örnek veri setleri oluştur"""
+
+def create_sample_datasets(input_path, sample_sizes, seed=DEFAULT_SEED, stratify=None):
+    """
+    Farklı boyutlarda örnek veri setleri oluştur. Eksik örneklerin hepsi
+    girdinin tek bir okumasında, satır kimliğinin tohumlu özetiyle seçilir
+    (dosyanın başı değil, tüm yıllar temsil edilir); başlık satırı korunur.
+    """
     samples = {}
+    outputs = {}
+    # Örneklerin varlığı WebHDFS'e aynı anda sorulur
+    exists = {
+        size: hdfs.submit(check_hdfs_file_exists, sample_path(size))
+        for size in sample_sizes
+        if size < 1.0
+    }
 
     for size in sample_sizes:
-        size_str = str(size).replace(".", "_")
-        output_path = f"/user/student/us-accidents/data/sample_{size_str}_data.csv"
+        if size >= 1.0:
+            # Tam veri seti için kopya oluşturmaya gerek yok
+            samples[size] = input_path
+            continue
 
-        if check_hdfs_file_exists(output_path):
+        output_path = sample_path(size)
+        if exists[size].result():
             print(f"{output_path} zaten mevcut, atlanıyor...")
             samples[size] = output_path
             continue
+        outputs[size] = output_path
 
-        cmd = f"hadoop fs -cat {input_path} 2>/dev/null | wc -l"
-        try:
-            total_lines = int(subprocess.check_output(cmd, shell=True).decode().strip())
-            sample_lines = int(total_lines * size) + 1
+    if not outputs:
+        return samples
 
-            cmd = f"hadoop fs -cat {input_path} 2>/dev/null | head -n {sample_lines} | hadoop fs -put - {output_path} 2>/dev/null"
-            subprocess.run(cmd, shell=True, check=True)
-            samples[size] = output_path
-            print(
-                f"Oluşturuldu: {output_path} ({sample_lines} satır, orijinal verinin %{size * 100}'i)"
-            )
-        except subprocess.CalledProcessError as e:
-            print(f"Hata: {e.stderr.decode() if e.stderr else str(e)}")
-            continue
+    try:
+        counts = sample_file(
+            f"hdfs://{input_path}",
+            {size: f"hdfs://{path}" for size, path in outputs.items()},
+            seed,
+            stratify,
+        )
+    except subprocess.CalledProcessError as e:
+        print(f"Hata: {e}")
+        return samples
+
+    for size, output_path in outputs.items():
+        samples[size] = output_path
+        print(
+            f"Oluşturuldu: {output_path} ({counts[size]} satır, "
+            f"orijinal verinin %{size * 100:g}'i)"
+        )
 
     return samples
 
 
-def run_mapreduce_job(script_path, input_path, iteration, total_iterations):
-    """MapReduce işini çalıştır ve süresini ölç"""
-    print(f"\n{'=' * 50}")
-    print(f"İterasyon {iteration}/{total_iterations} çalıştırılıyor...")
-    print(f"Script: {script_path}")
-    print(f"Input: {input_path}")
+def execute_job(script_path, input_path, job_args=(), engine="hadoop"):
+    """
+    İşi Hadoop üzerinde ya da yerel NumPy motorunda çalıştır;
+    (süre, tamamlanmış süreç) döndür
+    """
+    cache_key = None
+    if result_cache:
+        try:
+            cache_key, cache_meta = result_cache.make_key(
+                input_path, Path(script_path).name, job_args, engine
+            )
+        except OSError:
+            cache_key = None
 
     start_time = time.time()
-
-    cmd = f"python {script_path} -r hadoop hdfs://{input_path}"
+    if engine == "local":
+        stat = LOCAL_STATS[Path(script_path).name]
+        cmd = (
+            f"python {engine_script} hdfs://{input_path} --stat {stat} "
+            f"{' '.join(job_args)}"
+        )
+    else:
+        cmd = f"python {script_path} -r hadoop hdfs://{input_path} {' '.join(job_args)}"
     process = subprocess.run(
         cmd, shell=True, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True
     )
-
     elapsed_time = time.time() - start_time
 
-    if process.returncode != 0:
-        print(f"! HATA ! Kod: {process.returncode}")
-        print("Çıktı:", process.stdout)
-        print("Hata:", process.stderr)
-        return None
+    if cache_key and process.returncode == 0:
+        result_cache.put(cache_key, process.stdout, cache_meta)
 
-    print(f"Başarıyla tamamlandı. Süre: {elapsed_time:.2f} saniye")
+    return elapsed_time, process
+
+
+def run_mapreduce_job(script_path, input_path, label, job_args=(), engine="hadoop"):
+    """MapReduce işini çalıştır ve süresini ölç (hata durumunda None)"""
+    with print_lock:
+        print(f"Başladı: {label} - {input_path} ({engine})")
+
+    elapsed_time, process = execute_job(script_path, input_path, job_args, engine)
+
+    with print_lock:
+        if process.returncode != 0:
+            print(f"! HATA ! {label} Kod: {process.returncode}")
+            print("Çıktı:", process.stdout)
+            print("Hata:", process.stderr)
+            return None
+        print(f"Tamamlandı: {label} - {elapsed_time:.2f} saniye")
     return elapsed_time
 
 
-def evaluate_performance(sample_datasets, iterations=3):
-    """Performans değerlendirmesi yap"""
+def get_scripts(columns="2", fused_only=False):
+    """Değerlendirilecek işler ve işe özel argümanlar"""
+    summary_script = f"{script_dir}/../mapreduce/column_summary.py"
+    minmax_script = f"{script_dir}/../mapreduce/minmax_normalization.py"
     scripts = {
         f"{script_dir}/../mapreduce/mean_value.py": "Ortalama",
         f"{script_dir}/../mapreduce/max_value.py": "Maksimum",
         f"{script_dir}/../mapreduce/stddev_value.py": "Standart Sapma",
-        f"{script_dir}/../mapreduce/minmax_normalization.py": "Min-Max Normalizasyon",
+        minmax_script: "Min-Max Normalizasyon",
         f"{script_dir}/../mapreduce/skewness.py": "Çarpıklık",
+        summary_script: "Birleşik Özet (Tek Tarama)",
     }
+    if fused_only:
+        scripts = {summary_script: scripts[summary_script]}
+
+    # Tek sütunlu işlere varsayılan sütunları açıkça verilir; önbellek
+    # anahtarı GUI'nin aynı istekteki anahtarıyla eşleşir
+    script_args = {script: ["--column", "2"] for script in scripts}
+    if minmax_script in scripts:
+        script_args[minmax_script] = ["--column", "9"]
+    # Birleşik iş tüm sütunları tek taramada işler
+    script_args[summary_script] = ["--columns", columns]
+
+    return scripts, script_args
+
+
+def schedule_runs(jobs, sample_datasets, iterations, warmup=0, order_seed=None):
+    """
+    Çalıştırma listesi: önce ısınma çalıştırmaları, ardından ölçülen
+    çalıştırmalar rastgele sırada (küme durumundaki değişimler, örn. önbellek
+    ısınması veya diğer kullanıcılar, tek bir işe ya da boyuta yığılmaz)
+    """
+    warmups = []
+    runs = []
+    for job in jobs:
+        for size, path in sample_datasets.items():
+            warmups.extend([(False, *job, size, path)] * warmup)
+            runs.extend([(True, *job, size, path)] * iterations)
+    random.Random(order_seed).shuffle(runs)
+    return warmups + runs
+
+
+def record_run(results, result_key, description, size, duration, overlap):
+    """Ölçülen bir çalıştırmayı sonuçlara ekle ve istatistikleri güncelle"""
+    entry = results.setdefault(
+        result_key, {"description": description, "results": {}}
+    )
+    metrics = entry["results"].setdefault(size, {"times": [], "overlaps": []})
+    metrics["times"].append(duration)
+    # Bu çalıştırmayla zaman olarak çakışan diğer çalıştırmaların sayısı
+    metrics["overlaps"].append(overlap)
+
+    times = metrics["times"]
+    solo = [t for t, o in zip(times, metrics["overlaps"]) if o == 0]
+    metrics.update(
+        {
+            "average": sum(times) / len(times),
+            "min": min(times),
+            "max": max(times),
+            "solo_average": sum(solo) / len(solo) if solo else None,
+            "last_run": datetime.now().isoformat(),
+        }
+    )
 
+
+def write_results(results, output_file):
+    """Ara sonuçları yarım dosya bırakmadan (atomik olarak) yaz"""
+    tmp_path = f"{output_file}.tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(results, f, indent=2, ensure_ascii=False)
+    os.replace(tmp_path, output_file)
+
+
+def evaluate_performance(
+    sample_datasets,
+    iterations=3,
+    columns="2",
+    fused_only=False,
+    engines=("hadoop",),
+    concurrency=1,
+    warmup=0,
+    order_seed=None,
+    output_file=None,
+):
+    """
+    Performans değerlendirmesi yap: çalıştırmalar en fazla concurrency
+    eşzamanlı iş ile yürütülür ve her ölçümden sonra sonuçlar output_file'a
+    yazılır (yarıda kalan uzun değerlendirmeler kaybolmaz)
+    """
+    scripts, script_args = get_scripts(columns, fused_only)
     results = {}
 
-    for script_name, script_desc in scripts.items():
-        script_results = {}
-        print(f"\n{'#' * 50}")
-        print(f"## {script_desc} fonksiyonu için performans testi")
-        print(f"{'#' * 50}")
+    jobs = []
+    for engine in engines:
+        for script_name, script_desc in scripts.items():
+            if engine == "local":
+                # Yerel motor, aynı işin tek düğümlü taban çizgisi olarak raporlanır
+                desc = f"{script_desc} (Yerel NumPy)"
+                jobs.append((f"{script_name}:local", script_name, engine, desc))
+            else:
+                jobs.append((script_name, script_name, engine, script_desc))
+
+    runs = schedule_runs(jobs, sample_datasets, iterations, warmup, order_seed)
+    # Çakışma hesabı için: biten çalıştırmaların aralıkları ve süren çalıştırmalar
+    intervals = []
+    active = {}
+
+    def execute(index, run):
+        measured, result_key, script_name, engine, script_desc, size, path = run
+        kind = "ölçüm" if measured else "ısınma"
+        label = f"[{index + 1}/{len(runs)} {kind}] {script_desc} %{size * 100:g}"
+
+        with state_lock:
+            active[index] = time.time()
+        duration = run_mapreduce_job(
+            script_name, path, label, script_args.get(script_name, ()), engine
+        )
+
+        with state_lock:
+            start = active.pop(index)
+            end = time.time()
+            overlap = sum(1 for s, e in intervals if e > start) + sum(
+                1 for s in active.values() if s < end
+            )
+            intervals.append((start, end))
+
+            if measured and duration is not None:
+                record_run(results, result_key, script_desc, size, duration, overlap)
+                if output_file:
+                    write_results(results, output_file)
+
+    with ThreadPoolExecutor(max_workers=max(1, concurrency)) as executor:
+        # Isınma çalıştırmaları ölçümlerden önce tamamlanır
+        warmups = [i for i, run in enumerate(runs) if not run[0]]
+        for future in [executor.submit(execute, i, runs[i]) for i in warmups]:
+            future.result()
+        measured = [i for i, run in enumerate(runs) if run[0]]
+        for future in [executor.submit(execute, i, runs[i]) for i in measured]:
+            future.result()
 
-        for size, path in sample_datasets.items():
-            times = []
-            print(f"\nBoyut: %{size * 100} - {path}")
-
-            for i in range(1, iterations + 1):
-                duration = run_mapreduce_job(script_name, path, i, iterations)
-                if duration is not None:
-                    times.append(duration)
-
-            if times:
-                script_results[size] = {
-                    "times": times,
-                    "average": sum(times) / len(times),
-                    "min": min(times),
-                    "max": max(times),
-                    "last_run": datetime.now().isoformat(),
-                }
-
-        if script_results:
-            results[script_name] = {
-                "description": script_desc,
-                "results": script_results,
-            }
+    return results
+
+
+def interference_report(results):
+    """
+    Eşzamanlı çalıştırmaların birbirini ne kadar yavaşlattığını raporla:
+    çakışan çalıştırmaların süresi, aynı iş ve boyutun tek başına çalışan
+    ölçümlerinin medyanıyla karşılaştırılır
+    """
+    report = []
+    by_overlap = {}
+
+    for data in results.values():
+        for size, metrics in data["results"].items():
+            pairs = list(zip(metrics["times"], metrics["overlaps"]))
+            solo = [t for t, o in pairs if o == 0]
+            concurrent = [(t, o) for t, o in pairs if o > 0]
+            if not concurrent:
+                continue
+            if not solo:
+                size_label = f"%{float(size) * 100:g}"
+                report.append(
+                    [data["description"], size_label, 0, len(concurrent), "-", "-"]
+                )
+                continue
+
+            baseline = statistics.median(solo)
+            for t, o in concurrent:
+                by_overlap.setdefault(o, []).append(t / baseline)
+            slowdown = statistics.mean(t for t, _ in concurrent) / baseline
+            report.append(
+                [
+                    data["description"],
+                    f"%{float(size) * 100:g}",
+                    len(solo),
+                    len(concurrent),
+                    f"{slowdown:.2f}x",
+                    "Evet" if slowdown < 1.1 else "HAYIR",
+                ]
+            )
+
+    if not report:
+        return None
 
+    headers = [
+        "Fonksiyon",
+        "Veri Boyutu",
+        "Tek başına",
+        "Eşzamanlı",
+        "Yavaşlama",
+        "Eşzamanlı ölçüm güvenilir",
+    ]
+    print("\nEŞZAMANLI ÇALIŞTIRMA ETKİLEŞİMİ:")
+    print(tabulate(report, headers=headers, tablefmt="grid"))
+    if by_overlap:
+        print(
+            tabulate(
+                [
+                    [overlap, len(ratios), f"{statistics.mean(ratios):.2f}x"]
+                    for overlap, ratios in sorted(by_overlap.items())
+                ],
+                headers=["Çakışan iş", "Ölçüm", "Ortalama yavaşlama"],
+                tablefmt="grid",
+            )
+        )
+    else:
+        print("Tek başına ölçüm yok; taban için --concurrency 1 ile de çalıştırın")
+    return report
+
+
+def normalize_job_output(stdout):
+    """
+    İş çıktısını karşılaştırılabilir hale getir: split sayısına bağlı olan
+    örnekleri (veri kalitesi örnek satırları, min-max örnek değerleri) çıkar
+    """
+    results = {}
+    for line in stdout.strip().split("\n"):
+        if "\t" not in line:
+            continue
+        key, value = line.split("\t", 1)
+        value = json.loads(value)
+        if key == '"data_quality"':
+            value = {k: v for k, v in value.items() if k != "examples"}
+        elif isinstance(value, dict) and "original" in value:
+            continue
+        results[key] = value
     return results
 
 
+def outputs_match(expected, actual, rel_tol=1e-9):
+    """Kayan nokta birleştirme sırası farklarını tolere ederek karşılaştır"""
+    if isinstance(expected, dict) and isinstance(actual, dict):
+        return expected.keys() == actual.keys() and all(
+            outputs_match(expected[k], actual[k], rel_tol) for k in expected
+        )
+    if isinstance(expected, list) and isinstance(actual, list):
+        return len(expected) == len(actual) and all(
+            outputs_match(e, a, rel_tol) for e, a in zip(expected, actual)
+        )
+    if isinstance(expected, float) or isinstance(actual, float):
+        return math.isclose(expected, actual, rel_tol=rel_tol, abs_tol=1e-12)
+    return expected == actual
+
+
+def check_split_consistency(input_path, split_counts, columns="2", fused_only=False):
+    """
+    Her işi farklı input split sayılarıyla çalıştır; sonuçların aynı
+    olduğunu doğrula ve split sayısı arttıkça elde edilen hızlanmayı raporla
+    """
+    scripts, script_args = get_scripts(columns, fused_only)
+    file_size = get_hdfs_file_size(input_path)
+    report = []
+    all_match = True
+
+    for script_name, script_desc in scripts.items():
+        reference = None
+        reference_time = None
+
+        for splits in split_counts:
+            split_mb = max(1, math.ceil(file_size / splits / (1024 * 1024)))
+            job_args = list(script_args.get(script_name, ())) + [
+                "--split-size-mb",
+                str(split_mb),
+            ]
+            print(f"{script_desc}: {splits} split ({split_mb} MB)")
+
+            elapsed_time, process = execute_job(script_name, input_path, job_args)
+            if process.returncode != 0:
+                print(f"! HATA ! Kod: {process.returncode}\n{process.stderr}")
+                all_match = False
+                continue
+
+            output = normalize_job_output(process.stdout)
+            if reference is None:
+                reference, reference_time = output, elapsed_time
+            match = outputs_match(reference, output)
+            all_match = all_match and match
+
+            report.append(
+                [
+                    script_desc,
+                    splits,
+                    split_mb,
+                    f"{elapsed_time:.2f}",
+                    f"{reference_time / elapsed_time:.2f}x",
+                    "Evet" if match else "HAYIR",
+                ]
+            )
+
+    headers = [
+        "Fonksiyon",
+        "Split Sayısı",
+        "Split (MB)",
+        "Süre (s)",
+        "Hızlanma",
+        "Sonuç Aynı",
+    ]
+    print("\nSPLIT TUTARLILIK TESTİ:")
+    print(tabulate(report, headers=headers, tablefmt="grid"))
+    return all_match
+
+
+def compressed_input(input_path, codec):
+    """Girdinin codec ile sıkıştırılmış kopyası; HDFS'de yoksa oluşturulur"""
+    path = with_codec(strip_codec(input_path), codec)
+    if path != input_path and not check_hdfs_file_exists(path):
+        print(f"Oluşturuluyor: {path}")
+        compress_file(f"hdfs://{input_path}", f"hdfs://{path}")
+    return path
+
+
+def check_codecs(
+    input_path, input_codecs, map_output_codecs, columns="2", fused_only=False
+):
+    """
+    Her işi sıkıştırılmış girdi ve map çıktısı codec'lerinin her birleşimiyle
+    çalıştır; Hadoop sayaçlarından okunan ve shuffle edilen baytları, map
+    görevi sayısını ve süreyi raporla, sonuçların aynı olduğunu doğrula
+    """
+    scripts, script_args = get_scripts(columns, fused_only)
+    paths = {codec: compressed_input(input_path, codec) for codec in input_codecs}
+    report = []
+    all_match = True
+
+    for script_name, script_desc in scripts.items():
+        reference = None
+        reference_time = None
+
+        for input_codec, path in paths.items():
+            file_size = get_hdfs_file_size(path)
+            for map_codec in map_output_codecs:
+                job_args = list(script_args.get(script_name, ())) + [
+                    "--map-output-codec",
+                    map_codec,
+                ]
+                print(f"{script_desc}: girdi {input_codec}, map çıktısı {map_codec}")
+
+                elapsed_time, process = execute_job(script_name, path, job_args)
+                if process.returncode != 0:
+                    print(f"! HATA ! Kod: {process.returncode}\n{process.stderr}")
+                    all_match = False
+                    continue
+
+                output = normalize_job_output(process.stdout)
+                if reference is None:
+                    reference, reference_time = output, elapsed_time
+                match = outputs_match(reference, output)
+                all_match = all_match and match
+
+                log = parse_log(process.stderr)
+                report.append(
+                    [
+                        script_desc,
+                        input_codec,
+                        map_codec,
+                        file_size,
+                        log.counter("HDFS: Number of bytes read", "-"),
+                        log.counter("Launched map tasks", "-"),
+                        log.counter("Map output materialized bytes", "-"),
+                        log.counter("Reduce shuffle bytes", "-"),
+                        f"{elapsed_time:.2f}",
+                        f"{reference_time / elapsed_time:.2f}x",
+                        "Evet" if match else "HAYIR",
+                    ]
+                )
+
+    headers = [
+        "Fonksiyon",
+        "Girdi Codec",
+        "Map Çıktısı Codec",
+        "Dosya (bayt)",
+        "HDFS Okunan (bayt)",
+        "Map Görevi",
+        "Map Çıktısı (bayt)",
+        "Shuffle (bayt)",
+        "Süre (s)",
+        "Hızlanma",
+        "Sonuç Aynı",
+    ]
+    print("\nCODEC KARŞILAŞTIRMASI:")
+    print(tabulate(report, headers=headers, tablefmt="grid"))
+    return all_match
+
+
+def check_engine_consistency(input_path, columns="2", fused_only=False):
+    """
+    Her işi hem Hadoop'ta hem yerel NumPy motorunda çalıştır; sonuçların
+    aynı olduğunu doğrula ve yerel motorun hızlanmasını raporla
+    """
+    scripts, script_args = get_scripts(columns, fused_only)
+    report = []
+    all_match = True
+
+    for script_name, script_desc in scripts.items():
+        job_args = script_args.get(script_name, ())
+        outputs = {}
+        times = {}
+
+        for engine in ("hadoop", "local"):
+            print(f"{script_desc}: {engine}")
+            elapsed_time, process = execute_job(
+                script_name, input_path, job_args, engine
+            )
+            if process.returncode != 0:
+                print(f"! HATA ! Kod: {process.returncode}\n{process.stderr}")
+                break
+            outputs[engine] = normalize_job_output(process.stdout)
+            times[engine] = elapsed_time
+
+        if len(outputs) < 2:
+            all_match = False
+            continue
+
+        match = outputs_match(outputs["hadoop"], outputs["local"])
+        all_match = all_match and match
+        report.append(
+            [
+                script_desc,
+                f"{times['hadoop']:.2f}",
+                f"{times['local']:.2f}",
+                f"{times['hadoop'] / times['local']:.1f}x",
+                "Evet" if match else "HAYIR",
+            ]
+        )
+
+    headers = ["Fonksiyon", "Hadoop (s)", "Yerel (s)", "Hızlanma", "Sonuç Aynı"]
+    print("\nMOTOR TUTARLILIK TESTİ:")
+    print(tabulate(report, headers=headers, tablefmt="grid"))
+    return all_match
+
+
 def save_results(results, output_file):
     """Sonuçları JSON dosyasına kaydet"""
     try:
@@ -226,18 +818,72 @@ def generate_report(results):
 
 
 def main():
+    global result_cache, hdfs
     args = parse_arguments()
+    args.input = absolute_hdfs_path(args.input)
+    hdfs = get_client(args.hdfs_url)
+
+    if args.use_cache:
+        result_cache = ResultCache(hdfs_dir=args.cache_hdfs_dir, client=hdfs)
+
+    if args.check_splits:
+        split_counts = [int(s) for s in args.check_splits.split(",")]
+        if check_split_consistency(
+            args.input, split_counts, args.columns, args.fused_only
+        ):
+            print("Tüm işler split sayısından bağımsız olarak aynı sonucu verdi")
+        else:
+            print("Hata: Split sayısına bağlı sonuç farkı bulundu")
+        return
+
+    if args.check_codecs:
+        input_codecs = [c.strip() for c in args.check_codecs.split(",")]
+        map_output_codecs = [c.strip() for c in args.map_output_codecs.split(",")]
+        if check_codecs(
+            args.input, input_codecs, map_output_codecs, args.columns, args.fused_only
+        ):
+            print("Tüm codec'ler aynı sonucu verdi")
+        else:
+            print("Hata: Codec'e bağlı sonuç farkı bulundu")
+        return
+
+    if args.check_engines:
+        if check_engine_consistency(args.input, args.columns, args.fused_only):
+            print("Yerel motor tüm işlerde MapReduce ile aynı sonucu verdi")
+        else:
+            print("Hata: Yerel motor ile MapReduce sonuçları farklı")
+        return
+
+    if args.synthetic_rows and not check_hdfs_file_exists(args.input):
+        # Gerçek veri seti olmayan makinelerde aynı tohumla aynı veri üretilir
+        print(f"\n{args.synthetic_rows} satırlık sentetik veri üretiliyor...")
+        generate_input(args.input, args.synthetic_rows, args.sample_seed)
+
     sample_sizes = [float(s) for s in args.sample_sizes.split(",")]
 
     print("\nÖrnek veri setleri oluşturuluyor...")
-    samples = create_sample_datasets(args.input, sample_sizes)
+    stratify = None if args.sample_stratify == "none" else args.sample_stratify
+    samples = create_sample_datasets(
+        args.input, sample_sizes, args.sample_seed, stratify
+    )
 
     if not samples:
         print("Hata: Örnek veri setleri oluşturulamadı")
         return
 
     print("\nPerformans testleri başlıyor...")
-    results = evaluate_performance(samples, args.iterations)
+    engines = ["hadoop", "local"] if args.engine == "both" else [args.engine]
+    results = evaluate_performance(
+        samples,
+        args.iterations,
+        args.columns,
+        args.fused_only,
+        engines,
+        args.concurrency,
+        args.warmup,
+        args.order_seed,
+        args.output,
+    )
 
     if not results:
         print("Hata: Performans testleri çalıştırılamadı")
@@ -245,6 +891,7 @@ def main():
 
     if save_results(results, args.output):
         generate_report(results)
+        interference_report(results)
         plot_performance(results)
 
 
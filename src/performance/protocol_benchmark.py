@@ -0,0 +1,182 @@
+#!/usr/bin/env python3
+"""
+Ara protokolün (map -> reduce kayıt biçimi) serileştirme maliyetini ve
+shuffle hacmini ölçen kıyaslama.
+
+Her iş, aynı yerel CSV örneği üzerinde süreç içinde iki protokolle
+çalıştırılır:
+  json     : mrjob'un varsayılan JSONProtocol'ü (metin)
+  msgpack  : protocols.MsgPackProtocol (paketlenmiş ikili, kaçışlı)
+
+ve iki modda:
+  satır başına : her satır için bir kayıt, combiner yok (serileştirmenin
+                 en yoğun olduğu durum)
+  mapper içi   : işlerin normal davranışı, mapper başına birkaç kayıt
+
+Kodlama/çözme süreleri (encode/decode), map çıktısı ve shuffle baytları
+raporlanır; iki protokolün sonuçlarının aynı olduğu da doğrulanır.
+
+Örnek:
+  python protocol_benchmark.py --input US_Accidents.csv --limit 500000 --mappers 8
+"""
+import argparse
+import json
+import math
+
+from tabulate import tabulate
+
+from job_profiler import load_job_class, profile_job, read_lines
+
+PROTOCOLS = ["json", "msgpack"]
+MODES = [
+    ("satır başına", {"flush_every_record": True, "use_combiner": False}),
+    ("mapper içi", {"flush_every_record": False, "use_combiner": True}),
+]
+MULTI_COLUMN_SCRIPTS = {"column_summary.py", "percentiles.py"}
+
+
+def parse_arguments():
+    """Komut satırı argümanlarını işle"""
+    parser = argparse.ArgumentParser(
+        description="JSON ve MessagePack ara protokol kıyaslaması"
+    )
+    parser.add_argument("--input", required=True, help="Yerel CSV dosyası")
+    parser.add_argument(
+        "--limit", type=int, default=None, help="Okunacak en fazla satır sayısı"
+    )
+    parser.add_argument(
+        "--mappers", type=int, default=4, help="Benzetilen mapper sayısı"
+    )
+    parser.add_argument("--columns", default="2", help="Sütun indeksleri")
+    parser.add_argument(
+        "--scripts",
+        default=(
+            "mean_value.py,max_value.py,stddev_value.py,skewness.py,"
+            "minmax_normalization.py,column_summary.py"
+        ),
+        help="Karşılaştırılacak iş betikleri (virgülle ayrılmış)",
+    )
+    parser.add_argument("--output", help="Sonuçların yazılacağı JSON dosyası")
+    return parser.parse_args()
+
+
+def job_arguments(script, columns, protocol):
+    if script in MULTI_COLUMN_SCRIPTS:
+        args = ["--columns", columns]
+    else:
+        args = ["--column", columns.split(",")[0]]
+    return args + ["--internal-protocol", protocol]
+
+
+def same_output(expected, actual):
+    """
+    Sonuçlar aynı mı; kayıtların birleştirilme sırası protokole göre
+    değiştiği için ondalık sayılar göreli 1e-9 toleransla karşılaştırılır
+    """
+    if isinstance(expected, (list, tuple)) and isinstance(actual, (list, tuple)):
+        return len(expected) == len(actual) and all(
+            same_output(e, a) for e, a in zip(expected, actual)
+        )
+    if isinstance(expected, dict) and isinstance(actual, dict):
+        return expected.keys() == actual.keys() and all(
+            same_output(expected[k], actual[k]) for k in expected
+        )
+    if isinstance(expected, float) or isinstance(actual, float):
+        return math.isclose(expected, actual, rel_tol=1e-9, abs_tol=1e-12)
+    return expected == actual
+
+
+def comparable(output):
+    # Veri kalitesi örnek satırları rastgele seçilir; karşılaştırılmaz
+    pairs = [json.loads(json.dumps(pair)) for pair in output]
+    return sorted((pair for pair in pairs if pair[0] != "data_quality"), key=json.dumps)
+
+
+def run_benchmark(lines, scripts, columns, mappers):
+    """Her iş, mod ve protokol için ölçümleri topla"""
+    results = {}
+
+    for script in scripts:
+        job_class = load_job_class(script)
+        results[script] = {}
+
+        for mode, options in MODES:
+            results[script][mode] = {}
+            for protocol in PROTOCOLS:
+                job = job_class(job_arguments(script, columns, protocol))
+                stats = profile_job(job, lines, mappers=mappers, **options)
+                for key in ("counters", "reducer_loads"):
+                    stats.pop(key)
+                stats["output"] = comparable(stats["output"])
+                results[script][mode][protocol] = stats
+
+            runs = results[script][mode]
+            runs["same_output"] = same_output(
+                runs["json"]["output"], runs["msgpack"]["output"]
+            )
+
+    return results
+
+
+def print_report(results):
+    """Her iş ve mod için MessagePack'i JSON ile karşılaştıran tablo yazdır"""
+    headers = [
+        "İş",
+        "Mod",
+        "Protokol",
+        "Map çıktısı (bayt)",
+        "Shuffle (bayt)",
+        "Encode (s)",
+        "Decode (s)",
+        "Süre (s)",
+        "Bayt azalması",
+        "Serileştirme hızlanması",
+        "Aynı sonuç",
+    ]
+    report = []
+
+    for script, modes in results.items():
+        for mode, runs in modes.items():
+            baseline = runs["json"]
+            base_cpu = baseline["encode_time"] + baseline["decode_time"]
+            for protocol in PROTOCOLS:
+                stats = runs[protocol]
+                cpu = stats["encode_time"] + stats["decode_time"]
+                byte_ratio = baseline["map_output_bytes"] / max(
+                    1, stats["map_output_bytes"]
+                )
+                report.append(
+                    [
+                        script,
+                        mode,
+                        protocol,
+                        stats["map_output_bytes"],
+                        stats["shuffle_bytes"],
+                        f"{stats['encode_time']:.3f}",
+                        f"{stats['decode_time']:.3f}",
+                        f"{stats['wall_time']:.3f}",
+                        f"{byte_ratio:.2f}x",
+                        f"{base_cpu / cpu:.2f}x" if cpu else "-",
+                        "evet" if runs["same_output"] else "HAYIR",
+                    ]
+                )
+
+    print(tabulate(report, headers=headers, tablefmt="grid"))
+
+
+def main():
+    args = parse_arguments()
+    lines = read_lines(args.input, args.limit)
+    scripts = [s.strip() for s in args.scripts.split(",") if s.strip()]
+
+    results = run_benchmark(lines, scripts, args.columns, args.mappers)
+    print_report(results)
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2, ensure_ascii=False)
+        print(f"\nSonuçlar kaydedildi: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
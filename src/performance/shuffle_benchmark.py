@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+Mapper içi birleştirmenin (in-mapper combining) shuffle hacmine ve süreye
+etkisini ölçen kıyaslama.
+
+Her iş üç modda, aynı yerel CSV örneği üzerinde süreç içinde çalıştırılır:
+  satır başına   : her satır için bir kayıt, combiner yok (eski davranış)
+  + combiner     : her satır için bir kayıt, combiner açık
+  mapper içi     : mapper_final'da mapper başına tek kayıt
+
+Örnek:
+  python shuffle_benchmark.py --input US_Accidents.csv --limit 500000 --mappers 8
+"""
+import argparse
+import json
+
+from tabulate import tabulate
+
+from job_profiler import load_job_class, profile_job, read_lines
+
+MODES = [
+    ("satır başına", {"flush_every_record": True, "use_combiner": False}),
+    ("+ combiner", {"flush_every_record": True, "use_combiner": True}),
+    ("mapper içi", {"flush_every_record": False, "use_combiner": True}),
+]
+
+
+def parse_arguments():
+    """Komut satırı argümanlarını işle"""
+    parser = argparse.ArgumentParser(
+        description="Mapper içi birleştirme shuffle kıyaslaması"
+    )
+    parser.add_argument("--input", required=True, help="Yerel CSV dosyası")
+    parser.add_argument(
+        "--limit", type=int, default=None, help="Okunacak en fazla satır sayısı"
+    )
+    parser.add_argument(
+        "--mappers", type=int, default=4, help="Benzetilen mapper sayısı"
+    )
+    parser.add_argument("--column", type=int, default=2, help="Sütun indeksi")
+    parser.add_argument(
+        "--scripts",
+        default="mean_value.py,max_value.py",
+        help="Karşılaştırılacak iş betikleri (virgülle ayrılmış)",
+    )
+    parser.add_argument("--output", help="Sonuçların yazılacağı JSON dosyası")
+    return parser.parse_args()
+
+
+def run_benchmark(lines, scripts, column, mappers):
+    """Her iş ve mod için shuffle ölçümlerini topla"""
+    results = {}
+
+    for script in scripts:
+        job_class = load_job_class(script)
+        results[script] = {}
+
+        for mode, options in MODES:
+            job = job_class(["--column", str(column)])
+            stats = profile_job(job, lines, mappers=mappers, **options)
+            stats.pop("counters")
+            stats["output"] = [list(pair) for pair in stats["output"]]
+            results[script][mode] = stats
+
+    return results
+
+
+def print_report(results):
+    """Modları satır başına (eski) davranışa göre karşılaştıran tablo yazdır"""
+    headers = [
+        "İş",
+        "Mod",
+        "Map çıktı kaydı",
+        "Shuffle kaydı",
+        "Shuffle (bayt)",
+        "Süre (s)",
+        "Bayt azalması",
+        "Hızlanma",
+    ]
+    report = []
+
+    for script, modes in results.items():
+        baseline = modes[MODES[0][0]]
+        for mode, stats in modes.items():
+            report.append(
+                [
+                    script,
+                    mode,
+                    stats["map_output_records"],
+                    stats["shuffle_records"],
+                    stats["shuffle_bytes"],
+                    f"{stats['wall_time']:.3f}",
+                    f"{baseline['shuffle_bytes'] / max(1, stats['shuffle_bytes']):.0f}x",
+                    f"{baseline['wall_time'] / stats['wall_time']:.2f}x",
+                ]
+            )
+
+    print(tabulate(report, headers=headers, tablefmt="grid"))
+
+
+def main():
+    args = parse_arguments()
+    lines = read_lines(args.input, args.limit)
+    scripts = [s.strip() for s in args.scripts.split(",") if s.strip()]
+
+    results = run_benchmark(lines, scripts, args.column, args.mappers)
+    print_report(results)
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2, ensure_ascii=False)
+        print(f"\nSonuçlar kaydedildi: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,465 @@
+#!/usr/bin/env python3
+"""
+HDFS access shared by the GUI, the evaluator and the storage helpers.
+
+Every "hadoop fs" call starts a JVM, which costs 1-3 s before any work is
+done. The clients here answer listings, existence checks and small reads
+in milliseconds instead:
+
+  WebHDFSClient  REST calls to the NameNode (WebHDFS) over one pooled
+                 HTTP session, so connections are reused across calls
+                 and threads
+  LocalClient    the same interface over a local directory, for machines
+                 without a cluster and for tests
+
+get_client() picks the client from a URL (http(s):// for WebHDFS, file://
+for a local directory) or from the HDFS_URL environment variable, and
+returns one shared client per URL. The methods block; submit() runs any
+of them on a shared thread pool and returns a Future.
+
+Paths may be given as /user/..., hdfs:///user/... or hdfs://host:port/user/...
+Errors are raised as OSError subclasses: FileNotFoundError for missing
+paths and HdfsError for everything else the server rejects.
+
+"python hdfs_client.py serve --root DIR" starts a minimal WebHDFS server
+over a local directory, to exercise WebHDFSClient without a cluster.
+"""
+import argparse
+import getpass
+import json
+import os
+import posixpath
+from abc import ABC, abstractmethod
+import shutil
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from fnmatch import fnmatch
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qsl, quote, unquote, urlparse
+
+import requests
+
+# Hadoop 3 NameNode web port; Hadoop 2 uses 50070
+DEFAULT_URL = "http://localhost:9870"
+
+_executor = ThreadPoolExecutor(max_workers=8, thread_name_prefix="hdfs")
+_clients = {}
+_clients_lock = threading.Lock()
+
+
+class HdfsError(OSError):
+    """An HDFS operation was rejected (permissions, quota, ...)"""
+
+
+def hdfs_path(path):
+    """/user/x for hdfs://host:port/user/x, hdfs:///user/x or /user/x"""
+    if path.startswith("hdfs://"):
+        path = urlparse(path).path
+    return "/" + path.lstrip("/")
+
+
+def get_client(url=None):
+    """Shared client for url (default: $HDFS_URL, else the local NameNode)"""
+    url = url or os.environ.get("HDFS_URL") or DEFAULT_URL
+    with _clients_lock:
+        if url not in _clients:
+            if url.startswith("file://"):
+                _clients[url] = LocalClient(url[len("file://") :])
+            else:
+                _clients[url] = WebHDFSClient(url)
+        return _clients[url]
+
+
+class HdfsClient(ABC):
+    """
+    Operations shared by both clients. Status entries are dicts with the
+    WebHDFS field names: path, type ("FILE" or "DIRECTORY"), length (bytes)
+    and modificationTime (milliseconds since the epoch).
+    """
+
+    @abstractmethod
+    def status(self, path):
+        """Status entry of a path (FileNotFoundError if it does not exist)"""
+
+    @abstractmethod
+    def list(self, path):
+        """Status of every entry of a directory, sorted by path"""
+
+    @abstractmethod
+    def read(self, path):
+        """Contents of a file as bytes"""
+
+    @abstractmethod
+    def write(self, path, data, overwrite=True):
+        """
+        Create a file from bytes, a binary file object or an iterable of
+        bytes chunks (streamed as they are produced)
+        """
+
+    @abstractmethod
+    def mkdirs(self, path):
+        """Create a directory and any missing parents"""
+
+    @abstractmethod
+    def delete(self, path, recursive=False):
+        """Remove a path; returns False if it did not exist (like -rm -f)"""
+
+    @abstractmethod
+    def rename(self, path, destination):
+        """
+        Move a path to destination, a full path (like -mv); HdfsError if
+        the destination exists
+        """
+
+    def exists(self, path):
+        try:
+            self.status(path)
+        except FileNotFoundError:
+            return False
+        return True
+
+    def cat(self, path):
+        """
+        Contents of a file, or of all files matching a glob in the last
+        path component (e.g. outputs/mean/part-*) in name order
+        """
+        directory, pattern = posixpath.split(hdfs_path(path))
+        if not any(c in pattern for c in "*?["):
+            return self.read(path)
+        names = [
+            entry["path"]
+            for entry in self.list(directory)
+            if entry["type"] == "FILE"
+            and fnmatch(posixpath.basename(entry["path"]), pattern)
+        ]
+        if not names:
+            raise FileNotFoundError(f"No files match {path}")
+        return b"".join(self.read(name) for name in names)
+
+    def upload(self, local_path, path, overwrite=True):
+        """Copy a local file or directory tree to path (like hadoop fs -put)"""
+        path = hdfs_path(path)
+        if not os.path.isdir(local_path):
+            with open(local_path, "rb") as f:
+                self.write(path, f, overwrite)
+            return
+
+        for directory, _, names in os.walk(local_path):
+            relative = os.path.relpath(directory, local_path)
+            target = path
+            if relative != ".":
+                target = posixpath.join(path, relative.replace(os.sep, "/"))
+            self.mkdirs(target)
+            for name in sorted(names):
+                with open(os.path.join(directory, name), "rb") as f:
+                    self.write(posixpath.join(target, name), f, overwrite)
+
+    def submit(self, function, *args, **kwargs):
+        """Run function (usually a method of this client) on the shared pool"""
+        return _executor.submit(function, *args, **kwargs)
+
+
+class WebHDFSClient(HdfsClient):
+    """HDFS over the NameNode's WebHDFS REST API with pooled connections"""
+
+    def __init__(self, url=DEFAULT_URL, user=None, timeout=30, pool_size=16):
+        self.url = url.rstrip("/")
+        self.user = user or os.environ.get("HDFS_USER") or getpass.getuser()
+        self.timeout = timeout
+        self.session = requests.Session()
+        # Keep-alive connections to the NameNode and DataNodes are reused
+        adapter = requests.adapters.HTTPAdapter(
+            pool_connections=4, pool_maxsize=pool_size
+        )
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+    def _request(self, method, path, op, params=None, **kwargs):
+        query = {"op": op, "user.name": self.user}
+        query.update(params or {})
+        response = self.session.request(
+            method,
+            f"{self.url}/webhdfs/v1{quote(hdfs_path(path))}",
+            params=query,
+            timeout=self.timeout,
+            **kwargs,
+        )
+        _check(response, path)
+        return response
+
+    def status(self, path):
+        response = self._request("GET", path, "GETFILESTATUS")
+        return _status(hdfs_path(path), response.json()["FileStatus"])
+
+    def list(self, path):
+        path = hdfs_path(path)
+        response = self._request("GET", path, "LISTSTATUS")
+        entries = response.json()["FileStatuses"]["FileStatus"]
+        statuses = []
+        for entry in entries:
+            # A file lists itself with an empty suffix
+            suffix = entry["pathSuffix"]
+            statuses.append(
+                _status(posixpath.join(path, suffix) if suffix else path, entry)
+            )
+        return sorted(statuses, key=lambda entry: entry["path"])
+
+    def read(self, path):
+        # Redirects to a DataNode holding the first block
+        return self._request("GET", path, "OPEN").content
+
+    def write(self, path, data, overwrite=True):
+        # The NameNode answers with the DataNode to send the data to
+        response = self._request(
+            "PUT",
+            path,
+            "CREATE",
+            {"overwrite": str(overwrite).lower()},
+            allow_redirects=False,
+        )
+        location = response.headers["Location"]
+        _check(self.session.put(location, data=data, timeout=None), path)
+
+    def mkdirs(self, path):
+        self._request("PUT", path, "MKDIRS")
+
+    def delete(self, path, recursive=False):
+        response = self._request(
+            "DELETE", path, "DELETE", {"recursive": str(recursive).lower()}
+        )
+        return response.json()["boolean"]
+
+    def rename(self, path, destination):
+        response = self._request(
+            "PUT", path, "RENAME", {"destination": hdfs_path(destination)}
+        )
+        # The NameNode answers false (not an error) for an existing target
+        if not response.json()["boolean"]:
+            raise HdfsError(f"Cannot rename {path} to {destination}")
+
+
+def _check(response, path):
+    if response.status_code < 400:
+        return
+    try:
+        message = response.json()["RemoteException"]["message"]
+    except (ValueError, KeyError):
+        message = response.text.strip() or f"{path}: {response.reason}"
+    # WebHDFS messages name the path, e.g. "File does not exist: /user/x"
+    if response.status_code == 404:
+        raise FileNotFoundError(message)
+    raise HdfsError(f"{message} (HTTP {response.status_code})")
+
+
+def _status(path, entry):
+    return {
+        "path": path,
+        "type": entry["type"],
+        "length": entry["length"],
+        "modificationTime": entry["modificationTime"],
+    }
+
+
+class LocalClient(HdfsClient):
+    """HDFS paths mapped onto a local directory: /user/x -> root/user/x"""
+
+    def __init__(self, root):
+        self.root = os.path.abspath(root)
+
+    def _local(self, path):
+        return os.path.join(self.root, hdfs_path(path).lstrip("/"))
+
+    def status(self, path):
+        try:
+            stat = os.stat(self._local(path))
+        except FileNotFoundError:
+            raise FileNotFoundError(f"{path}: No such file or directory") from None
+        is_dir = os.path.isdir(self._local(path))
+        return {
+            "path": hdfs_path(path),
+            "type": "DIRECTORY" if is_dir else "FILE",
+            "length": 0 if is_dir else stat.st_size,
+            "modificationTime": int(stat.st_mtime * 1000),
+        }
+
+    def list(self, path):
+        path = hdfs_path(path)
+        if self.status(path)["type"] == "FILE":
+            return [self.status(path)]
+        return [
+            self.status(posixpath.join(path, name))
+            for name in sorted(os.listdir(self._local(path)))
+        ]
+
+    def read(self, path):
+        try:
+            with open(self._local(path), "rb") as f:
+                return f.read()
+        except FileNotFoundError:
+            raise FileNotFoundError(f"{path}: No such file or directory") from None
+
+    def write(self, path, data, overwrite=True):
+        local_path = self._local(path)
+        if not overwrite and os.path.exists(local_path):
+            raise FileExistsError(f"{path}: File exists")
+        os.makedirs(os.path.dirname(local_path), exist_ok=True)
+        with open(local_path, "wb") as f:
+            if isinstance(data, bytes):
+                f.write(data)
+            elif hasattr(data, "read"):
+                shutil.copyfileobj(data, f)
+            else:
+                for chunk in data:
+                    f.write(chunk)
+
+    def mkdirs(self, path):
+        os.makedirs(self._local(path), exist_ok=True)
+
+    def delete(self, path, recursive=False):
+        local_path = self._local(path)
+        if not os.path.lexists(local_path):
+            return False
+        if os.path.isdir(local_path):
+            if recursive:
+                shutil.rmtree(local_path)
+            else:
+                os.rmdir(local_path)
+        else:
+            os.remove(local_path)
+        return True
+
+    def rename(self, path, destination):
+        local_path = self._local(path)
+        target = self._local(destination)
+        if not os.path.lexists(local_path):
+            raise FileNotFoundError(f"{path}: No such file or directory")
+        if os.path.lexists(target):
+            raise HdfsError(f"Cannot rename {path} to {destination}: File exists")
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        os.rename(local_path, target)
+
+
+class _WebHDFSHandler(BaseHTTPRequestHandler):
+    """The WebHDFS subset used by WebHDFSClient, backed by a LocalClient"""
+
+    client = None
+
+    def do_GET(self):
+        self._dispatch("GET")
+
+    def do_PUT(self):
+        self._dispatch("PUT")
+
+    def do_DELETE(self):
+        self._dispatch("DELETE")
+
+    def log_message(self, format, *args):
+        pass
+
+    def _dispatch(self, method):
+        url = urlparse(self.path)
+        path = unquote(url.path[len("/webhdfs/v1") :]) or "/"
+        params = dict(parse_qsl(url.query))
+        op = (method, params.get("op", "").upper())
+        try:
+            if op == ("GET", "GETFILESTATUS"):
+                status = dict(self.client.status(path), pathSuffix="")
+                self._send_json({"FileStatus": status})
+            elif op == ("GET", "LISTSTATUS"):
+                entries = []
+                for entry in self.client.list(path):
+                    # Relative to the listed path: "" when listing a file
+                    suffix = posixpath.relpath(entry["path"], path)
+                    suffix = "" if suffix == "." else suffix
+                    entries.append(dict(entry, pathSuffix=suffix))
+                self._send_json({"FileStatuses": {"FileStatus": entries}})
+            elif op == ("GET", "OPEN"):
+                self._send(200, self.client.read(path), "application/octet-stream")
+            elif op == ("PUT", "CREATE") and "data" not in params:
+                # NameNode step: redirect to the "DataNode", i.e. this server
+                self.send_response(307)
+                location = f"http://{self.headers['Host']}{self.path}&data=true"
+                self.send_header("Location", location)
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+            elif op == ("PUT", "CREATE"):
+                overwrite = params.get("overwrite", "false") == "true"
+                self.client.write(path, self._body(), overwrite)
+                self._send(201, b"", "application/octet-stream")
+            elif op == ("PUT", "MKDIRS"):
+                self.client.mkdirs(path)
+                self._send_json({"boolean": True})
+            elif op == ("PUT", "RENAME"):
+                try:
+                    self.client.rename(path, params["destination"])
+                except HdfsError:
+                    self._send_json({"boolean": False})
+                else:
+                    self._send_json({"boolean": True})
+            elif op == ("DELETE", "DELETE"):
+                recursive = params.get("recursive", "false") == "true"
+                self._send_json({"boolean": self.client.delete(path, recursive)})
+            else:
+                self._send_error(400, "IllegalArgumentException", f"Invalid op {op}")
+        except FileNotFoundError as e:
+            self._send_error(404, "FileNotFoundException", str(e))
+        except OSError as e:
+            self._send_error(403, "IOException", str(e))
+
+    def _body(self):
+        """Request body as bytes, with or without chunked transfer encoding"""
+        if self.headers.get("Transfer-Encoding", "").lower() != "chunked":
+            return self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        chunks = []
+        while True:
+            size = int(self.rfile.readline().split(b";")[0], 16)
+            chunks.append(self.rfile.read(size))
+            self.rfile.readline()
+            if not size:
+                return b"".join(chunks)
+
+    def _send(self, code, body, content_type):
+        self.send_response(code)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _send_json(self, document, code=200):
+        self._send(code, json.dumps(document).encode(), "application/json")
+
+    def _send_error(self, code, exception, message):
+        error = {"RemoteException": {"exception": exception, "message": message}}
+        self._send_json(error, code)
+
+
+def serve(root, host="localhost", port=9870):
+    """Serve a local directory over the WebHDFS subset until interrupted"""
+    handler = type("Handler", (_WebHDFSHandler,), {"client": LocalClient(root)})
+    server = ThreadingHTTPServer((host, port), handler)
+    print(f"WebHDFS stand-in for {os.path.abspath(root)} on http://{host}:{port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="HDFS client utilities")
+    commands = parser.add_subparsers(dest="command", required=True)
+    serve_parser = commands.add_parser(
+        "serve", help="Serve a local directory as a WebHDFS stand-in"
+    )
+    serve_parser.add_argument("--root", required=True, help="Local directory")
+    serve_parser.add_argument("--host", default="localhost")
+    serve_parser.add_argument("--port", type=int, default=9870)
+    args = parser.parse_args()
+
+    if args.command == "serve":
+        serve(args.root, args.host, args.port)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,197 @@
+#!/usr/bin/env python3
+"""
+Incremental column statistics over a directory of CSV drops.
+
+ColumnSummary --emit-partials stores the mergeable partial state of every
+input file (moments, min/max, missing/invalid counts and the data quality
+summary). A refresh lists the directory, runs the job only on files that
+are new or changed since the last run (by size and modification time),
+and merges their partials with the stored ones. The cost of a refresh
+therefore scales with the new data, not the whole history; the merged
+result is identical to a full ColumnSummary run over all files.
+
+Usage:
+  python incremental.py /user/student/us-accidents/data --columns 2,9,20
+"""
+import argparse
+import hashlib
+import json
+import os
+import sys
+import tempfile
+from fnmatch import fnmatch
+from pathlib import Path
+
+from hdfs_client import get_client
+
+sys.path.insert(0, str(Path(__file__).parent.resolve().parent / "mapreduce"))
+from column_summary import ColumnSummary  # noqa: E402
+from data_quality import merge_quality  # noqa: E402
+
+DEFAULT_STORE_DIR = os.path.expanduser("~/.cache/us-accidents/partials")
+EMPTY_MOMENTS = [0, 0.0, 0.0, 0.0, 0.0]
+
+
+def list_files(data_dir, pattern="*.csv", exclude=("sample_*",)):
+    """
+    {path: fingerprint} of the data files; HDFS directories are listed with
+    hdfs_client (one WebHDFS call), local ones with os.stat
+    """
+    files = {}
+
+    if os.path.isdir(data_dir):
+        for name in sorted(os.listdir(data_dir)):
+            path = os.path.join(data_dir, name)
+            if os.path.isfile(path):
+                stat = os.stat(path)
+                files[path] = f"{stat.st_size}:{int(stat.st_mtime * 1000)}"
+    else:
+        for entry in get_client().list(data_dir):
+            if entry["type"] == "FILE":
+                files[entry["path"]] = f"{entry['length']}:{entry['modificationTime']}"
+
+    return {
+        path: fingerprint
+        for path, fingerprint in files.items()
+        if fnmatch(os.path.basename(path), pattern)
+        and not any(fnmatch(os.path.basename(path), ex) for ex in exclude)
+    }
+
+
+class PartialStore:
+    """
+    Per-file partials of one data directory, kept in a local JSON file:
+      {"files": {path: {"fingerprint": ..., "columns": {idx: partial},
+                        "quality": data quality partial or null}}}
+    """
+
+    def __init__(self, data_dir, store_dir=DEFAULT_STORE_DIR):
+        os.makedirs(store_dir, exist_ok=True)
+        name = hashlib.sha256(data_dir.rstrip("/").encode()).hexdigest()[:16]
+        self.path = os.path.join(store_dir, f"{name}.json")
+        self.files = {}
+        if os.path.exists(self.path):
+            with open(self.path) as f:
+                self.files = json.load(f)["files"]
+
+    def save(self):
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(self.path))
+        with os.fdopen(fd, "w") as f:
+            json.dump({"files": self.files}, f)
+        os.replace(tmp_path, self.path)
+
+    def pending(self, files, columns):
+        """Files that are new, changed or lack one of the requested columns"""
+        pending = []
+        for path, fingerprint in files.items():
+            entry = self.files.get(path)
+            if (
+                entry is None
+                or entry["fingerprint"] != fingerprint
+                or any(str(idx) not in entry["columns"] for idx in columns)
+            ):
+                pending.append(path)
+        return pending
+
+    def reset(self, paths, files, columns):
+        """
+        Prepare the entries of files about to be scanned; a file that yields
+        no output (e.g. empty) keeps an empty partial so it is not rescanned
+        """
+        for path in paths:
+            entry = self.files.get(path)
+            if entry is None or entry["fingerprint"] != files[path]:
+                entry = self.files[path] = {"columns": {}}
+            entry["fingerprint"] = files[path]
+            entry["quality"] = None
+            for idx in columns:
+                entry["columns"][str(idx)] = [EMPTY_MOMENTS, None, None, 0, 0]
+
+    def update(self, files, job_output):
+        """Store the [file, key] -> partial pairs of a --emit-partials run"""
+        for (path, key), value in job_output:
+            # Hadoop reports the fully qualified URI of the input file
+            path = next((p for p in files if path.endswith(p)), path)
+            entry = self.files[path]
+            if key == "data_quality":
+                entry["quality"] = value
+            else:
+                entry["columns"][str(key)] = value
+
+    def prune(self, files):
+        """Forget files that were removed from the directory"""
+        for path in list(self.files):
+            if path not in files:
+                del self.files[path]
+
+
+def run_partials(paths, columns, runner="hadoop", extra_args=()):
+    """Run ColumnSummary --emit-partials over paths; return its output pairs"""
+    job = ColumnSummary(
+        ["-r", runner, "--columns", ",".join(map(str, columns)), "--emit-partials"]
+        + list(extra_args)
+        + list(paths)
+    )
+    with job.make_runner() as runner_:
+        runner_.run()
+        return list(job.parse_output(runner_.cat_output()))
+
+
+def refresh(data_dir, columns, store_dir=DEFAULT_STORE_DIR, runner="hadoop"):
+    """
+    Scan only the new/changed files of data_dir and return the merged
+    ColumnSummary output pairs for the whole directory plus the scanned files
+    """
+    files = list_files(data_dir)
+    store = PartialStore(data_dir, store_dir)
+    store.prune(files)
+
+    pending = store.pending(files, columns)
+    if pending:
+        inputs = pending
+        if not os.path.isdir(data_dir):
+            inputs = [f"hdfs://{path}" for path in pending]
+        store.reset(pending, files, columns)
+        store.update(files, run_partials(inputs, columns, runner))
+        store.save()
+
+    results = []
+    for idx in columns:
+        partials = [
+            entry["columns"][str(idx)]
+            for entry in store.files.values()
+            if str(idx) in entry["columns"]
+        ]
+        merged = ColumnSummary.merge_partials(partials)
+        results.append((idx, ColumnSummary.summarize(merged)))
+
+    qualities = [entry["quality"] for entry in store.files.values()]
+    qualities = [quality for quality in qualities if quality]
+    if qualities:
+        results.append(("data_quality", merge_quality(qualities)))
+
+    return results, pending
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Incremental column statistics over a data directory"
+    )
+    parser.add_argument("data_dir", help="HDFS or local directory of CSV files")
+    parser.add_argument("--columns", default="2", help="Comma-separated indexes")
+    parser.add_argument("--store-dir", default=DEFAULT_STORE_DIR)
+    parser.add_argument("-r", "--runner", default="hadoop")
+    args = parser.parse_args()
+
+    columns = [int(c) for c in args.columns.split(",")]
+    results, scanned = refresh(args.data_dir, columns, args.store_dir, args.runner)
+
+    print(f"{len(scanned)} new/changed file(s) scanned", file=sys.stderr)
+    for path in scanned:
+        print(f"  {path}", file=sys.stderr)
+    for key, value in results:
+        print(f"{json.dumps(key)}\t{json.dumps(value)}")
+
+
+if __name__ == "__main__":
+    main()
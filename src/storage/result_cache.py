@@ -0,0 +1,239 @@
+#!/usr/bin/env python3
+"""
+Persistent cache of job outputs shared by the GUI and the evaluator.
+
+Entries are keyed by the dataset fingerprint (HDFS path, size, modification
+time), the statistic, its arguments and the job version (a hash of the job
+and engine sources), so a changed input file or job code never returns a
+stale result. Each entry is one JSON file holding the raw "key<TAB>value"
+job output. The local directory is bounded in size with least-recently-used
+eviction (access times are refreshed on every hit); entries can optionally
+be mirrored to an HDFS directory, bounded to the same size (oldest writes
+first), and are fetched from there on a local miss.
+HDFS is reached through hdfs_client (WebHDFS), so a lookup costs
+milliseconds instead of a "hadoop fs" JVM start.
+"""
+import hashlib
+import json
+import os
+import tempfile
+import time
+from pathlib import Path
+
+from hdfs_client import get_client
+
+DEFAULT_CACHE_DIR = os.path.expanduser("~/.cache/us-accidents/results")
+DEFAULT_MAX_BYTES = 50 * 1024 * 1024
+# Options that change how a job runs but not its result; left out of the key
+# so the GUI and the evaluator (which varies them) share entries
+TUNING_ARGS = {
+    "--split-size-mb",
+    "--map-tasks",
+    "--internal-protocol",
+    "--map-output-codec",
+    "--salt",
+    "--chunk-rows",
+}
+
+SOURCE_DIRS = [
+    Path(__file__).parent.resolve().parent / "mapreduce",
+    Path(__file__).parent.resolve().parent / "engine",
+]
+
+_job_version = None
+
+
+def job_version():
+    """Hash of every job/engine source file; any code change invalidates"""
+    global _job_version
+    if _job_version is None:
+        digest = hashlib.sha256()
+        for source_dir in SOURCE_DIRS:
+            for path in sorted(source_dir.glob("*.py")):
+                digest.update(path.name.encode())
+                digest.update(path.read_bytes())
+        _job_version = digest.hexdigest()[:16]
+    return _job_version
+
+
+def result_args(args):
+    """Job arguments without the TUNING_ARGS options and their values"""
+    args = [str(a) for a in args]
+    kept = []
+    skip = False
+    for arg in args:
+        if skip:
+            skip = False
+        elif arg in TUNING_ARGS:
+            skip = True
+        elif arg.split("=", 1)[0] not in TUNING_ARGS:
+            kept.append(arg)
+    return kept
+
+
+def dataset_fingerprint(path, client=None):
+    """
+    (size, modification time in ms) of an HDFS path; local files are
+    stat'ed directly
+    """
+    if os.path.isfile(path):
+        stat = os.stat(path)
+        return stat.st_size, int(stat.st_mtime * 1000)
+
+    status = (client or get_client()).status(path)
+    return status["length"], status["modificationTime"]
+
+
+class ResultCache:
+    """
+    Size-bounded LRU cache of job outputs on local disk, optionally
+    mirrored to HDFS
+    """
+
+    def __init__(
+        self,
+        cache_dir=DEFAULT_CACHE_DIR,
+        max_bytes=DEFAULT_MAX_BYTES,
+        hdfs_dir=None,
+        client=None,
+    ):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.hdfs_dir = hdfs_dir
+        self.client = client or get_client()
+        os.makedirs(cache_dir, exist_ok=True)
+
+    def make_key(self, path, stat, args=(), engine="hadoop"):
+        """
+        Cache key of a statistic over a dataset computed by engine (hadoop or
+        local); returns (key, metadata). args should name the columns
+        explicitly (--column 2 rather than the job default); tuning options
+        are ignored.
+        The fingerprint lookup raises FileNotFoundError if path is missing.
+        """
+        size, mtime = dataset_fingerprint(path, self.client)
+        meta = {
+            "path": path,
+            "size": size,
+            "mtime": mtime,
+            "stat": stat,
+            "args": result_args(args),
+            "engine": engine,
+            "version": job_version(),
+        }
+        key = hashlib.sha256(json.dumps(meta, sort_keys=True).encode()).hexdigest()
+        return key, meta
+
+    def _entry_path(self, key):
+        return os.path.join(self.cache_dir, f"{key}.json")
+
+    def get(self, key):
+        """Return the cached output for key, or None on a miss"""
+        entry_path = self._entry_path(key)
+        if not os.path.exists(entry_path) and not self._fetch_from_hdfs(key):
+            return None
+
+        try:
+            with open(entry_path) as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+
+        # Refresh the access time for LRU eviction
+        os.utime(entry_path)
+        return entry["output"]
+
+    def put(self, key, output, meta=None):
+        """Store a job output and evict the least recently used entries"""
+        entry = {"meta": meta or {}, "created": time.time(), "output": output}
+
+        # Write atomically so a concurrent reader never sees a partial file
+        fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+        with os.fdopen(fd, "w") as f:
+            json.dump(entry, f)
+        os.replace(tmp_path, self._entry_path(key))
+
+        if self.hdfs_dir:
+            try:
+                self.client.upload(self._entry_path(key), f"{self.hdfs_dir}/{key}.json")
+            except OSError:
+                # The mirror is best effort; the local entry is already stored
+                pass
+            else:
+                self.evict_mirror()
+
+        self.evict()
+
+    def _fetch_from_hdfs(self, key):
+        if not self.hdfs_dir:
+            return False
+        try:
+            data = self.client.read(f"{self.hdfs_dir}/{key}.json")
+        except OSError:
+            return False
+        fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, self._entry_path(key))
+        return True
+
+    def _entries(self):
+        entries = []
+        for name in os.listdir(self.cache_dir):
+            if name.endswith(".json"):
+                stat = os.stat(os.path.join(self.cache_dir, name))
+                entries.append((stat.st_mtime, stat.st_size, name))
+        return entries
+
+    def evict(self):
+        """Remove least recently used entries until the size bound holds"""
+        entries = sorted(self._entries())
+        total = sum(size for _, size, _ in entries)
+        for _, size, name in entries:
+            if total <= self.max_bytes:
+                break
+            os.remove(os.path.join(self.cache_dir, name))
+            total -= size
+
+    def evict_mirror(self):
+        """
+        Apply the size bound to the HDFS mirror too, removing the oldest
+        entries by modification time (reads do not refresh HDFS entries)
+        """
+        try:
+            entries = sorted(
+                (entry["modificationTime"], entry["length"], entry["path"])
+                for entry in self.client.list(self.hdfs_dir)
+                if entry["path"].endswith(".json")
+            )
+        except OSError:
+            return
+        total = sum(size for _, size, _ in entries)
+        for _, size, entry_path in entries:
+            if total <= self.max_bytes:
+                break
+            try:
+                self.client.delete(entry_path)
+            except OSError:
+                return
+            total -= size
+
+    def invalidate(self, path):
+        """Drop every cached result of a dataset (e.g. after re-uploading it)"""
+        removed = 0
+        for _, _, name in self._entries():
+            entry_path = os.path.join(self.cache_dir, name)
+            try:
+                with open(entry_path) as f:
+                    entry_meta = json.load(f)["meta"]
+            except (OSError, ValueError):
+                continue
+            if entry_meta.get("path") == path:
+                os.remove(entry_path)
+                removed += 1
+                if self.hdfs_dir:
+                    try:
+                        self.client.delete(f"{self.hdfs_dir}/{name}")
+                    except OSError:
+                        pass
+        return removed